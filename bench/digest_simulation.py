@@ -0,0 +1,108 @@
+import asyncio
+import random
+import sys
+from datetime import datetime
+
+from core.timewindow import KST
+from tasks import announce_digest
+
+# 신규 에픽 던전 오픈처럼 득템이 한꺼번에 몰릴 때 채널 전송 횟수 비교 (가상 시계로 즉시 실행)
+BURST_MINUTES = 10  # 득템이 몰리는 시간 (분)
+QUIET_MINUTES = 10  # 이후 평소 빈도로 돌아온 시간 (분)
+QUIET_PER_MINUTE = 0.5  # 평소 분당 득템 수
+ADVENTURES = 12
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Channel:
+    id = 0
+
+    def __init__(self):
+        self.sends = 0
+        self.embeds = 0
+
+    async def send(self, embed=None, embeds=None, files=None):
+        self.sends += 1
+        self.embeds += len(embeds) if embeds else 1
+
+
+async def send_single(channel, announcement):
+    await channel.send(embed=announcement)
+
+
+def make_announcement(rng: random.Random, second: int) -> dict:
+    adventure = rng.randrange(ADVENTURES)
+    return {
+        "adventure_name": f"모험단{adventure:02d}",
+        "character_name": f"캐릭터{adventure:02d}-{rng.randrange(4)}",
+        "item_name": f"아이템{rng.randrange(1000):03d}",
+        "item_rarity": rng.choice(["에픽", "에픽", "에픽", "레전더리", "태초"]),
+        "occurred_at": datetime.fromtimestamp(1_700_000_000 + second, KST),
+    }
+
+
+def schedule(burst_per_minute: int, rng: random.Random) -> list[list[dict]]:
+    """
+    초 단위 알림 목록 (득템 폭주 구간 + 평소 구간)
+    """
+    seconds = (BURST_MINUTES + QUIET_MINUTES) * 60
+    timeline = [[] for _ in range(seconds)]
+    for second in range(seconds):
+        per_minute = burst_per_minute if second < BURST_MINUTES * 60 else QUIET_PER_MINUTE
+        if rng.random() < per_minute / 60:
+            timeline[second].append(make_announcement(rng, second))
+    return timeline
+
+
+async def run(timeline: list[list[dict]], use_digest: bool) -> Channel:
+    clock = Clock()
+    channel = Channel()
+    digest = announce_digest.ChannelDigest(channel, send_single, clock=clock)
+    wake = {}
+
+    async def virtual_sleep(seconds):
+        # 가상 시계가 목표 시각에 도달하면 깨움
+        future = asyncio.get_running_loop().create_future()
+        wake.setdefault(clock.now + seconds, []).append(future)
+        await future
+        return False
+
+    digest.sleep = virtual_sleep
+    for second, announcements in enumerate(timeline):
+        clock.now = second
+        for future in wake.pop(second, []):
+            future.set_result(None)
+        await asyncio.sleep(0)
+        if not announcements:
+            continue
+        if use_digest:
+            await digest.submit(announcements)
+        else:
+            for announcement in announcements:
+                await send_single(channel, announcement)
+    # 남은 요약 전송
+    await digest.flush()
+    return channel
+
+
+async def main():
+    burst_per_minute = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    timeline = schedule(burst_per_minute, random.Random(0))
+    total = sum(len(announcements) for announcements in timeline)
+    print(f"득템 {total}건: 폭주 {BURST_MINUTES}분 (분당 {burst_per_minute}건) + 평소 {QUIET_MINUTES}분\n")
+
+    for name, use_digest in (("개별 전송", False), ("요약 전송", True)):
+        channel = await run(timeline, use_digest)
+        print(f"{name:<6} 채널 전송 {channel.sends:5d}회 | Embed {channel.embeds:5d}개 | "
+              f"분당 평균 전송 {channel.sends / (BURST_MINUTES + QUIET_MINUTES):.1f}회")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
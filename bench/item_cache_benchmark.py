@@ -0,0 +1,66 @@
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from core import db, dnf_api, storage
+from core.events import AGGREGATION_EVENT_FILTER, KST, TimelineEvent
+
+CONCURRENCY = 20  # tasks/daily_aggregation.py 의 MAX_ITEM_CONCURRENT 와 동일
+
+
+def make_events(count: int, offset: int) -> list[TimelineEvent]:
+    occurred_at = datetime(2026, 10, 1, 12, 0, tzinfo=KST)
+    return [
+        TimelineEvent("2026-10-01 12:00", 505, f"bench-item-{offset + i:06d}", "벤치 아이템", "에픽", occurred_at)
+        for i in range(count)
+    ]
+
+
+async def fake_item_info(item_id: str) -> dict:
+    # 네트워크 비용은 제외하고 캐시 저장 비용만 비교
+    return {"itemId": item_id, "itemAvailableLevel": 115}
+
+
+async def run_cycle(store: storage.StateStore, events: list[TimelineEvent]) -> tuple[float, float]:
+    """
+    캐시가 빈 상태에서 한 주기 분량의 아이템 레벨 확인 + 종료 시 반영까지 걸린 시간
+    반환: (주기 시간, 종료 반영 시간)
+    """
+    storage.set_store(store)
+    dnf_api.ITEM_DETAIL_MEMCACHE = {}
+    started = time.perf_counter()
+    await dnf_api.filter_by_item_level(events, AGGREGATION_EVENT_FILTER, CONCURRENCY)
+    cycle = time.perf_counter() - started
+    started = time.perf_counter()
+    await store.close()
+    return cycle, time.perf_counter() - started
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    dnf_api.fetch_item_info = fake_item_info
+    # 벤치마크 로그가 결과를 가리지 않도록 정보 로그는 끔
+    dnf_api.logger.setLevel("WARNING")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        await db.init_db()
+        print(f"신규 아이템 {count}개, 동시 {CONCURRENCY}건 (DB: 임시 파일)\n")
+
+        before, _ = await run_cycle(storage.SQLiteStore(), make_events(count, 0))
+        print(f"건별 커밋 (기존)      : 주기 {before * 1000:8.1f} ms")
+
+        after, flush = await run_cycle(
+            storage.WriteBehindStore(storage.SQLiteStore(), buffer_last_checked=False), make_events(count, count)
+        )
+        print(f"쓰기 버퍼 (write-behind): 주기 {after * 1000:8.1f} ms + 종료 반영 {flush * 1000:.1f} ms")
+
+        saved = await db.get_all_item_levels()
+        print(f"\n저장된 아이템: {len(saved)}개 (기대값 {count * 2}) | 주기 단축 {before / max(after, 1e-9):.1f}배")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
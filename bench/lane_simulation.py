@@ -0,0 +1,53 @@
+import asyncio
+import random
+import sys
+import time
+
+from core import metrics
+from core.lanes import BATCH, GATE_CONFIG, INTERACTIVE, LaneGate
+
+# 06:00 정기 집계처럼 배치 요청이 한꺼번에 몰린 상태에서 명령어 요청 대기 시간 비교
+API_CAPACITY, API_RESERVES = GATE_CONFIG["api"]
+REQUEST_MIN = 0.02  # API 1건 응답 시간 범위 (초)
+REQUEST_MAX = 0.08
+INTERACTIVE_REQUESTS = 20
+INTERACTIVE_INTERVAL = 0.05  # 명령어 요청 간격 (초)
+
+
+async def simulate(name: str, acquire, release, batch_requests: int, rng: random.Random):
+    async def request(lane: str):
+        started = time.monotonic()
+        await acquire(lane)
+        try:
+            await asyncio.sleep(rng.uniform(REQUEST_MIN, REQUEST_MAX))
+        finally:
+            release(lane)
+        if lane == INTERACTIVE:
+            metrics.observe(f"{name}.interactive", time.monotonic() - started)
+
+    batch = [asyncio.create_task(request(BATCH)) for _ in range(batch_requests)]
+    await asyncio.sleep(0.01)
+    for _ in range(INTERACTIVE_REQUESTS):
+        await request(INTERACTIVE)
+        await asyncio.sleep(INTERACTIVE_INTERVAL)
+    started = time.monotonic()
+    await asyncio.gather(*batch)
+    print(f"{name:<10} 명령어 {metrics.format_summary(f'{name}.interactive')} | "
+          f"배치 잔여 처리 {time.monotonic() - started:.2f}s")
+
+
+async def main():
+    batch_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    print(f"배치 요청 {batch_requests}건 동시 시작, 명령어 요청 {INTERACTIVE_REQUESTS}건, API 동시 {API_CAPACITY}건\n")
+
+    # 기존: 레인 구분 없이 하나의 세마포어를 선착순으로 공유
+    semaphore = asyncio.Semaphore(API_CAPACITY)
+    await simulate("공유 대기열", lambda lane: semaphore.acquire(), lambda lane: semaphore.release(),
+                   batch_requests, random.Random(0))
+
+    gate = LaneGate("sim", API_CAPACITY, API_RESERVES)
+    await simulate("작업 레인", gate.acquire, gate.release, batch_requests, random.Random(0))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
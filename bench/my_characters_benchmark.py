@@ -0,0 +1,93 @@
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import aiosqlite
+
+from core import db, metrics
+from core.rollup import day_bucket, event_buckets, week_start
+from core.timewindow import game_day, now_kst
+
+CHARACTERS_PER_USER = 4
+EVENTS_PER_CHARACTER = 20
+QUERIES = 500
+RARITIES = ("레전더리", "에픽", "태초")
+
+
+async def populate(character_count: int, rng: random.Random):
+    """
+    캐릭터 / 등록 / 획득 이벤트 / 롤업을 직접 적재 (record_item_events 는 건별 처리라 대량 적재에 느림)
+    """
+    now = now_kst()
+    characters, registrations, events, rollups = [], [], [], {}
+    for i in range(character_count):
+        character_id = f"char-{i:06d}"
+        adventure = f"adv-{i // 8:05d}"
+        characters.append((character_id, f"캐릭터{i}", "cain", 115, "job", "grow", adventure))
+        registrations.append((i // CHARACTERS_PER_USER, character_id))
+        for j in range(EVENTS_PER_CHARACTER):
+            occurred_at = now - timedelta(minutes=rng.randint(0, 14 * 24 * 60))
+            rarity = rng.choice(RARITIES)
+            events.append((character_id, occurred_at.strftime("%Y-%m-%d %H:%M"), f"item-{j}", "벤치 아이템",
+                           rarity, "cain", adventure))
+            for level, bucket in event_buckets(occurred_at).items():
+                key = (level, bucket, character_id, rarity)
+                rollups[key] = rollups.get(key, 0) + 1
+
+    async with aiosqlite.connect(db.DB_PATH) as conn:
+        await conn.executemany("INSERT INTO characters VALUES (?, ?, ?, ?, ?, ?, ?)", characters)
+        await conn.executemany("INSERT INTO registrations VALUES (?, ?)", registrations)
+        await conn.executemany("INSERT OR IGNORE INTO item_events VALUES (?, ?, ?, ?, ?, ?, ?, 1)", events)
+        for level, table in db.ROLLUP_TABLES.items():
+            await conn.executemany(
+                f"INSERT INTO {table} VALUES (?, ?, 'cain', 'adv', ?, ?)",
+                [(bucket, character_id, rarity, count)
+                 for (lv, bucket, character_id, rarity), count in rollups.items() if lv == level]
+            )
+        await conn.commit()
+
+
+async def measure(name: str, users: int, rng: random.Random):
+    today = game_day(now_kst())
+    day, week = day_bucket(today), day_bucket(week_start(today))
+    for _ in range(QUERIES):
+        started = time.perf_counter()
+        await db.get_user_acquisition_summary(rng.randrange(users), day, week)
+        metrics.observe(name, time.perf_counter() - started)
+    stats = metrics.summary(name)
+    print(f"{name:<10} p50 {stats['p50'] * 1000:6.2f} ms | p95 {stats['p95'] * 1000:6.2f} ms | "
+          f"p99 {stats['p99'] * 1000:6.2f} ms | max {stats['max'] * 1000:6.2f} ms")
+
+
+async def main():
+    character_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    users = (character_count + CHARACTERS_PER_USER - 1) // CHARACTERS_PER_USER
+    rng = random.Random(0)
+    # 벤치마크 로그가 결과를 가리지 않도록 정보 로그는 끔
+    db.logger.setLevel("WARNING")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        await db.init_db()
+        await populate(character_count, rng)
+        print(f"캐릭터 {character_count}명 / 사용자 {users}명 / 이벤트 {character_count * EVENTS_PER_CHARACTER}건, "
+              f"/내캐릭터 조회 {QUERIES}회 (목표 p99 < 200ms)\n")
+
+        async with aiosqlite.connect(db.DB_PATH) as conn:
+            cursor = await conn.execute("""
+                EXPLAIN QUERY PLAN
+                SELECT e.character_id FROM registrations r JOIN item_events e ON e.character_id = r.character_id
+                WHERE r.user_id = 0 ORDER BY e.event_date DESC LIMIT 10
+            """)
+            for row in await cursor.fetchall():
+                print(f"  실행 계획: {row[3]}")
+        print()
+        await measure("/내캐릭터", users, rng)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
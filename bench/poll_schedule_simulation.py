@@ -0,0 +1,92 @@
+import asyncio
+import random
+import sys
+import time
+
+from core import metrics
+from core.poll_scheduler import MAX_INFLIGHT_POLLS, PollScheduler
+
+# 실제 2분 주기를 축소해 빠르게 재현 (간격 비율은 동일)
+PERIOD = 3.0
+CYCLES = 3
+POLL_MIN = 0.005  # 조회 1건 소요 시간 범위 (초)
+POLL_MAX = 0.060
+
+
+def spacing_report(name: str, starts: list[float]):
+    spacings = [b - a for a, b in zip(starts, starts[1:])]
+    if not spacings:
+        print(f"{name}: 측정값 없음")
+        return
+    ordered = sorted(spacings)
+    last = len(ordered) - 1
+    mean = sum(ordered) / len(ordered)
+    variance = sum((s - mean) ** 2 for s in ordered) / len(ordered)
+    # 주기의 1/10 길이 창마다 시작된 요청 수의 최대값 (순간 요청률 피크)
+    window = PERIOD / 10
+    buckets = {}
+    for start in starts:
+        bucket = int((start - starts[0]) / window)
+        buckets[bucket] = buckets.get(bucket, 0) + 1
+    print(f"{name:<12} 요청 {len(starts)}건 | 간격 평균 {mean * 1000:6.1f}ms "
+          f"p5 {ordered[int(last * 0.05)] * 1000:6.1f}ms p95 {ordered[int(last * 0.95)] * 1000:7.1f}ms "
+          f"변동계수 {variance ** 0.5 / mean:5.2f} | 창({window:.1f}s)당 최대 {max(buckets.values())}건")
+
+
+async def simulate_burst(keys: list[str], rng: random.Random) -> list[float]:
+    """
+    기존 방식: 주기 시작마다 전체 명단을 동시 조회 (동시성 제한만 적용) 후 다음 주기까지 대기
+    """
+    starts = []
+    semaphore = asyncio.Semaphore(MAX_INFLIGHT_POLLS)
+
+    async def poll(_):
+        async with semaphore:
+            starts.append(time.monotonic())
+            await asyncio.sleep(rng.uniform(POLL_MIN, POLL_MAX))
+
+    for _ in range(CYCLES):
+        cycle_start = time.monotonic()
+        await asyncio.gather(*(poll(key) for key in keys))
+        await asyncio.sleep(max(0.0, cycle_start + PERIOD - time.monotonic()))
+    return starts
+
+
+async def simulate_scheduler(keys: list[str], rng: random.Random) -> list[float]:
+    starts = []
+    cycles = 0
+
+    async def load_roster():
+        return {key: key for key in keys}
+
+    async def poll(_):
+        starts.append(time.monotonic())
+        await asyncio.sleep(rng.uniform(POLL_MIN, POLL_MAX))
+
+    async def sleep(seconds):
+        await asyncio.sleep(seconds)
+        return cycles >= CYCLES
+
+    def on_cycle():
+        nonlocal cycles
+        cycles += 1
+
+    scheduler = PollScheduler("sim", PERIOD, sleep)
+    await scheduler.run(load_roster, poll, on_cycle)
+    return starts
+
+
+async def main():
+    roster_size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    rng = random.Random(0)
+    keys = [f"character-{i:04d}" for i in range(roster_size)]
+    print(f"캐릭터 {roster_size}명, 주기 {PERIOD}초 x {CYCLES}회, 조회 {POLL_MIN * 1000:.0f}~{POLL_MAX * 1000:.0f}ms, "
+          f"동시 {MAX_INFLIGHT_POLLS}건\n")
+
+    spacing_report("일괄 조회", await simulate_burst(keys, rng))
+    spacing_report("연속 스케줄", await simulate_scheduler(keys, rng))
+    print(f"\n목표 간격 {PERIOD / roster_size * 1000:.1f}ms | 스케줄러 관측값 {metrics.format_summary('sim.spacing')}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
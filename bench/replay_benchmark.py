@@ -0,0 +1,127 @@
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import aiosqlite
+
+from core import assets, db, dnf_api, lanes, metrics, recorder, storage
+from core.json_codec import loads
+from tasks import announce_digest, warm_state
+from tasks.daily_aggregation import aggregate_items_and_notify_for_period
+from tasks.notify_items import notify_all_characters
+
+# API_RECORD_DIR 로 녹화한 세션을 notify_all_characters / aggregate_items_and_notify_for_period 로 다시 실행
+# 같은 세션은 항상 같은 응답 순서로 재생되므로 코드 변경 전후 처리 시간을 실제 트래픽 형태로 비교 가능
+REPLAY_GUILD_ID = "replay"
+REPLAY_CHANNEL_ID = 1
+CHARACTER_COLUMNS = ("character_id", "character_name", "server_id", "level", "job_name", "job_grow_name",
+                     "adventure_name")
+
+
+class Channel:
+    id = REPLAY_CHANNEL_ID
+
+    def __init__(self):
+        self.sends = 0
+
+    async def send(self, embed=None, embeds=None, files=None):
+        self.sends += 1
+
+
+class Bot:
+    def __init__(self):
+        self.channel = Channel()
+
+    def get_channel(self, channel_id):
+        return self.channel if channel_id == REPLAY_CHANNEL_ID else None
+
+
+async def prepare(initial_state: dict, tmp: Path):
+    """
+    녹화 시작 시점의 로스터/아이템 인덱스/중복 제거 상태로 임시 DB 와 메모리 상태 구성
+    """
+    db.DB_PATH = tmp / "replay.db"
+    warm_state.WARM_STATE_DIR = tmp
+    assets.ASSET_DIR = tmp / "assets"
+    await db.init_db()
+    async with aiosqlite.connect(db.DB_PATH) as conn:
+        await conn.executemany(
+            f"INSERT INTO characters ({', '.join(CHARACTER_COLUMNS)}) VALUES ({', '.join('?' * len(CHARACTER_COLUMNS))})",
+            [tuple(char[column] for column in CHARACTER_COLUMNS) for char in initial_state["characters"]]
+        )
+        await conn.commit()
+    db.bump_roster_version()
+    await db.save_output_channel(REPLAY_GUILD_ID, str(REPLAY_CHANNEL_ID))
+    storage.set_store(storage.MemoryStore())
+
+    # 스냅샷 복원 경로를 그대로 사용 (로스터가 같으므로 완료 게임일 집계 캐시까지 복원)
+    snapshot = tmp / "replay_state.bin"
+    snapshot.write_bytes(warm_state.encode(initial_state["state"], int(time.time())))
+    await warm_state.restore_snapshot(snapshot)
+
+
+async def run_mark(bot: Bot, meta: dict):
+    kind = meta["mark"]
+    started = time.perf_counter()
+    if kind == "notify_cycle":
+        with lanes.use(lanes.REALTIME):
+            await notify_all_characters(bot, REPLAY_GUILD_ID)
+    elif kind == "aggregate":
+        await aggregate_items_and_notify_for_period(
+            bot, REPLAY_GUILD_ID, datetime.fromisoformat(meta["start"]), datetime.fromisoformat(meta["end"]),
+            base_time=datetime.fromisoformat(meta["base"])
+        )
+    else:
+        return
+    metrics.observe(f"replay.{kind}", time.perf_counter() - started)
+
+
+async def main():
+    if len(sys.argv) < 2:
+        print("사용법: python -m bench.replay_benchmark <녹화 세션 디렉터리> [배속 (0=대기 없이)]")
+        return
+    session_dir = Path(sys.argv[1])
+    speed = float(sys.argv[2]) if len(sys.argv) > 2 else 0
+    # 재생 중 경고 로그(이미지 미녹화 등)가 결과를 가리지 않도록 오류 로그만 출력
+    dnf_api.logger.setLevel("ERROR")
+
+    frames = recorder.read_frames(session_dir)
+    first = next(frames, None)
+    if first is None or not first[1].get("state"):
+        print(f"녹화 세션이 아니거나 초기 상태 프레임이 없습니다: {session_dir}")
+        return
+
+    bot = Bot()
+    source = recorder.ReplaySource()
+    with tempfile.TemporaryDirectory() as tmp:
+        await prepare(loads(first[2]), Path(tmp))
+        recorder.set_replay(source)
+        responses = 0
+        recorded_start = recorded_end = first[0]
+        started = time.monotonic()
+        for recorded_at, meta, body in frames:
+            recorded_end = recorded_at
+            if "mark" not in meta:
+                source.add(meta["endpoint"], meta["key"], meta["lane"], meta["status"], body)
+                responses += 1
+                continue
+            if speed > 0:
+                # 녹화 당시 작업 시점을 배속만큼 당겨서 실행
+                await asyncio.sleep(max(0.0, (recorded_at - recorded_start) / speed - (time.monotonic() - started)))
+            await run_mark(bot, meta)
+        await announce_digest.flush_all()
+        recorder.set_replay(None)
+
+    print(f"세션 {session_dir}: 녹화 {(recorded_end - recorded_start) / 60:.1f}분, 응답 {responses}건\n")
+    for kind in ("notify_cycle", "aggregate"):
+        if metrics.summary(f"replay.{kind}"):
+            print(f"{kind:<13} {metrics.format_summary(f'replay.{kind}')}")
+    print(f"\n재생 응답: {metrics.format_counters('replay.')}")
+    print(f"채널 전송: {bot.channel.sends}회")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
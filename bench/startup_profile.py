@@ -0,0 +1,58 @@
+import re
+import subprocess
+import sys
+import time
+
+# python -X importtime 출력: "import time: self [us] | cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def profile_imports(module: str) -> list[tuple[str, int, int, int]]:
+    """
+    module 을 새 인터프리터에서 import 하며 모듈별 (이름, 자체 시간, 누적 시간, 깊이) 수집 (마이크로초)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr.splitlines()[-1] if result.stderr else "import 실패")
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+
+def wall_time(module: str, repeat: int = 3) -> float:
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", f"import {module}"], capture_output=True)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    module = sys.argv[1] if len(sys.argv) > 1 else "main"
+    top = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+
+    rows = profile_imports(module)
+    print(f"'{module}' import 프로파일 ({len(rows)}개 모듈)\n")
+
+    print("최상위 의존성 (누적 시간)")
+    for name, _, cumulative, depth in sorted((r for r in rows if r[3] == 1), key=lambda r: -r[2])[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    print("\n자체 시간 상위 모듈")
+    for name, self_us, _, _ in sorted(rows, key=lambda r: -r[1])[:top]:
+        print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+    print(f"\n인터프리터 시작 포함 전체 import: {wall_time(module) * 1000:.0f} ms (3회 중 최소)")
+
+
+if __name__ == "__main__":
+    main()
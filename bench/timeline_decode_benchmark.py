@@ -0,0 +1,100 @@
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from core.events import project_timeline_rows
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+RARITIES = ["에픽", "태초", "레전더리", "유니크", "레어"]
+DUNGEONS = ["안개신 레이드", "이스핀즈", "달이 잠긴 호수", "흑천의 주인", "무의식 종말의 숭배자"]
+
+
+def make_sample_payloads(pages: int = 300, rows_per_page: int = 100) -> list[bytes]:
+    """
+    타임라인 API 응답 형태를 흉내 낸 샘플 페이로드 생성 (녹화본이 없을 때 사용)
+    """
+    rng = random.Random(0)
+    payloads = []
+    for page in range(pages):
+        rows = []
+        for i in range(rows_per_page):
+            rows.append({
+                "code": rng.choice([504, 505, 507, 508, 513]),
+                "name": "아이템 획득(던전 드랍)",
+                "date": f"2026-10-{rng.randint(1, 28):02d} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+                "data": {
+                    "itemId": f"{rng.getrandbits(128):032x}",
+                    "itemName": f"샘플 아이템 {rng.randint(1, 5000)}",
+                    "itemRarity": rng.choice(RARITIES),
+                    "channelName": "소원의 정원",
+                    "channelNo": rng.randint(1, 99),
+                    "dungeonName": rng.choice(DUNGEONS),
+                },
+            })
+        payload = {
+            "next": f"{page + 1}" if page < pages - 1 else None,
+            "date": {"start": "2026-10-01 00:00", "end": "2026-10-29 00:00"},
+            "timeline": {"rows": rows},
+        }
+        payloads.append(json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+    return payloads
+
+
+def load_recorded_payloads(directory: Path) -> list[bytes]:
+    return [path.read_bytes() for path in sorted(directory.glob("*.json"))]
+
+
+def bench_decode(name, loads, payloads, repeat: int = 5):
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for payload in payloads:
+            loads(payload)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{name:<8} 디코딩: {best * 1000:8.1f} ms")
+
+
+def bench_memory(name, loads, payloads, project: bool):
+    tracemalloc.start()
+    kept = []
+    for payload in payloads:
+        rows = loads(payload).get("timeline", {}).get("rows", [])
+        kept.extend(project_timeline_rows(rows) if project else rows)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:<28} 보관 메모리: {current / 1024 / 1024:8.2f} MiB ({len(kept)}건)")
+    return current
+
+
+def main():
+    if len(sys.argv) > 1:
+        payloads = load_recorded_payloads(Path(sys.argv[1]))
+        print(f"녹화된 페이로드 {len(payloads)}개 사용: {sys.argv[1]}")
+    else:
+        payloads = make_sample_payloads()
+        print(f"샘플 페이로드 {len(payloads)}개 생성")
+    print(f"총 {sum(len(p) for p in payloads) / 1024 / 1024:.2f} MiB\n")
+
+    bench_decode("json", json.loads, payloads)
+    if orjson is not None:
+        bench_decode("orjson", orjson.loads, payloads)
+    else:
+        print("orjson 미설치 - 비교 생략")
+
+    fast_loads = orjson.loads if orjson is not None else json.loads
+    print()
+    dict_bytes = bench_memory("dict rows", fast_loads, payloads, project=False)
+    event_bytes = bench_memory("TimelineEvent (__slots__)", fast_loads, payloads, project=True)
+    print(f"\n메모리 절감: {(1 - event_bytes / dict_bytes) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from core import db, dnf_api, storage
+from tasks import warm_state
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    # 벤치마크 로그가 결과를 가리지 않도록 정보 로그는 끔
+    dnf_api.logger.setLevel("WARNING")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = Path(tmp) / "bench.db"
+        warm_state.WARM_STATE_DIR = Path(tmp)
+        await db.init_db()
+        await db.save_item_levels({f"bench-item-{i:06d}": 115 for i in range(count)})
+        storage.set_store(storage.SQLiteStore())
+        print(f"아이템 캐시 {count}개 (DB: 임시 파일)\n")
+
+        started = time.perf_counter()
+        await dnf_api.preload_item_cache()
+        cold = time.perf_counter() - started
+        print(f"DB 전체 적재 (기존)  : {cold * 1000:8.1f} ms")
+
+        await warm_state.save_snapshot()
+        size = warm_state.snapshot_path().stat().st_size
+        dnf_api.ITEM_DETAIL_MEMCACHE = {}
+
+        started = time.perf_counter()
+        restored = await warm_state.restore_snapshot()
+        warm = time.perf_counter() - started
+        print(f"스냅샷 복원          : {warm * 1000:8.1f} ms (파일 {size / 1024:.1f}KB, 복원 {restored})")
+        print(f"\n복원된 아이템: {len(dnf_api.ITEM_DETAIL_MEMCACHE)}개 | 부팅 적재 단축 {cold / max(warm, 1e-9):.1f}배")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
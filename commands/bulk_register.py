@@ -0,0 +1,62 @@
+import discord
+from discord import app_commands, Interaction, ui
+
+from core.bulk_register import MAX_BULK_ENTRIES, parse_character_list, resolve_characters
+from core.db import save_characters_bulk
+from core.logger import logger
+from tasks.notify_items import seed_new_characters
+
+MAX_LISTED_FAILURES = 20
+
+
+def format_bulk_result(saved: int, new: int, failures: list[str]) -> str:
+    message = f"✅ {saved}개 캐릭터 등록 완료 (신규 {new}개)"
+    if failures:
+        listed = "\n".join(f"- {failure}" for failure in failures[:MAX_LISTED_FAILURES])
+        more = f"\n... 외 {len(failures) - MAX_LISTED_FAILURES}개" if len(failures) > MAX_LISTED_FAILURES else ""
+        message += f"\n⚠️ 등록하지 못한 항목 {len(failures)}개:\n{listed}{more}"
+    return message
+
+
+class BulkRegisterModal(ui.Modal, title="캐릭터 일괄 등록"):
+    entries_input = ui.TextInput(
+        label="서버:캐릭터명 (한 줄에 하나)",
+        style=discord.TextStyle.paragraph,
+        placeholder="카인:캐릭터1\n카인:캐릭터2\n시로코:캐릭터3",
+        max_length=4000,
+    )
+
+    def __init__(self, adventure_name: str | None):
+        super().__init__()
+        self.adventure_name = adventure_name
+
+    async def on_submit(self, interaction: Interaction):
+        entries, invalid = parse_character_list(self.entries_input.value)
+        logger.info(f"/일괄등록 제출: 사용자={interaction.user.id}, {len(entries)}개 항목, 형식 오류 {len(invalid)}개")
+        if not entries:
+            # noinspection PyUnresolvedReferences
+            await interaction.response.send_message("⚠️ `서버:캐릭터명` 형식의 항목이 없어요.", ephemeral=True)
+            return
+
+        # noinspection PyUnresolvedReferences
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        characters, failures = await resolve_characters(entries, self.adventure_name)
+        new_ids = await save_characters_bulk(interaction.user.id, characters)
+        coordinator = getattr(interaction.client, "coordinator", None)
+        if coordinator is not None:
+            # 워커 프로세스 모드: 감시 상태는 워커에 있으므로 담당 워커로 전달
+            coordinator.seed_new_characters(new_ids)
+        else:
+            seed_new_characters(new_ids)
+
+        failures = [f"{line} (형식 오류)" for line in invalid] + failures
+        await interaction.followup.send(format_bulk_result(len(characters), len(new_ids), failures), ephemeral=True)
+        logger.info(f"/일괄등록 완료: 사용자={interaction.user.id}, 등록 {len(characters)}개, 실패 {len(failures)}개")
+
+
+@app_commands.command(name="일괄등록", description=f"여러 캐릭터를 한 번에 등록합니다 (최대 {MAX_BULK_ENTRIES}개)")
+@app_commands.describe(adventure="입력한 캐릭터 중 이 모험단 소속만 등록 (선택)")
+async def bulk_register_command(interaction: Interaction, adventure: str | None = None):
+    logger.info(f"/일괄등록 명령어 호출: 사용자={interaction.user.id}, 모험단={adventure}")
+    # noinspection PyUnresolvedReferences
+    await interaction.response.send_modal(BulkRegisterModal(adventure))
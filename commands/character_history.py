@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+import discord
+from discord import app_commands, Interaction, Embed
+from core.db import get_characters_by_name, get_character_daily_history
+from core.logger import logger
+from core.models import SERVER_MAP, RARITY_WEIGHTS
+from core.rollup import day_bucket
+from core.timewindow import game_day, now_kst
+
+
+def format_history_embed(char: dict, rows: list[dict], days: int) -> Embed:
+    per_day = {}
+    for row in rows:
+        per_day.setdefault(row["bucket"], {})[row["item_rarity"]] = row["count"]
+
+    lines = []
+    total = {}
+    for bucket, counts in per_day.items():
+        score = sum(RARITY_WEIGHTS.get(r, 0) * c for r, c in counts.items())
+        lines.append(
+            f"`{bucket[4:6]}/{bucket[6:]}` 점수 {score} "
+            f"(태초:{counts.get('태초', 0)}, 에픽:{counts.get('에픽', 0)}, 레전더리:{counts.get('레전더리', 0)})"
+        )
+        for rarity, count in counts.items():
+            total[rarity] = total.get(rarity, 0) + count
+
+    server_kr = SERVER_MAP.get(char["server_id"], char["server_id"])
+    embed = Embed(
+        title=f"📜 {char['character_name']} ({server_kr}) 최근 {days}일 획득 기록",
+        description="\n".join(lines) if lines else "기록된 획득 내역이 없어요.",
+        color=discord.Color.blurple()
+    )
+    embed.set_footer(
+        text=f"합계 - 태초:{total.get('태초', 0)}, 에픽:{total.get('에픽', 0)}, 레전더리:{total.get('레전더리', 0)}"
+    )
+    return embed
+
+
+@app_commands.command(name="캐릭터기록", description="등록된 캐릭터의 게임일별 아이템 획득 기록을 보여줍니다")
+@app_commands.describe(name="캐릭터 이름", days="조회할 기간 (일)")
+async def character_history(interaction: Interaction, name: str, days: app_commands.Range[int, 1, 31] = 7):
+    logger.info(f"/캐릭터기록 명령어 호출: 사용자={interaction.user.id}, 이름={name}, 기간={days}")
+    characters = await get_characters_by_name(name)
+    if not characters:
+        # noinspection PyUnresolvedReferences
+        await interaction.response.send_message("❌ 등록된 캐릭터 중에서 찾을 수 없어요.", ephemeral=True)
+        return
+
+    start_bucket = day_bucket(game_day(now_kst()) - timedelta(days=days - 1))
+    embeds = []
+    for char in characters[:10]:
+        rows = await get_character_daily_history(char["character_id"], start_bucket)
+        embeds.append(format_history_embed(char, rows, days))
+
+    # noinspection PyUnresolvedReferences
+    await interaction.response.send_message(embeds=embeds)
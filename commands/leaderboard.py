@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from discord import app_commands, Interaction
+from core.logger import logger
+from core.rollup import current_week_range, current_month_range, rollup_leaderboard
+from core.timewindow import now_kst
+from tasks.daily_aggregation import format_rank_embed, MAX_RANK_FIELDS
+
+
+@app_commands.command(name="주간순위", description="주간(목요일 06시 기준) 모험단 아이템 획득량 순위를 보여줍니다")
+@app_commands.describe(weeks_ago="몇 주 전 순위를 볼지 선택하세요 (0 = 이번 주)")
+async def weekly_ranking(interaction: Interaction, weeks_ago: app_commands.Range[int, 0, 52] = 0):
+    logger.info(f"/주간순위 명령어 호출: 사용자={interaction.user.id}, weeks_ago={weeks_ago}")
+    now = now_kst()
+    start, end = current_week_range(now, weeks_ago)
+    previous = current_week_range(now, weeks_ago + 1)
+
+    rank_list = await rollup_leaderboard("week", start, end, previous=previous, n=MAX_RANK_FIELDS)
+    if not rank_list:
+        # noinspection PyUnresolvedReferences
+        await interaction.response.send_message("⚠️ 해당 주에 집계된 아이템 획득 기록이 없어요.", ephemeral=True)
+        return
+
+    embed = format_rank_embed(
+        rank_list, now,
+        title="모험단 주간 아이템 획득량 순위",
+        description=f"기간: {start.strftime('%m/%d')} 06:00 ~ {(end + timedelta(days=1)).strftime('%m/%d')} 06:00"
+    )
+    # noinspection PyUnresolvedReferences
+    await interaction.response.send_message(embed=embed)
+
+
+@app_commands.command(name="월간순위", description="월간 모험단 아이템 획득량 순위를 보여줍니다")
+@app_commands.describe(months_ago="몇 달 전 순위를 볼지 선택하세요 (0 = 이번 달)")
+async def monthly_ranking(interaction: Interaction, months_ago: app_commands.Range[int, 0, 24] = 0):
+    logger.info(f"/월간순위 명령어 호출: 사용자={interaction.user.id}, months_ago={months_ago}")
+    now = now_kst()
+    start, end = current_month_range(now, months_ago)
+    previous = current_month_range(now, months_ago + 1)
+
+    rank_list = await rollup_leaderboard("day", start, end, previous=previous, n=MAX_RANK_FIELDS)
+    if not rank_list:
+        # noinspection PyUnresolvedReferences
+        await interaction.response.send_message("⚠️ 해당 월에 집계된 아이템 획득 기록이 없어요.", ephemeral=True)
+        return
+
+    embed = format_rank_embed(
+        rank_list, now,
+        title=f"모험단 {start.strftime('%Y년 %m월')} 아이템 획득량 순위",
+        description=f"기간: {start.strftime('%m/%d')} ~ {end.strftime('%m/%d')} (게임일 기준)"
+    )
+    # noinspection PyUnresolvedReferences
+    await interaction.response.send_message(embed=embed)
@@ -0,0 +1,53 @@
+import discord
+from discord import app_commands
+
+from core import lanes, loop_monitor
+from core.logger import logger
+
+MAX_SLOW_CALLBACK_LINES = 5
+
+
+@app_commands.command(name="루프상태", description="이벤트 루프 지연 통계와 최근 느린 콜백을 보여줍니다 (관리자)")
+@app_commands.default_permissions(administrator=True)
+async def loop_status(interaction: discord.Interaction):
+    logger.info(f"/루프상태 명령 호출됨: user={interaction.user.id}")
+    embed = discord.Embed(
+        title="이벤트 루프 상태",
+        description=f"스케줄링 지연: {loop_monitor.format_lag_summary()}",
+        color=0x00ff00
+    )
+    embed.add_field(name="작업 레인", value=lanes.format_lane_summary()[:1024], inline=False)
+    recent = list(loop_monitor.SLOW_CALLBACKS)[-MAX_SLOW_CALLBACK_LINES:]
+    for entry in reversed(recent):
+        where = entry["stack"][-1].strip().splitlines()[0] if entry["stack"] else "스택 없음"
+        embed.add_field(
+            name=f"{entry['at'].strftime('%m-%d %H:%M:%S')} · {entry['duration'] * 1000:.0f}ms",
+            value=f"`{entry['name'][:200]}`\n{where[:700]}",
+            inline=False
+        )
+    if not loop_monitor.CALLBACK_TRACE:
+        embed.add_field(name="느린 콜백", value="계측 꺼짐 (`LOOP_CALLBACK_TRACE=1` 로 켜기)", inline=False)
+    elif not recent:
+        embed.add_field(name="느린 콜백", value="기록 없음", inline=False)
+    # noinspection PyUnresolvedReferences
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+@app_commands.command(name="프로파일", description="이벤트 루프를 일정 시간 샘플링해 flamegraph 파일로 받습니다 (관리자)")
+@app_commands.describe(seconds="샘플링 시간 (초)")
+@app_commands.default_permissions(administrator=True)
+async def loop_profile(interaction: discord.Interaction,
+                       seconds: app_commands.Range[int, 1, loop_monitor.MAX_PROFILE_SECONDS] = 10):
+    logger.info(f"/프로파일 명령 호출됨: user={interaction.user.id}, seconds={seconds}")
+    # noinspection PyUnresolvedReferences
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    try:
+        path, total = await loop_monitor.run_profile(seconds)
+    except RuntimeError as e:
+        await interaction.followup.send(f"❌ {e}", ephemeral=True)
+        return
+    await interaction.followup.send(
+        f"{seconds}초 동안 {total}개 샘플 수집 (flamegraph.pl / speedscope 의 collapsed 포맷)",
+        file=discord.File(path, filename=path.name),
+        ephemeral=True
+    )
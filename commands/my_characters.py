@@ -0,0 +1,82 @@
+import time
+
+import discord
+from discord import app_commands, Interaction, Embed
+from core import metrics
+from core.db import get_user_acquisition_summary
+from core.logger import logger
+from core.models import SERVER_MAP, RARITY_WEIGHTS
+from core.rollup import day_bucket, week_start
+from core.timewindow import game_day, now_kst
+
+MAX_LISTED_CHARACTERS = 20
+RECENT_DROP_LIMIT = 10
+
+
+def format_counts(counts: dict) -> str:
+    score = sum(RARITY_WEIGHTS.get(r, 0) * c for r, c in counts.items())
+    return f"점수 {score} (태초:{counts.get('태초', 0)}, 에픽:{counts.get('에픽', 0)}, 레전더리:{counts.get('레전더리', 0)})"
+
+
+def group_counts(rows: list[dict]) -> dict[str, dict[str, int]]:
+    per_character = {}
+    for row in rows:
+        per_character.setdefault(row["character_id"], {})[row["item_rarity"]] = row["count"]
+    return per_character
+
+
+def format_my_characters_embed(summary: dict) -> Embed:
+    characters = summary["characters"]
+    daily = group_counts(summary["daily"])
+    weekly = group_counts(summary["weekly"])
+    names = {char["character_id"]: char["character_name"] for char in characters}
+
+    total_daily, total_weekly = {}, {}
+    for counts, total in ((daily, total_daily), (weekly, total_weekly)):
+        for per_rarity in counts.values():
+            for rarity, count in per_rarity.items():
+                total[rarity] = total.get(rarity, 0) + count
+
+    embed = Embed(
+        title=f"🧾 내 캐릭터 {len(characters)}개 획득 현황",
+        description=f"**오늘** {format_counts(total_daily)}\n**이번 주** {format_counts(total_weekly)}",
+        color=discord.Color.blurple()
+    )
+    for char in characters[:MAX_LISTED_CHARACTERS]:
+        server_kr = SERVER_MAP.get(char["server_id"], char["server_id"])
+        character_id = char["character_id"]
+        embed.add_field(
+            name=f"{char['character_name']} ({server_kr}) - {char['adventure_name']}",
+            value=f"오늘 {format_counts(daily.get(character_id, {}))}\n"
+                  f"이번 주 {format_counts(weekly.get(character_id, {}))}",
+            inline=False
+        )
+    if summary["recent"]:
+        lines = [
+            f"`{row['event_date'][5:16]}` {names.get(row['character_id'], '?')} - [{row['item_rarity']}] {row['item_name']}"
+            + (f" x{row['count']}" if row["count"] > 1 else "")
+            for row in summary["recent"]
+        ]
+        embed.add_field(name="최근 획득", value="\n".join(lines)[:1024], inline=False)
+    if len(characters) > MAX_LISTED_CHARACTERS:
+        embed.set_footer(text=f"캐릭터 {len(characters) - MAX_LISTED_CHARACTERS}개는 생략 (합계에는 포함)")
+    return embed
+
+
+@app_commands.command(name="내캐릭터", description="내가 등록한 캐릭터들의 오늘/이번 주 획득 현황과 최근 획득 아이템을 보여줍니다")
+async def my_characters(interaction: Interaction):
+    logger.info(f"/내캐릭터 명령어 호출: 사용자={interaction.user.id}")
+    started = time.perf_counter()
+    # 응답 경로에서는 API 를 호출하지 않고 로컬 이벤트 저장소/롤업만 조회
+    today = game_day(now_kst())
+    summary = await get_user_acquisition_summary(
+        interaction.user.id, day_bucket(today), day_bucket(week_start(today)), RECENT_DROP_LIMIT
+    )
+    metrics.observe("command.my_characters", time.perf_counter() - started)
+    if not summary["characters"]:
+        # noinspection PyUnresolvedReferences
+        await interaction.response.send_message("⚠️ 등록한 캐릭터가 없어요. `/등록` 으로 먼저 등록해 주세요.", ephemeral=True)
+        return
+
+    # noinspection PyUnresolvedReferences
+    await interaction.response.send_message(embed=format_my_characters_embed(summary), ephemeral=True)
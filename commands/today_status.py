@@ -1,34 +1,38 @@
 from discord import app_commands, Interaction
-from datetime import datetime, timedelta
-from tasks.daily_aggregation import aggregate_items_and_notify_for_period  # 기간 지정 집계 함수
-import pytz
-
-KST = pytz.timezone('Asia/Seoul')
+from datetime import datetime
+from core.timewindow import game_day, game_day_start, now_kst
+from tasks.daily_aggregation import aggregate_items_and_notify_for_period, INTERACTIVE_RETRY_DURATION  # 기간 지정 집계 함수
 
 
 def get_today_period(now: datetime):
-    today_6am = now.replace(hour=6, minute=0, second=0, microsecond=0)
-    if now < today_6am:
-        start_time = today_6am - timedelta(days=1)  # 어제 6시
-    else:
-        start_time = today_6am  # 오늘 6시
+    # 06:00 이전이면 어제 6시, 이후면 오늘 6시부터 (게임일 기준)
+    start_time = game_day_start(game_day(now))
     end_time = now
     return start_time, end_time
 
 
 @app_commands.command(name="오늘현황", description="오늘 지금까지의 모험단 아이템 획득량을 집계해 보여줍니다.")
 async def today_status(interaction: Interaction):
-    now = datetime.now(KST)
+    now = now_kst()
     start_time, end_time = get_today_period(now)
 
-    await aggregate_items_and_notify_for_period(
+    # 집계가 3초 이상 걸릴 수 있으므로 먼저 응답을 미룸
+    # noinspection PyUnresolvedReferences
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    sent = await aggregate_items_and_notify_for_period(
         interaction.client,  # 봇 인스턴스
         str(interaction.guild_id),  # 길드 ID
         start_time,
-        end_time
+        end_time,
+        # 명령 응답이 몇 시간씩 걸리지 않도록 캐릭터별 재시도 시간을 짧게 제한
+        retry_duration=INTERACTIVE_RETRY_DURATION
     )
 
-    await interaction.response.send_message(
+    if not sent:
+        # 봇 종료 중이거나 출력 채널이 없어 순위를 보내지 못한 경우
+        await interaction.followup.send("집계 결과를 전송하지 못했습니다. 잠시 후 다시 시도해주세요.", ephemeral=True)
+        return
+    await interaction.followup.send(
         f"오늘 {start_time.strftime('%m/%d %H:%M')}부터 {end_time.strftime('%m/%d %H:%M')}까지 집계를 완료했습니다.",
         ephemeral=True
     )
@@ -1,76 +1,128 @@
 from core.logger import logger
 import discord
 from discord import app_commands, Interaction, Embed, ui
-from core.db import get_all_characters_grouped_by_adventure
+from core.models import SERVER_CHOICES_KR
+from core.roster import get_roster_snapshot, plan_pages
+
+
+def render_page(groups: tuple, plan: tuple, page_index: int) -> list[Embed]:
+    """
+    페이지 계획의 한 페이지만 Embed로 렌더링 (페이지 이동 시점에만 호출)
+    """
+    embeds = []
+    for group_index, start, end, part_no, part_total in plan[page_index]:
+        title, _, _, lines = groups[group_index]
+        if part_total > 1:
+            title = f"{title} ({part_no}/{part_total})"
+        embeds.append(Embed(
+            title=title,
+            description="\n".join(lines[start:end]),
+            color=discord.Color.green()
+        ))
+    if len(plan) > 1:
+        embeds[-1].set_footer(text=f"페이지 {page_index + 1}/{len(plan)}")
+    return embeds
+
+
+class PageJumpModal(ui.Modal, title="페이지 이동"):
+    page_input = ui.TextInput(label="이동할 페이지 번호", max_length=6)
+
+    def __init__(self, pagination_view):
+        super().__init__()
+        self.pagination_view = pagination_view
+        self.page_input.placeholder = f"1 ~ {len(pagination_view.plan)}"
+
+    async def on_submit(self, interaction: Interaction):
+        try:
+            page = int(self.page_input.value)
+        except ValueError:
+            # noinspection PyUnresolvedReferences
+            await interaction.response.send_message("⚠️ 페이지 번호는 숫자로 입력해 주세요.", ephemeral=True)
+            return
+        await self.pagination_view.show_page(interaction, page - 1)
 
 
 class PaginationView(ui.View):
-    def __init__(self, embeds: list[list[Embed]], user_id: int):
+    def __init__(self, groups: tuple, plan: tuple, user_id: int, current_page: int = 0):
         super().__init__(timeout=60)
-        self.embeds = embeds  # 2D 리스트: page -> embeds
+        # 렌더링된 Embed 대신 공유 스냅샷과 페이지 계획만 보관 (뷰당 메모리 고정)
+        self.groups = groups
+        self.plan = plan
         self.user_id = user_id
-        self.current_page = 0
+        self.current_page = current_page
 
         self.prev_button = ui.Button(label="⬅️ 이전", style=discord.ButtonStyle.secondary)
+        self.jump_button = ui.Button(label="🔢 이동", style=discord.ButtonStyle.primary)
         self.next_button = ui.Button(label="다음 ➡️", style=discord.ButtonStyle.secondary)
         self.prev_button.callback = self.go_previous
+        self.jump_button.callback = self.open_jump_modal
         self.next_button.callback = self.go_next
         self.add_item(self.prev_button)
+        self.add_item(self.jump_button)
         self.add_item(self.next_button)
 
-    async def go_previous(self, interaction: Interaction):
+    async def _check_user(self, interaction: Interaction, action: str) -> bool:
         if interaction.user.id != self.user_id:
             # noinspection PyUnresolvedReferences
             await interaction.response.send_message("⚠️ 본인이 실행한 명령어만 조작할 수 있어요.", ephemeral=True)
-            logger.warning(f"권한 없는 사용자 {interaction.user.id}가 이전 페이지 버튼을 누름")
+            logger.warning(f"권한 없는 사용자 {interaction.user.id}가 {action} 버튼을 누름")
+            return False
+        return True
+
+    async def show_page(self, interaction: Interaction, page_index: int):
+        if not 0 <= page_index < len(self.plan):
+            # noinspection PyUnresolvedReferences
+            await interaction.response.send_message(
+                f"⚠️ 페이지는 1 ~ {len(self.plan)} 사이로 입력해 주세요.", ephemeral=True)
+            return
+        self.current_page = page_index
+        # noinspection PyUnresolvedReferences
+        await interaction.response.edit_message(
+            embeds=render_page(self.groups, self.plan, self.current_page), view=self)
+        logger.info(f"사용자 {interaction.user.id}가 페이지 이동: {self.current_page}")
+
+    async def go_previous(self, interaction: Interaction):
+        if not await self._check_user(interaction, "이전 페이지"):
             return
         if self.current_page > 0:
-            self.current_page -= 1
-            # noinspection PyUnresolvedReferences
-            await interaction.response.edit_message(embeds=self.embeds[self.current_page], view=self)
-            logger.info(f"사용자 {interaction.user.id}가 페이지를 이전으로 이동: {self.current_page}")
+            await self.show_page(interaction, self.current_page - 1)
 
     async def go_next(self, interaction: Interaction):
-        if interaction.user.id != self.user_id:
-            # noinspection PyUnresolvedReferences
-            await interaction.response.send_message("⚠️ 본인이 실행한 명령어만 조작할 수 있어요.", ephemeral=True)
-            logger.warning(f"권한 없는 사용자 {interaction.user.id}가 다음 페이지 버튼을 누름")
+        if not await self._check_user(interaction, "다음 페이지"):
             return
-        if self.current_page < len(self.embeds) - 1:
-            self.current_page += 1
-            # noinspection PyUnresolvedReferences
-            await interaction.response.edit_message(embeds=self.embeds[self.current_page], view=self)
-            logger.info(f"사용자 {interaction.user.id}가 페이지를 다음으로 이동: {self.current_page}")
+        if self.current_page < len(self.plan) - 1:
+            await self.show_page(interaction, self.current_page + 1)
+
+    async def open_jump_modal(self, interaction: Interaction):
+        if not await self._check_user(interaction, "페이지 이동"):
+            return
+        # noinspection PyUnresolvedReferences
+        await interaction.response.send_modal(PageJumpModal(self))
 
 
 @app_commands.command(name="전체조회", description="등록된 모든 캐릭터를 모험단 단위로 조회합니다")
-async def total_command(interaction: Interaction):
-    logger.info(f"/전체조회 명령어 호출: 사용자={interaction.user.id}")
+@app_commands.describe(server="서버로 필터링", adventure="모험단 이름으로 필터링", page="시작 페이지")
+@app_commands.choices(server=SERVER_CHOICES_KR)
+async def total_command(interaction: Interaction, server: app_commands.Choice[str] = None,
+                        adventure: str = None, page: app_commands.Range[int, 1] = 1):
+    server_id = server.value if server else None
+    logger.info(f"/전체조회 명령어 호출: 사용자={interaction.user.id}, 서버={server_id}, 모험단={adventure}, 페이지={page}")
     # noinspection PyUnresolvedReferences
     await interaction.response.defer(thinking=True)
 
-    grouped_data = await get_all_characters_grouped_by_adventure()
-    if not grouped_data:
-        await interaction.followup.send("⚠️ 아직 등록된 캐릭터가 없어요.", ephemeral=True)
+    groups = await get_roster_snapshot()
+    plan = plan_pages(groups, server_id, adventure)
+    if not plan:
+        await interaction.followup.send("⚠️ 조건에 맞는 등록된 캐릭터가 없어요.", ephemeral=True)
         logger.info(f"/전체조회 결과 없음: 사용자={interaction.user.id}")
         return
 
-    # Embed 생성
-    all_embeds = []
-    for adv_full_name, chars in grouped_data.items():
-        desc = "\n".join(f"- {char['character_name']} - {char['job_grow_name']}" for char in chars)
-        embed = Embed(
-            title=f"📛 모험단: {adv_full_name}",
-            description=desc,
-            color=discord.Color.green()
-        )
-        all_embeds.append(embed)
-
-    if len(all_embeds) <= 10:
-        await interaction.followup.send(embeds=all_embeds)
-        logger.info(f"/전체조회 결과 {len(all_embeds)}개 Embed 전송: 사용자={interaction.user.id}")
+    page_index = min(page, len(plan)) - 1
+    embeds = render_page(groups, plan, page_index)
+    if len(plan) == 1:
+        await interaction.followup.send(embeds=embeds)
+        logger.info(f"/전체조회 결과 {len(embeds)}개 Embed 전송: 사용자={interaction.user.id}")
     else:
-        pages = [all_embeds[i:i + 10] for i in range(0, len(all_embeds), 10)]
-        view = PaginationView(pages, user_id=interaction.user.id)
-        await interaction.followup.send(embeds=pages[0], view=view)
-        logger.info(f"/전체조회 결과 {len(all_embeds)}개 Embed, 페이지네이션 시작: 사용자={interaction.user.id}")
+        view = PaginationView(groups, plan, user_id=interaction.user.id, current_page=page_index)
+        await interaction.followup.send(embeds=embeds, view=view)
+        logger.info(f"/전체조회 결과 {len(plan)}페이지, 페이지네이션 시작: 사용자={interaction.user.id}")
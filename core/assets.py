@@ -0,0 +1,164 @@
+import asyncio
+import os
+from pathlib import Path
+
+from core import dnf_api, metrics
+from core.logger import logger
+
+# 아이템 아이콘/캐릭터 이미지 로컬 캐시 (알림 전송 시 네트워크 없이 첨부)
+ASSET_DIR = Path("data/assets")
+MAX_ASSET_BYTES = int(os.getenv("ASSET_CACHE_MAX_MB", "128")) * 1024 * 1024
+PRUNE_TARGET_RATIO = 0.9
+MAX_CONCURRENT_DOWNLOADS = 4
+ASSET_WAIT_TIMEOUT = 1.5  # 전송 시 진행 중인 프리페치를 기다리는 최대 시간 (초)
+CHARACTER_IMAGE_ZOOM = 1
+
+ITEM_IMAGE_URL = "https://img-api.neople.co.kr/df/items/{item_id}"
+
+_inflight: dict[tuple[str, str], asyncio.Task] = {}
+_download_semaphore = None
+_total_bytes = None  # 첫 저장 시 디렉터리를 훑어 계산
+
+
+def _semaphore() -> asyncio.Semaphore:
+    global _download_semaphore
+    if _download_semaphore is None:
+        _download_semaphore = asyncio.Semaphore(MAX_CONCURRENT_DOWNLOADS)
+    return _download_semaphore
+
+
+def asset_path(kind: str, key: str) -> Path:
+    return ASSET_DIR / kind / f"{key}.png"
+
+
+def item_asset_key(item_id: str) -> tuple[str, str, str]:
+    return "items", item_id, ITEM_IMAGE_URL.format(item_id=item_id)
+
+
+def character_asset_key(server_id: str, character_id: str) -> tuple[str, str, str]:
+    url = f"https://img-api.neople.co.kr/df/servers/{server_id}/characters/{character_id}?zoom={CHARACTER_IMAGE_ZOOM}"
+    return "characters", f"{server_id}_{character_id}", url
+
+
+# ===============================
+# 디스크 캐시 (파일 1개 = 이미지 1개, mtime 을 마지막 사용 시각으로 사용)
+# ===============================
+def _read_file(path: Path) -> bytes | None:
+    try:
+        data = path.read_bytes()
+    except FileNotFoundError:
+        return None
+    os.utime(path)
+    return data
+
+
+def _write_file(path: Path, data: bytes) -> int:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+    return len(data)
+
+
+def _scan_total() -> int:
+    if not ASSET_DIR.exists():
+        return 0
+    return sum(p.stat().st_size for p in ASSET_DIR.glob("*/*.png"))
+
+
+def _prune() -> tuple[int, int]:
+    files = sorted(ASSET_DIR.glob("*/*.png"), key=lambda p: p.stat().st_mtime)
+    total = sum(p.stat().st_size for p in files)
+    target = int(MAX_ASSET_BYTES * PRUNE_TARGET_RATIO)
+    removed = 0
+    for path in files:
+        if total <= target:
+            break
+        size = path.stat().st_size
+        path.unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed, total
+
+
+async def _store(path: Path, data: bytes):
+    global _total_bytes
+    if _total_bytes is None:
+        _total_bytes = await asyncio.to_thread(_scan_total)
+    _total_bytes += await asyncio.to_thread(_write_file, path, data)
+    if _total_bytes > MAX_ASSET_BYTES:
+        removed, _total_bytes = await asyncio.to_thread(_prune)
+        metrics.inc("assets.evicted", removed)
+        logger.info(f"이미지 캐시 정리: {removed}개 삭제, 현재 {_total_bytes / 1024 / 1024:.1f} MiB")
+
+
+# ===============================
+# 조회 / 프리페치
+# ===============================
+async def _download(kind: str, key: str, url: str) -> bytes | None:
+    path = asset_path(kind, key)
+    data = await asyncio.to_thread(_read_file, path)
+    if data is not None:
+        metrics.inc(f"assets.{kind}.disk_hit")
+        return data
+
+    async with _semaphore():
+        result = await dnf_api._request("image", url)
+    if result is None or result[0] != 200:
+        metrics.inc(f"assets.{kind}.failed")
+        logger.warning(f"이미지 다운로드 실패: {kind}/{key}")
+        return None
+    metrics.inc(f"assets.{kind}.downloaded")
+    try:
+        await _store(path, result[1])
+    except OSError as e:
+        logger.error(f"이미지 캐시 저장 실패: {kind}/{key} - {e}")
+    return result[1]
+
+
+def _ensure_task(kind: str, key: str, url: str) -> asyncio.Task:
+    """
+    같은 이미지에 대한 동시 요청은 진행 중인 작업 하나를 공유
+    """
+    task = _inflight.get((kind, key))
+    if task is None:
+        task = asyncio.create_task(_download(kind, key, url))
+        _inflight[(kind, key)] = task
+        task.add_done_callback(lambda _: _inflight.pop((kind, key), None))
+    else:
+        metrics.inc(f"assets.{kind}.deduplicated")
+    return task
+
+
+async def get_asset(kind: str, key: str, url: str, timeout: float | None = None) -> bytes | None:
+    """
+    이미지 바이트 반환 (디스크 캐시 -> 진행 중인 프리페치 -> 다운로드)
+    timeout 안에 준비되지 않으면 None (다운로드는 백그라운드에서 계속 진행)
+    """
+    task = _ensure_task(kind, key, url)
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+    except asyncio.TimeoutError:
+        metrics.inc(f"assets.{kind}.wait_timeout")
+        return None
+
+
+def prefetch_announcement_assets(char, events):
+    """
+    득템 감지 직후 호출: 아이템 아이콘과 캐릭터 이미지를 백그라운드로 미리 받아둠
+    """
+    _ensure_task(*character_asset_key(char["server_id"], char["character_id"]))
+    for item_id in {event.item_id for event in events}:
+        _ensure_task(*item_asset_key(item_id))
+
+
+async def get_announcement_assets(announcement: dict) -> tuple[bytes | None, bytes | None]:
+    """
+    알림 1건에 첨부할 (아이템 아이콘, 캐릭터 이미지) 바이트, 준비되지 않은 이미지는 None
+    """
+    item_icon, character_image = await asyncio.gather(
+        get_asset(*item_asset_key(announcement["item_id"]), timeout=ASSET_WAIT_TIMEOUT),
+        get_asset(*character_asset_key(announcement["server_id"], announcement["character_id"]),
+                  timeout=ASSET_WAIT_TIMEOUT),
+    )
+    return item_icon, character_image
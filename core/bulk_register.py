@@ -0,0 +1,89 @@
+import asyncio
+import re
+
+from core import dnf_api
+from core.logger import logger
+from core.models import SERVER_MAP
+
+BULK_CONCURRENT_LIMIT = 4  # 이름 확인 동시 요청 수
+BULK_REQUEST_INTERVAL = 0.2  # 요청 사이 간격 (초)
+MAX_BULK_ENTRIES = 200
+
+# "카인:캐릭터명", "cain 캐릭터명", "카인/캐릭터명" 모두 허용
+_ENTRY_SEPARATOR = re.compile(r"\s*[:/\s]\s*")
+_SERVER_LOOKUP = {
+    **{server_id: server_id for server_id in SERVER_MAP if server_id != "all"},
+    **{kr_name: server_id for server_id, kr_name in SERVER_MAP.items() if server_id != "all"},
+}
+
+
+def parse_character_list(text: str) -> tuple[list[tuple[str, str]], list[str]]:
+    """
+    줄/쉼표 단위 "서버:캐릭터명" 목록을 (server_id, 이름) 목록으로 변환 (중복 제거)
+    반환: (항목 목록, 해석하지 못한 줄 목록)
+    """
+    entries = []
+    invalid = []
+    seen = set()
+    for raw in re.split(r"[\n,]", text):
+        line = raw.strip()
+        if not line:
+            continue
+        parts = _ENTRY_SEPARATOR.split(line, maxsplit=1)
+        server_id = _SERVER_LOOKUP.get(parts[0].lower()) if len(parts) == 2 else None
+        if server_id is None or not parts[1]:
+            invalid.append(line)
+            continue
+        entry = (server_id, parts[1])
+        if entry not in seen:
+            seen.add(entry)
+            entries.append(entry)
+    return entries[:MAX_BULK_ENTRIES], invalid + [f"{s}:{n}" for s, n in entries[MAX_BULK_ENTRIES:]]
+
+
+async def resolve_character(server_id: str, name: str) -> dict | None:
+    """
+    서버+이름으로 캐릭터를 찾아 모험단명까지 채운 API 형식 dict 반환 (없으면 None)
+    """
+    result = await dnf_api.search_characters(server_id, name)
+    rows = (result or {}).get("rows") or []
+    # 검색은 부분 일치도 돌려주므로 이름이 정확히 같은 캐릭터만 사용
+    match = next((row for row in rows if row.get("characterName") == name), None)
+    if match is None:
+        return None
+    details = await dnf_api.get_character_details(server_id, match["characterId"])
+    if not details:
+        return None
+    match["adventureName"] = details.get("adventureName") or "알 수 없음"
+    return match
+
+
+async def resolve_characters(entries: list[tuple[str, str]], adventure_name: str | None = None):
+    """
+    항목들을 제한된 동시성으로 확인
+    adventure_name 이 있으면 해당 모험단 소속 캐릭터만 통과
+    반환: (확인된 캐릭터 목록, 실패 사유 목록)
+    """
+    semaphore = asyncio.Semaphore(BULK_CONCURRENT_LIMIT)
+
+    async def resolve(entry):
+        server_id, name = entry
+        async with semaphore:
+            character = await resolve_character(server_id, name)
+            await asyncio.sleep(BULK_REQUEST_INTERVAL)
+        return entry, character
+
+    resolved = []
+    failures = []
+    seen_ids = set()
+    for (server_id, name), character in await asyncio.gather(*(resolve(entry) for entry in entries)):
+        label = f"{SERVER_MAP.get(server_id, server_id)}:{name}"
+        if character is None:
+            failures.append(f"{label} (찾을 수 없음)")
+        elif adventure_name and character["adventureName"] != adventure_name:
+            failures.append(f"{label} (모험단 {character['adventureName']})")
+        elif character["characterId"] not in seen_ids:
+            seen_ids.add(character["characterId"])
+            resolved.append(character)
+    logger.info(f"[bulk] 캐릭터 확인 완료: {len(resolved)}개 성공, {len(failures)}개 실패")
+    return resolved, failures
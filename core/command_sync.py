@@ -0,0 +1,52 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from core.logger import logger
+
+# 마지막으로 디스코드에 동기화한 슬래시 명령어 정의의 해시
+COMMAND_HASH_PATH = Path("data/command_tree.hash")
+# 1 이면 해시가 같아도 강제로 동기화
+FORCE_COMMAND_SYNC = os.getenv("FORCE_COMMAND_SYNC", "0") == "1"
+
+
+def command_signature(tree) -> str:
+    """
+    등록된 명령어 정의(이름/설명/옵션/선택지 등)와 애플리케이션 ID 로 만든 해시
+    """
+    payload = {
+        "application_id": tree.client.application_id,
+        "commands": sorted(
+            (command.to_dict(tree) for command in tree.get_commands()),
+            key=lambda item: item["name"],
+        ),
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _read_hash() -> str | None:
+    try:
+        return COMMAND_HASH_PATH.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+
+
+def _write_hash(signature: str):
+    COMMAND_HASH_PATH.parent.mkdir(parents=True, exist_ok=True)
+    COMMAND_HASH_PATH.write_text(signature, encoding="utf-8")
+
+
+async def sync_if_changed(tree) -> bool:
+    """
+    명령어 정의가 마지막 동기화 이후 바뀐 경우에만 tree.sync() 호출 (동기화했으면 True)
+    """
+    signature = command_signature(tree)
+    if not FORCE_COMMAND_SYNC and _read_hash() == signature:
+        logger.info(f"슬래시 명령어 변경 없음 - 동기화 생략 ({signature[:12]})")
+        return False
+    synced = await tree.sync()
+    _write_hash(signature)
+    logger.info(f"슬래시 명령어 동기화 완료: {len(synced)}개 ({signature[:12]})")
+    return True
@@ -5,6 +5,21 @@ from core.models import SERVER_MAP
 
 DB_PATH = Path("data/characters.db")
 
+# 아이템 획득 집계 롤업 테이블 (시간 -> 게임일 -> 주)
+ROLLUP_TABLES = {
+    "hour": "item_rollup_hourly",
+    "day": "item_rollup_daily",
+    "week": "item_rollup_weekly",
+}
+
+# 캐릭터 테이블이 바뀔 때마다 증가하는 로스터 버전 (로스터 캐시 무효화용)
+ROSTER_VERSION = 0
+
+
+def bump_roster_version():
+    global ROSTER_VERSION
+    ROSTER_VERSION += 1
+
 
 async def init_db():
     logger.info("DB 초기화 시작")
@@ -61,6 +76,41 @@ async def init_db():
                     last_aggregation_time TEXT NOT NULL
                 )
             """)
+            # 아이템 획득 이벤트 저장소 (중복 수집 방지용 기본키)
+            # 같은 분에 같은 아이템을 여러 개 획득할 수 있으므로 건수는 count 로 보관
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS item_events (
+                    character_id TEXT NOT NULL,
+                    event_date TEXT NOT NULL,
+                    item_id TEXT NOT NULL,
+                    item_name TEXT,
+                    item_rarity TEXT NOT NULL,
+                    server_id TEXT NOT NULL,
+                    adventure_name TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 1,
+                    PRIMARY KEY (character_id, event_date, item_id)
+                )
+            """)
+            cursor = await conn.execute("PRAGMA table_info(item_events)")
+            if "count" not in {row[1] for row in await cursor.fetchall()}:
+                # count 컬럼 이전에 만든 DB: 기존 행은 1건으로 간주
+                await conn.execute("ALTER TABLE item_events ADD COLUMN count INTEGER NOT NULL DEFAULT 1")
+            # 기간별 롤업 테이블 (이벤트 수집 시 증분 갱신)
+            for table in ROLLUP_TABLES.values():
+                await conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table} (
+                        bucket TEXT NOT NULL,
+                        character_id TEXT NOT NULL,
+                        server_id TEXT NOT NULL,
+                        adventure_name TEXT NOT NULL,
+                        item_rarity TEXT NOT NULL,
+                        count INTEGER NOT NULL,
+                        PRIMARY KEY (bucket, character_id, server_id, adventure_name, item_rarity)
+                    )
+                """)
+            await conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_item_rollup_daily_character ON item_rollup_daily (character_id, bucket)"
+            )
             await conn.commit()
         logger.info("DB 초기화 완료")
     except Exception as e:
@@ -87,6 +137,7 @@ async def save_character(character: dict):
                 character["adventureName"],
             ))
             await conn.commit()
+        bump_roster_version()
         logger.info(f"캐릭터 저장 성공: {character['characterName']} ({character['characterId']})")
     except Exception as e:
         logger.error(f"캐릭터 저장 실패: {e}")
@@ -106,6 +157,50 @@ async def register_character(user_id: int, character_id: str):
         logger.error(f"사용자 {user_id} 캐릭터 등록 실패: {e}")
 
 
+async def save_characters_bulk(user_id: int, characters: list[dict]) -> list[str]:
+    """
+    여러 캐릭터 저장 + 사용자 등록을 한 트랜잭션으로 처리
+    characters: API 형식(characterId, characterName, ...) 캐릭터 목록
+    반환: 이번에 처음 저장된 캐릭터 ID 목록 (실패 시 빈 목록)
+    """
+    if not characters:
+        return []
+    logger.info(f"캐릭터 일괄 저장 시도: 사용자={user_id}, {len(characters)}개")
+    ids = [character["characterId"] for character in characters]
+    try:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            placeholders = ",".join("?" * len(ids))
+            cursor = await conn.execute(
+                f"SELECT character_id FROM characters WHERE character_id IN ({placeholders})", ids
+            )
+            existing = {row[0] for row in await cursor.fetchall()}
+            await conn.executemany("""
+                INSERT OR REPLACE INTO characters
+                (character_id, character_name, server_id, level, job_name, job_grow_name, adventure_name)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [(
+                character["characterId"],
+                character["characterName"],
+                character["serverId"],
+                character["level"],
+                character["jobName"],
+                character["jobGrowName"],
+                character["adventureName"],
+            ) for character in characters])
+            await conn.executemany(
+                "INSERT OR IGNORE INTO registrations (user_id, character_id) VALUES (?, ?)",
+                [(user_id, character_id) for character_id in ids]
+            )
+            await conn.commit()
+        bump_roster_version()
+        new_ids = [character_id for character_id in ids if character_id not in existing]
+        logger.info(f"캐릭터 일괄 저장 성공: {len(characters)}개 (신규 {len(new_ids)}개)")
+        return new_ids
+    except Exception as e:
+        logger.error(f"캐릭터 일괄 저장 실패: {e}")
+        return []
+
+
 async def get_characters_by_adventure_name(adventure_name: str) -> list[dict]:
     logger.info(f"모험단 이름으로 캐릭터 조회 시도: {adventure_name}")
     try:
@@ -142,6 +237,63 @@ async def get_characters_by_user(user_id: int) -> list[dict]:
         return []
 
 
+async def get_all_characters() -> list[dict]:
+    logger.info("전체 캐릭터 조회 시도")
+    try:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute("SELECT * FROM characters")
+            rows = await cursor.fetchall()
+        logger.info(f"전체 캐릭터 조회 성공: {len(rows)}개 캐릭터")
+        return [dict(row) for row in rows]
+    except Exception as e:
+        logger.error(f"전체 캐릭터 조회 실패: {e}")
+        return []
+
+
+async def update_characters_metadata(changes: list[dict]) -> int:
+    """
+    변경된 캐릭터 메타데이터만 한 트랜잭션으로 일괄 갱신
+    changes: character_id 와 변경할 컬럼만 담은 dict 목록
+    """
+    if not changes:
+        return 0
+    logger.info(f"캐릭터 메타데이터 일괄 갱신 시도: {len(changes)}개")
+    columns = ("character_name", "level", "job_name", "job_grow_name", "adventure_name")
+    try:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            for change in changes:
+                updates = [col for col in columns if col in change]
+                if not updates:
+                    continue
+                await conn.execute(
+                    f"UPDATE characters SET {', '.join(f'{col} = ?' for col in updates)} WHERE character_id = ?",
+                    (*(change[col] for col in updates), change["character_id"])
+                )
+            await conn.commit()
+        bump_roster_version()
+        logger.info(f"캐릭터 메타데이터 일괄 갱신 성공: {len(changes)}개")
+        return len(changes)
+    except Exception as e:
+        logger.error(f"캐릭터 메타데이터 일괄 갱신 실패: {e}")
+        return 0
+
+
+async def get_characters_by_name(character_name: str) -> list[dict]:
+    logger.info(f"캐릭터 이름으로 조회 시도: {character_name}")
+    try:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(
+                "SELECT * FROM characters WHERE character_name = ?", (character_name,))
+            rows = await cursor.fetchall()
+        logger.info(f"캐릭터 '{character_name}' 조회 성공: {len(rows)}개")
+        return [dict(row) for row in rows]
+    except Exception as e:
+        logger.error(f"캐릭터 '{character_name}' 조회 실패: {e}")
+        return []
+
+
 async def get_all_characters_grouped_by_adventure() -> dict[str, list[dict]]:
     logger.info("전체 캐릭터 모험단별 조회 시도")
     try:
@@ -196,6 +348,39 @@ async def save_item_available_level(item_id: str, level: int):
         logger.error(f"아이템 캐시 저장 실패: {e}")
 
 
+async def get_all_item_levels() -> dict[str, int]:
+    """
+    item_cache 전체를 {아이템ID: 장착 가능 레벨} 로 반환
+    """
+    try:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            async with conn.execute("SELECT item_id, item_available_level FROM item_cache") as cursor:
+                levels = {row[0]: row[1] async for row in cursor}
+        logger.info(f"아이템 캐시 전체 조회 성공: {len(levels)}개")
+        return levels
+    except Exception as e:
+        logger.error(f"아이템 캐시 전체 조회 실패: {e}")
+        return {}
+
+
+async def save_item_levels(levels: dict[str, int]) -> int:
+    """
+    여러 아이템 레벨을 한 트랜잭션으로 저장
+    """
+    if not levels:
+        return 0
+    try:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            await conn.executemany(
+                "INSERT OR REPLACE INTO item_cache (item_id, item_available_level) VALUES (?, ?)",
+                list(levels.items()))
+            await conn.commit()
+        logger.info(f"아이템 캐시 일괄 저장 성공: {len(levels)}개")
+        return len(levels)
+    except Exception as e:
+        logger.error(f"아이템 캐시 일괄 저장 실패: {e}")
+        raise
+
 # ----- 출력 채널 -----
 
 async def save_output_channel(guild_id: str, channel_id: str):
@@ -262,6 +447,24 @@ async def update_last_checked(character_id: str, last_checked: str):
     except Exception as e:
         logger.error(f"캐릭터 마지막 조회시각 저장 실패: {e}")
 
+async def update_last_checked_bulk(last_checked: dict[str, str]) -> int:
+    """
+    여러 캐릭터의 마지막 조회시각을 한 트랜잭션으로 저장
+    """
+    if not last_checked:
+        return 0
+    try:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            await conn.executemany(
+                "INSERT OR REPLACE INTO character_last_checked (character_id, last_checked) VALUES (?, ?)",
+                list(last_checked.items()))
+            await conn.commit()
+        logger.info(f"캐릭터 마지막 조회시각 일괄 저장 성공: {len(last_checked)}개")
+        return len(last_checked)
+    except Exception as e:
+        logger.error(f"캐릭터 마지막 조회시각 일괄 저장 실패: {e}")
+        raise
+
 async def get_last_aggregation_time() -> str | None:
     """
     가장 최근 일간 집계 시간 조회 (문자열, 'YYYYMMDDTHHMM' 포맷)
@@ -300,3 +503,164 @@ async def update_last_aggregation_time(timestamp_str: str):
         logger.info("일간 집계 실행 시간 저장 성공")
     except Exception as e:
         logger.error(f"일간 집계 실행 시간 저장 실패: {e}")
+
+
+# ----- 아이템 획득 이벤트 / 롤업 -----
+
+async def record_item_events(events: list[dict]) -> int:
+    """
+    아이템 획득 이벤트 저장 후 새로 늘어난 건수만 롤업 테이블에 증분 반영
+    events: character_id, event_date, item_id, item_name, item_rarity, server_id,
+            adventure_name, buckets({"hour": ..., "day": ..., "week": ...}) 를 담은 dict 목록
+            같은 (캐릭터, 분, 아이템) 이 여러 번 들어 있으면 그 분에 여러 개 획득한 것으로 봄
+    같은 분을 다시 수집하면 저장된 건수와 이번 건수 중 큰 값을 유지 (재수집/경로 중복에도 과다 집계 없음)
+    반환: 새로 늘어난 이벤트 건수
+    """
+    if not events:
+        return 0
+    grouped = {}
+    for event in events:
+        key = (event["character_id"], event["event_date"], event["item_id"])
+        if key in grouped:
+            grouped[key][1] += 1
+        else:
+            grouped[key] = [event, 1]
+
+    inserted = 0
+    try:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            for key, (event, count) in grouped.items():
+                cursor = await conn.execute(
+                    "SELECT count FROM item_events WHERE character_id = ? AND event_date = ? AND item_id = ?", key
+                )
+                row = await cursor.fetchone()
+                added = count - (row[0] if row else 0)
+                if added <= 0:
+                    continue
+                await conn.execute("""
+                    INSERT INTO item_events
+                    (character_id, event_date, item_id, item_name, item_rarity, server_id, adventure_name, count)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (character_id, event_date, item_id) DO UPDATE SET count = excluded.count
+                """, (
+                    event["character_id"],
+                    event["event_date"],
+                    event["item_id"],
+                    event["item_name"],
+                    event["item_rarity"],
+                    event["server_id"],
+                    event["adventure_name"],
+                    count,
+                ))
+                inserted += added
+                for level, table in ROLLUP_TABLES.items():
+                    await conn.execute(f"""
+                        INSERT INTO {table}
+                        (bucket, character_id, server_id, adventure_name, item_rarity, count)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                        ON CONFLICT (bucket, character_id, server_id, adventure_name, item_rarity)
+                        DO UPDATE SET count = count + excluded.count
+                    """, (
+                        event["buckets"][level],
+                        event["character_id"],
+                        event["server_id"],
+                        event["adventure_name"],
+                        event["item_rarity"],
+                        added,
+                    ))
+            await conn.commit()
+        if inserted:
+            logger.info(f"아이템 획득 이벤트 저장 성공: {inserted}/{len(events)}개 신규")
+        return inserted
+    except Exception as e:
+        logger.error(f"아이템 획득 이벤트 저장 실패: {e}")
+        return 0
+
+
+async def get_rollup_counts(level: str, start_bucket: str, end_bucket: str) -> list[dict]:
+    """
+    롤업 테이블에서 [start_bucket, end_bucket] 구간의 모험단별 등급 개수 합계 조회
+    """
+    table = ROLLUP_TABLES[level]
+    try:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute(f"""
+                SELECT server_id, adventure_name, item_rarity, SUM(count) AS count
+                FROM {table}
+                WHERE bucket BETWEEN ? AND ?
+                GROUP BY server_id, adventure_name, item_rarity
+            """, (start_bucket, end_bucket))
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+    except Exception as e:
+        logger.error(f"롤업 집계 조회 실패 ({level} {start_bucket}~{end_bucket}): {e}")
+        return []
+
+
+async def get_character_daily_history(character_id: str, start_bucket: str) -> list[dict]:
+    """
+    캐릭터의 게임일별 등급 개수 조회 (start_bucket 이후)
+    """
+    try:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute("""
+                SELECT bucket, item_rarity, SUM(count) AS count
+                FROM item_rollup_daily
+                WHERE character_id = ? AND bucket >= ?
+                GROUP BY bucket, item_rarity
+                ORDER BY bucket DESC
+            """, (character_id, start_bucket))
+            rows = await cursor.fetchall()
+        return [dict(row) for row in rows]
+    except Exception as e:
+        logger.error(f"캐릭터 {character_id} 일별 기록 조회 실패: {e}")
+        return []
+
+
+async def get_user_acquisition_summary(user_id: int, day: str, week: str, recent_limit: int = 10) -> dict:
+    """
+    사용자 등록 캐릭터의 획득 요약 (API 호출 없이 로컬 이벤트 저장소/롤업 테이블만 사용)
+    day / week: 게임일 / 주간 버킷 (YYYYMMDD)
+    사용자 조회는 registrations 기본키 (user_id, character_id), 캐릭터별 조회는 각 테이블 기본키/인덱스를 그대로 사용
+    반환: {"characters": [...], "daily": [...], "weekly": [...], "recent": [...]} (실패 시 빈 목록)
+    """
+    summary = {"characters": [], "daily": [], "weekly": [], "recent": []}
+    try:
+        async with aiosqlite.connect(DB_PATH) as conn:
+            conn.row_factory = aiosqlite.Row
+            cursor = await conn.execute("""
+                SELECT c.*
+                FROM registrations r
+                JOIN characters c ON c.character_id = r.character_id
+                WHERE r.user_id = ?
+                ORDER BY c.adventure_name, c.character_name
+            """, (user_id,))
+            summary["characters"] = [dict(row) for row in await cursor.fetchall()]
+            if not summary["characters"]:
+                return summary
+
+            for key, table, bucket in (("daily", ROLLUP_TABLES["day"], day), ("weekly", ROLLUP_TABLES["week"], week)):
+                cursor = await conn.execute(f"""
+                    SELECT character_id, item_rarity, SUM(count) AS count
+                    FROM {table}
+                    WHERE bucket = ?
+                      AND character_id IN (SELECT character_id FROM registrations WHERE user_id = ?)
+                    GROUP BY character_id, item_rarity
+                """, (bucket, user_id))
+                summary[key] = [dict(row) for row in await cursor.fetchall()]
+
+            cursor = await conn.execute("""
+                SELECT e.character_id, e.event_date, e.item_name, e.item_rarity, e.count
+                FROM registrations r
+                JOIN item_events e ON e.character_id = r.character_id
+                WHERE r.user_id = ?
+                ORDER BY e.event_date DESC
+                LIMIT ?
+            """, (user_id, recent_limit))
+            summary["recent"] = [dict(row) for row in await cursor.fetchall()]
+        return summary
+    except Exception as e:
+        logger.error(f"사용자 {user_id} 획득 요약 조회 실패: {e}")
+        return summary
@@ -1,23 +1,325 @@
+import asyncio
 import os
+import random
+import time
 from core.logger import logger
+from core import http_cache, lanes, metrics, recorder, timeline_cache
+from core.storage import get_store
+from core.events import EventFilter, TimelineEvent, project_timeline_rows
+from core.json_codec import loads
+from core.models import DEFAULT_TIMELINE_CODES
+from core.timewindow import default_api_range, split_api_range
 
 import aiohttp
 from dotenv import load_dotenv
-import aiosqlite
-from pathlib import Path
-
-from datetime import datetime
 
 load_dotenv()
 API_KEY = os.getenv("NEOPLE_API_KEY")
 
 BASE_URL = "https://api.neople.co.kr/df"
-DB_PATH = Path("data/characters.db")
 
 # 글로벌 메모리 캐시
 ITEM_DETAIL_MEMCACHE = {}
 
 
+# ===============================
+# 복원력 계층: 엔드포인트별 서킷 브레이커 / 지터 재시도 / 헤지 요청
+# ===============================
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRY_BASE_DELAY = 0.5  # 재시도 기본 대기 (초)
+RETRY_MAX_DELAY = 8  # 재시도 최대 대기 (초)
+
+# 엔드포인트별 (재시도 횟수, 헤지 요청 시작 지연 초 - None 이면 헤지 안 함)
+RETRY_POLICIES = {
+    "search": (1, None),
+    "character": (2, None),
+    "timeline": (2, 3.0),
+    "item": (2, 2.0),
+    "image": (1, None),
+}
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 임계치를 넘으면 열림(open) 상태로 전환해 요청을 즉시 거절하고,
+    대기 시간이 지나면 반열림(half_open) 상태에서 요청 1건으로 복구 여부를 확인
+    복구 확인에 실패할 때마다 대기 시간을 2배로 늘림 (최대 max_reset_timeout)
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30,
+                 max_reset_timeout: float = 300):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.current_timeout = reset_timeout
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.current_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+            logger.info(f"[breaker:{self.name}] 반열림 전환 - 복구 확인 요청 허용")
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"[breaker:{self.name}] 복구 확인 - 닫힘 전환")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.current_timeout = self.reset_timeout
+        self._probe_in_flight = False
+
+    def abort_probe(self):
+        """
+        결과를 판정하지 못한 요청(취소/예상 밖 예외)의 복구 확인 자리 반납 - 다음 요청이 다시 확인
+        """
+        if self.state == self.HALF_OPEN:
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            self.current_timeout = min(self.current_timeout * 2, self.max_reset_timeout)
+            self._open()
+        elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+        metrics.inc(f"api.{self.name}.breaker_opened")
+        logger.warning(f"[breaker:{self.name}] 열림 전환 - {self.current_timeout:.0f}초간 요청 차단 (연속 실패 {self.failures}회)")
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == self.OPEN and time.monotonic() - self.opened_at < self.current_timeout
+
+    def retry_after(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.current_timeout - (time.monotonic() - self.opened_at))
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_after": round(self.retry_after(), 1),
+        }
+
+
+BREAKERS = {endpoint: CircuitBreaker(endpoint) for endpoint in RETRY_POLICIES}
+
+
+def get_breaker_states() -> dict:
+    return {endpoint: breaker.snapshot() for endpoint, breaker in BREAKERS.items()}
+
+
+def is_endpoint_open(endpoint: str) -> bool:
+    """
+    브레이커가 열려 있어 요청해도 즉시 실패할 엔드포인트인지 여부 (호출자 fail-fast 용)
+    """
+    return BREAKERS[endpoint].is_open
+
+
+def _retry_delay(attempt: int) -> float:
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+
+async def _get_once(session, url, params, headers) -> tuple[int, bytes, dict]:
+    async with session.get(url, params=params, headers=headers, timeout=REQUEST_TIMEOUT) as response:
+        # 캐시 재검증에 쓰는 검증자 헤더만 보관
+        validators = {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+        return response.status, await response.read(), validators
+
+
+async def _hedged_get(endpoint, session, url, params, headers, hedge_after) -> tuple[int, bytes, dict]:
+    """
+    첫 요청이 hedge_after 초 안에 끝나지 않으면 같은 요청을 하나 더 보내 먼저 성공한 응답 사용
+    """
+    first = asyncio.create_task(_get_once(session, url, params, headers))
+    if hedge_after is None:
+        return await first
+    pending = {first}
+    last_error = None
+    last_result = None
+    # 호출한 쪽이 취소되어도 첫 요청까지 함께 취소되도록 대기 전체를 try 안에서 진행
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_after)
+        if done:
+            return first.result()
+
+        metrics.inc(f"api.{endpoint}.hedged")
+        pending.add(asyncio.create_task(_get_once(session, url, params, headers)))
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    last_error = task.exception()
+                    continue
+                last_result = task.result()
+                if last_result[0] not in RETRYABLE_STATUS:
+                    return last_result
+    finally:
+        for task in pending:
+            task.cancel()
+    if last_result is not None:
+        return last_result
+    raise last_error
+
+
+async def _request(endpoint: str, url: str, params: dict | None = None, session=None,
+                   revalidate: bool = False) -> tuple[int, bytes] | None:
+    """
+    GET 요청 진입점: 재생 모드면 녹화된 응답을 반환하고, 녹화 중이면 받은 응답을 기록
+    revalidate: 유효 기간 안의 캐시도 조건부 요청으로 다시 확인 (변경 감지가 목적인 호출용)
+    """
+    replay = recorder.get_replay()
+    if replay is not None:
+        return replay.response(endpoint, http_cache.cache_key(url, params), lanes.current())
+    result = await _request_live(endpoint, url, params, session, revalidate)
+    if recorder.is_recording():
+        recorder.record_response(endpoint, http_cache.cache_key(url, params), lanes.current(), result)
+    return result
+
+
+async def _request_live(endpoint: str, url: str, params: dict | None = None,
+                        session=None, revalidate: bool = False) -> tuple[int, bytes] | None:
+    """
+    응답 캐시/브레이커/재시도/헤지를 적용한 GET 요청
+    성공 또는 재시도 대상이 아닌 상태 코드면 (status, body), 최종 실패 또는 브레이커 열림이면 None
+    캐시 대상 엔드포인트(http_cache.CACHE_TTLS)는 유효한 캐시가 있으면 네트워크 없이 반환하고,
+    만료된 캐시는 조건부 요청으로 재검증하며 요청 실패 시 만료된 본문이라도 대신 반환
+    """
+    if not http_cache.is_cacheable(endpoint):
+        result = await _fetch(endpoint, url, params, session)
+        return None if result is None else result[:2]
+
+    key = http_cache.cache_key(url, params)
+    cached = await http_cache.get(endpoint, key)
+    if cached is not None and cached.fresh and not revalidate:
+        return 200, cached.body
+
+    headers = cached.conditional_headers() if cached is not None else None
+    result = await _fetch(endpoint, url, params, session, headers)
+    if result is None:
+        if cached is not None:
+            metrics.inc(f"http_cache.{endpoint}.stale_served")
+            logger.warning(f"[{endpoint}] 요청 실패 - 만료된 캐시 응답 사용: {key}")
+            return 200, cached.body
+        return None
+
+    status, body, validators = result
+    if status == 304 and cached is not None:
+        await http_cache.refresh(endpoint, key)
+        return 200, cached.body
+    if status == 200:
+        await http_cache.put(endpoint, key, body, validators["etag"], validators["last_modified"])
+    return status, body
+
+
+async def _fetch(endpoint: str, url: str, params: dict | None = None, session=None,
+                 headers: dict | None = None) -> tuple[int, bytes, dict] | None:
+    if session is None:
+        async with aiohttp.ClientSession() as own_session:
+            return await _fetch(endpoint, url, params, own_session, headers)
+
+    breaker = BREAKERS[endpoint]
+    retries, hedge_after = RETRY_POLICIES[endpoint]
+    for attempt in range(retries + 1):
+        if not breaker.allow():
+            metrics.inc(f"api.{endpoint}.short_circuited")
+            logger.warning(f"[breaker:{endpoint}] 열림 상태 - 요청 생략: {url}")
+            return None
+        metrics.inc(f"api.{endpoint}.requests")
+        lane = lanes.current()
+        started = time.monotonic()
+        try:
+            # 레인별 입장 제어: 정기 집계가 몰려도 명령 응답 경로 요청이 먼저 나감
+            async with lanes.admit("api", lane):
+                result = await _hedged_get(endpoint, session, url, params, headers, hedge_after)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            breaker.record_failure()
+            metrics.inc(f"api.{endpoint}.errors")
+            logger.warning(f"[{endpoint}] 요청 예외 ({attempt + 1}/{retries + 1}): {type(e).__name__} {e}")
+        except BaseException:
+            # 취소(CancelledError)나 예상 밖 예외로 성공/실패를 기록하지 못하면 반열림 상태에서 멈추지 않도록 반납
+            breaker.abort_probe()
+            raise
+        else:
+            metrics.observe(f"lane.{lane}.latency", time.monotonic() - started)
+            status = result[0]
+            if status not in RETRYABLE_STATUS:
+                breaker.record_success()
+                return result
+            breaker.record_failure()
+            metrics.inc(f"api.{endpoint}.errors")
+            logger.warning(f"[{endpoint}] HTTP {status} ({attempt + 1}/{retries + 1})")
+        if attempt < retries:
+            await asyncio.sleep(_retry_delay(attempt))
+    return None
+
+
+def _project_timeline_page(body: bytes, event_filter: EventFilter | None) -> tuple[list[TimelineEvent], dict]:
+    """
+    타임라인 응답 1페이지를 디코딩해 필터를 통과한 행만 TimelineEvent 로 변환
+    필터로 버린 행 때문에 생략된 아이템 조회 수와 바이트(추정)를 metrics 에 기록
+    """
+    data = loads(body)
+    rows = data.get("timeline", {}).get("rows", [])
+    events = project_timeline_rows(rows, event_filter)
+    if event_filter is not None:
+        name = event_filter.name
+        metrics.inc(f"timeline.{name}.requests")
+        metrics.inc(f"timeline.{name}.bytes", len(body))
+        dropped_rows = [row for row in rows if not event_filter.accepts_row(row)]
+        if dropped_rows:
+            skipped_lookups = {
+                (row.get("data") or {}).get("itemId") for row in dropped_rows
+            } - ITEM_DETAIL_MEMCACHE.keys() - {None}
+            metrics.inc(f"timeline.{name}.item_lookups_saved", len(skipped_lookups))
+            metrics.inc(f"timeline.{name}.bytes_dropped_estimate", len(body) * len(dropped_rows) // len(rows))
+    return events, data
+
+
+async def filter_by_item_level(events: list[TimelineEvent], event_filter: EventFilter,
+                               max_concurrent: int = 1) -> list[TimelineEvent]:
+    """
+    필터 명세의 장착 가능 레벨에 맞는 이벤트만 남김 (코드/등급 필터를 통과한 이벤트만 조회)
+    """
+    if event_filter.levels is None:
+        return events
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def check_item_level(event):
+        try:
+            async with semaphore:
+                level = await fetch_item_detail(event.item_id)
+        except Exception as e:
+            logger.warning(f"아이템 레벨 조회 실패: {event.item_id} - {e}")
+            return None
+        return event if level in event_filter.levels else None
+
+    metrics.inc(f"timeline.{event_filter.name}.level_checks", len(events))
+    results = await asyncio.gather(*(check_item_level(event) for event in events))
+    return [event for event in results if event is not None]
+
+
 async def search_characters(server_id: str, character_name: str):
     logger.info(f"search_characters 호출: server_id={server_id}, character_name={character_name}")
     url = f"{BASE_URL}/servers/{server_id}/characters"
@@ -27,14 +329,15 @@ async def search_characters(server_id: str, character_name: str):
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info(f"search_characters 성공: {len(data.get('rows', []))}개 캐릭터 반환")
-                    return data
-                else:
-                    logger.warning(f"search_characters 실패: HTTP {response.status}")
+        result = await _request("search", url, params)
+        if result is None:
+            logger.warning("search_characters 실패: 재시도 초과 또는 브레이커 열림")
+        elif result[0] == 200:
+            data = loads(result[1])
+            logger.info(f"search_characters 성공: {len(data.get('rows', []))}개 캐릭터 반환")
+            return data
+        else:
+            logger.warning(f"search_characters 실패: HTTP {result[0]}")
     except Exception as e:
         logger.error(f"search_characters 예외 발생: {e}")
 
@@ -53,108 +356,120 @@ async def get_character_image_bytes(server_id: str, character_id: str):
     url = f"https://img-api.neople.co.kr/df/servers/{server_id}/characters/{character_id}?zoom={zoom}"
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    img_bytes = await response.read()
-                    logger.info(f"get_character_image_bytes 성공: {len(img_bytes)} 바이트 수신")
-                    return img_bytes
-                else:
-                    logger.warning(f"get_character_image_bytes 실패: HTTP {response.status}")
+        result = await _request("image", url)
+        if result is None:
+            logger.warning("get_character_image_bytes 실패: 재시도 초과 또는 브레이커 열림")
+        elif result[0] == 200:
+            img_bytes = result[1]
+            logger.info(f"get_character_image_bytes 성공: {len(img_bytes)} 바이트 수신")
+            return img_bytes
+        else:
+            logger.warning(f"get_character_image_bytes 실패: HTTP {result[0]}")
     except Exception as e:
         logger.error(f"get_character_image_bytes 예외 발생: {e}")
 
     return None
 
 
-async def get_character_details(server_id: str, character_id: str) -> dict:
+async def get_character_details(server_id: str, character_id: str, revalidate: bool = False) -> dict:
+    """
+    revalidate: 캐시 유효 기간과 관계없이 서버에 변경 여부 확인 (캐릭터 정보 주기 갱신용)
+    """
     logger.info(f"get_character_details 호출: server_id={server_id}, character_id={character_id}")
     url = f"{BASE_URL}/servers/{server_id}/characters/{character_id}"
     params = {"apikey": API_KEY}
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info("get_character_details 성공")
-                    return data
-                else:
-                    logger.warning(f"get_character_details 실패: HTTP {response.status}")
+        result = await _request("character", url, params, revalidate=revalidate)
+        if result is None:
+            logger.warning("get_character_details 실패: 재시도 초과 또는 브레이커 열림")
+        elif result[0] == 200:
+            data = loads(result[1])
+            logger.info("get_character_details 성공")
+            return data
+        else:
+            logger.warning(f"get_character_details 실패: HTTP {result[0]}")
     except Exception as e:
         logger.error(f"get_character_details 예외 발생: {e}")
 
     return {}
 
 
-async def fetch_timeline(server_id: str, character_id: str, start_date: str = None, end_date: str = None):
-    url = f"{BASE_URL}/servers/{server_id}/characters/{character_id}/timeline"
-
-    # 기본값: 최근 30일 (또는 원하는 범위로)
-    if end_date is None:
-        end_date = datetime.now().strftime("%Y%m%dT%H%M")
-    if start_date is None:
-        # 기본 30일 전
-        from datetime import timedelta
-        start_date = (datetime.now() - timedelta(days=30)).strftime("%Y%m%dT%H%M")
-
-    params = {
-        "apikey": API_KEY,
-        "startDate": start_date,
-        "endDate": end_date,
-        "code": "505,504,507,508,513",
-        "limit": 100
-    }
+async def fetch_timeline(server_id: str, character_id: str, start_date: str = None,
+                         end_date: str = None, event_filter: EventFilter | None = None) -> list[TimelineEvent] | None:
+    """
+    득템 감시용 타임라인 조회 후 TimelineEvent 목록으로 변환 (실패 시 None)
+    event_filter: 요청 코드와 응답 행 필터 (없으면 기본 코드 전체)
+    보통 1페이지로 끝나지만, 장애 후 따라잡기처럼 구간이 길어 페이지가 가득 차면 next 를 따라 끝까지 조회
+    (구간 캐시를 거치지 않음 - 감시 구간은 항상 반영이 끝나지 않은 최신 구간)
+    """
+    # 기본값: 최근 30일 (KST 기준)
+    default_start, default_end = default_api_range()
+    start_date = start_date or default_start
+    end_date = end_date or default_end
 
     async with aiohttp.ClientSession() as session:
-        async with session.get(url, params=params) as resp:
-            if resp.status == 200:
-                return await resp.json()
-            else:
-                return None
+        return await _fetch_timeline_range(server_id, character_id, start_date, end_date, event_filter, session)
 
-async def fetch_timeline_with_pagination(server_id: str, character_id: str, start_date: str = None, end_date: str = None):
-    url = f"{BASE_URL}/servers/{server_id}/characters/{character_id}/timeline"
+async def fetch_timeline_with_pagination(server_id: str, character_id: str, start_date: str = None,
+                                         end_date: str = None,
+                                         event_filter: EventFilter | None = None) -> list[TimelineEvent] | None:
+    """
+    타임라인 전체 페이지 조회 후 TimelineEvent 목록으로 변환 (실패 시 None)
+    event_filter: 요청 코드와 응답 행 필터 (없으면 기본 코드 전체)
+    같은 캐릭터/코드로 이미 받은 구간은 timeline_cache 에서 재사용하고 빠진 구간만 조회
+    (정기 집계와 /오늘현황이 같은 기간을 겹쳐 조회해도 구간마다 한 번만 다운로드)
+    """
+    default_start, default_end = default_api_range()
+    start_date = start_date or default_start
+    end_date = end_date or default_end
+    codes = event_filter.codes if event_filter else DEFAULT_TIMELINE_CODES
+    # 캐시에는 코드만 맞춘 이벤트를 보관하고, 등급 조건은 요청한 필터로 꺼낼 때 적용
+    page_filter = EventFilter(event_filter.name, codes) if event_filter else None
 
-    if end_date is None:
-        end_date = datetime.now().strftime("%Y%m%dT%H%M")
-    if start_date is None:
-        from datetime import timedelta
-        start_date = (datetime.now() - timedelta(days=30)).strftime("%Y%m%dT%H%M")
+    async with aiohttp.ClientSession() as session:
+        async def fetch_range(range_start: str, range_end: str) -> list[TimelineEvent] | None:
+            return await _fetch_timeline_range(server_id, character_id, range_start, range_end, page_filter, session)
 
-    params = {
-        "apikey": API_KEY,
-        "startDate": start_date,
-        "endDate": end_date,
-        "code": "505,504,507,508,513",
-        "limit": 100
-    }
+        events = await timeline_cache.fetch_events(character_id, codes, start_date, end_date, fetch_range)
+    if events is None or event_filter is None:
+        return events
+    filtered = [event for event in events if event_filter.accepts_event(event)]
+    metrics.inc(f"timeline.{event_filter.name}.rows_dropped", len(events) - len(filtered))
+    return filtered
 
-    all_rows = []
-    next_token = None
 
-    async with aiohttp.ClientSession() as session:
+async def _fetch_timeline_range(server_id: str, character_id: str, start_date: str, end_date: str,
+                                event_filter: EventFilter | None, session) -> list[TimelineEvent] | None:
+    """
+    구간 전체 페이지 조회 (API 허용 기간 TIMELINE_MAX_RANGE 보다 긴 구간은 나눠서 조회)
+    """
+    url = f"{BASE_URL}/servers/{server_id}/characters/{character_id}/timeline"
+    all_events = []
+    for chunk_start, chunk_end in split_api_range(start_date, end_date):
+        params = {
+            "apikey": API_KEY,
+            "startDate": chunk_start,
+            "endDate": chunk_end,
+            "code": event_filter.code_param if event_filter else ",".join(map(str, DEFAULT_TIMELINE_CODES)),
+            "limit": 100
+        }
         while True:
-            if next_token:
-                params["next"] = next_token
-            else:
-                params.pop("next", None)
-
-            async with session.get(url, params=params) as resp:
-                if resp.status != 200:
-                    # 실패 시 None 반환 또는 예외 처리 가능
-                    return None
+            result = await _request("timeline", url, params, session)
+            if result is None or result[0] != 200:
+                # 한 페이지라도 실패하면 전체 실패 처리 (호출자가 재시도)
+                return None
 
-                data = await resp.json()
-                timeline = data.get("timeline", {})
-                rows = timeline.get("rows", [])
-                all_rows.extend(rows)
+            events, data = _project_timeline_page(result[1], event_filter)
+            all_events.extend(events)
 
-                next_token = data.get("next")
-                if not next_token:
-                    break
+            # next 토큰은 timeline 객체 안에 있음 (최상위 next 도 호환)
+            next_token = data.get("timeline", {}).get("next") or data.get("next")
+            if not next_token:
+                break
+            params["next"] = next_token
 
-    return {"timeline": {"rows": all_rows}}
+    return all_events
 
 
 # ===============================
@@ -167,10 +482,7 @@ async def preload_item_cache():
     global ITEM_DETAIL_MEMCACHE
     ITEM_DETAIL_MEMCACHE = {}
     try:
-        async with aiosqlite.connect(DB_PATH) as conn:
-            async with conn.execute("SELECT item_id, item_available_level FROM item_cache") as cursor:
-                async for row in cursor:
-                    ITEM_DETAIL_MEMCACHE[row[0]] = row[1]
+        ITEM_DETAIL_MEMCACHE = await get_store().load_item_levels()
         logger.info(f"메모리 캐시 preload 완료: {len(ITEM_DETAIL_MEMCACHE)}개 아이템")
     except Exception as e:
         logger.error(f"메모리 캐시 preload 실패: {e}")
@@ -178,6 +490,26 @@ async def preload_item_cache():
 # ===============================
 # 아이템 상세 정보 조회 (캐싱 포함)
 # ===============================
+async def fetch_item_info(item_id: str) -> dict | None:
+    """
+    아이템 상세 응답 전체 (이름/등급/종류/레벨 등) 조회, 실패 시 None
+    응답은 HTTP 캐시에 만료 없이 저장되므로 같은 아이템은 네트워크 없이 재사용
+    """
+    url = f"{BASE_URL}/items/{item_id}"
+    params = {"apikey": API_KEY}
+    try:
+        result = await _request("item", url, params)
+        if result is None:
+            logger.warning(f"아이템 상세 조회 실패: 재시도 초과 또는 브레이커 열림 - {item_id}")
+        elif result[0] == 200:
+            return loads(result[1])
+        else:
+            logger.warning(f"아이템 상세 조회 실패: HTTP {result[0]} - {item_id}")
+    except Exception as e:
+        logger.error(f"아이템 상세 조회 예외 발생: {e}")
+    return None
+
+
 async def fetch_item_detail(item_id: str) -> int:
     """
     1. 메모리 캐시 → 2. DB → 3. API 순서로 조회, 없으면 0 반환
@@ -188,46 +520,27 @@ async def fetch_item_detail(item_id: str) -> int:
         logger.info(f"[memcache] 캐시 히트: {item_id} - {ITEM_DETAIL_MEMCACHE[item_id]}")
         return ITEM_DETAIL_MEMCACHE[item_id]
 
-    # 2. DB 캐시 조회 (동기화 누락/실패 대응용)
+    # 2. 저장소 캐시 조회 (동기화 누락/실패 대응용)
     try:
-        async with aiosqlite.connect(DB_PATH) as conn:
-            cursor = await conn.execute(
-                "SELECT item_available_level FROM item_cache WHERE item_id = ?", (item_id,))
-            row = await cursor.fetchone()
-            if row:
-                level = row[0]
-                ITEM_DETAIL_MEMCACHE[item_id] = level  # 메모리 캐시 동기화
-                logger.info(f"[dbcache] 캐시 히트: {item_id} - {level}")
-                return level
+        level = await get_store().get_item_level(item_id)
+        if level is not None:
+            ITEM_DETAIL_MEMCACHE[item_id] = level  # 메모리 캐시 동기화
+            logger.info(f"[dbcache] 캐시 히트: {item_id} - {level}")
+            return level
     except Exception as e:
         logger.error(f"DB 캐시 조회 중 오류: {e}")
 
-    # 3. API 조회
-    url = f"{BASE_URL}/items/{item_id}"
-    params = {"apikey": API_KEY}
+    # 3. API 조회 (HTTP 응답 캐시 경유)
+    data = await fetch_item_info(item_id)
+    if data is None:
+        return 0
+    level = data.get("itemAvailableLevel", 0)
+    logger.info(f"아이템 상세 조회 성공: {item_id} - 레벨 {level}")
+    # 메모리/DB 동시 캐싱
+    ITEM_DETAIL_MEMCACHE[item_id] = level
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    level = data.get("itemAvailableLevel", 0)
-                    logger.info(f"아이템 상세 조회 성공: {item_id} - 레벨 {level}")
-                    # 메모리/DB 동시 캐싱
-                    ITEM_DETAIL_MEMCACHE[item_id] = level
-                    try:
-                        async with aiosqlite.connect(DB_PATH) as conn2:
-                            await conn2.execute(
-                                "INSERT OR REPLACE INTO item_cache (item_id, item_available_level) VALUES (?, ?)",
-                                (item_id, level)
-                            )
-                            await conn2.commit()
-                        logger.info(f"아이템 캐시 저장 완료: {item_id} - 레벨 {level}")
-                    except Exception as e:
-                        logger.error(f"아이템 캐시 저장 실패: {e}")
-                    return level
-                else:
-                    logger.warning(f"아이템 상세 조회 실패: HTTP {response.status} - {item_id}")
+        await get_store().save_item_levels({item_id: level})
+        logger.info(f"아이템 캐시 저장 완료: {item_id} - 레벨 {level}")
     except Exception as e:
-        logger.error(f"아이템 상세 조회 예외 발생: {e}")
-
-    return 0
+        logger.error(f"아이템 캐시 저장 실패: {e}")
+    return level
@@ -0,0 +1,113 @@
+import sys
+from datetime import datetime
+
+from core import metrics
+from core.models import ALLOWED_RARITIES, DEFAULT_TIMELINE_CODES, RARITY_WEIGHTS, TARGET_ITEM_LEVELS
+from core.timewindow import KST
+
+
+class EventFilter:
+    """
+    파이프라인별 타임라인 이벤트 필터 명세
+    - codes: API 요청의 code 파라미터 (서버 측 필터)
+    - rarities: 응답 행의 itemRarity 로 즉시 거르는 등급 (None 이면 전체)
+    - levels: 아이템 상세 조회로 확인하는 장착 가능 레벨 (None 이면 조회 생략)
+    """
+    __slots__ = ("name", "codes", "rarities", "levels")
+
+    def __init__(self, name: str, codes=DEFAULT_TIMELINE_CODES, rarities=None, levels=None):
+        self.name = name
+        self.codes = tuple(codes)
+        self.rarities = frozenset(rarities) if rarities is not None else None
+        self.levels = frozenset(levels) if levels is not None else None
+
+    @property
+    def code_param(self) -> str:
+        return ",".join(str(code) for code in self.codes)
+
+    def accepts_row(self, row: dict) -> bool:
+        if row.get("code") not in self.codes:
+            return False
+        if self.rarities is not None and (row.get("data") or {}).get("itemRarity") not in self.rarities:
+            return False
+        return True
+
+    def accepts_event(self, event: "TimelineEvent") -> bool:
+        """
+        이미 변환된 이벤트에 같은 코드/등급 조건 적용 (여러 필터가 공유하는 타임라인 캐시용)
+        """
+        if event.code not in self.codes:
+            return False
+        return self.rarities is None or event.item_rarity in self.rarities
+
+
+# 실시간 득템 알림: 115레벨 에픽/태초만
+NOTIFY_EVENT_FILTER = EventFilter("notify", rarities=ALLOWED_RARITIES, levels=TARGET_ITEM_LEVELS)
+# 일간/기간 집계: 115레벨 가중치 대상 등급 (태초/에픽/레전더리)
+AGGREGATION_EVENT_FILTER = EventFilter("aggregation", rarities=RARITY_WEIGHTS, levels=TARGET_ITEM_LEVELS)
+
+
+class TimelineEvent:
+    """
+    타임라인 행 중 봇이 사용하는 필드만 담은 경량 레코드
+    API 응답을 받은 직후 한 번만 생성하고, 필터링/중복 제거/알림/집계에서 그대로 사용
+    - occurred_at / timestamp: date 문자열을 미리 파싱한 KST 시각
+    - item_name / item_rarity: 반복되는 문자열은 intern 해 메모리 공유
+    """
+    __slots__ = ("date", "code", "item_id", "item_name", "item_rarity", "occurred_at", "timestamp")
+
+    def __init__(self, date: str, code: int, item_id: str, item_name: str | None, item_rarity: str | None,
+                 occurred_at: datetime):
+        self.date = date
+        self.code = code
+        self.item_id = item_id
+        self.item_name = item_name
+        self.item_rarity = item_rarity
+        self.occurred_at = occurred_at
+        self.timestamp = int(occurred_at.timestamp())
+
+    @classmethod
+    def from_row(cls, row: dict) -> "TimelineEvent | None":
+        data = row.get("data") or {}
+        item_id = data.get("itemId")
+        if not item_id:
+            return None
+        date = row.get("date", "")
+        try:
+            # "YYYY-MM-DD HH:MM" 형식은 strptime 보다 빠른 fromisoformat 으로 파싱
+            occurred_at = datetime.fromisoformat(date).replace(tzinfo=KST)
+        except ValueError:
+            return None
+        item_name = data.get("itemName")
+        item_rarity = data.get("itemRarity")
+        return cls(
+            date,
+            row.get("code"),
+            item_id,
+            sys.intern(item_name) if item_name else item_name,
+            sys.intern(item_rarity) if item_rarity else item_rarity,
+            occurred_at,
+        )
+
+    def __repr__(self):
+        return f"TimelineEvent({self.date!r}, {self.code!r}, {self.item_id!r}, {self.item_name!r}, {self.item_rarity!r})"
+
+
+def project_timeline_rows(rows: list[dict], event_filter: EventFilter | None = None) -> list[TimelineEvent]:
+    """
+    타임라인 응답 rows 를 TimelineEvent 목록으로 변환 (아이템 정보가 없거나 날짜가 잘못된 행은 제외)
+    event_filter 가 있으면 코드/등급이 맞지 않는 행은 레코드를 만들기 전에 버림
+    """
+    events = []
+    dropped = 0
+    for row in rows:
+        if event_filter is not None and not event_filter.accepts_row(row):
+            dropped += 1
+            continue
+        event = TimelineEvent.from_row(row)
+        if event is not None:
+            events.append(event)
+    if event_filter is not None:
+        metrics.inc(f"timeline.{event_filter.name}.rows", len(rows))
+        metrics.inc(f"timeline.{event_filter.name}.rows_dropped", dropped)
+    return events
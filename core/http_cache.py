@@ -0,0 +1,247 @@
+import asyncio
+import os
+import time
+import zlib
+from pathlib import Path
+from urllib.parse import urlencode
+
+import aiosqlite
+
+from core import metrics
+from core.logger import logger
+
+# 캐릭터 DB 와 분리된 응답 캐시 파일 (용량 제한/초기화를 독립적으로 하기 위함)
+HTTP_CACHE_PATH = Path("data/http_cache.db")
+MAX_CACHE_BYTES = int(os.getenv("HTTP_CACHE_MAX_MB", "64")) * 1024 * 1024
+PRUNE_TARGET_RATIO = 0.9  # 용량 초과 시 최대치의 90%까지 오래 안 쓴 항목부터 삭제
+PRUNE_EVERY_STORES = 200  # 저장 N회마다 용량 점검
+COMPRESS_LEVEL = 6
+# 조회 시 마지막 사용 시각은 이 시간(초) 이상 지났을 때만 갱신하고, 모아서 저장/정리 시 함께 기록
+# (용량 정리 순서에만 쓰이므로 조회마다 쓰기 트랜잭션을 만들지 않음)
+LAST_ACCESS_RESOLUTION = 10 * 60
+TOUCH_FLUSH_COUNT = 200  # 모인 갱신이 이 개수를 넘으면 바로 기록
+
+# 엔드포인트별 캐시 유효 시간 (초), None 이면 만료 없음, 목록에 없는 엔드포인트는 캐시하지 않음
+CACHE_TTLS = {
+    "item": None,  # 아이템 상세는 사실상 불변
+    "character": 60 * 60,
+    "search": 5 * 60,
+}
+
+# 캐시 키에서 제외할 파라미터 (API 키가 바뀌어도 같은 응답)
+_IGNORED_PARAMS = {"apikey"}
+
+_conn = None
+_conn_lock = asyncio.Lock()
+_stores_since_prune = 0
+_pending_touches = {}  # cache_key -> 마지막 사용 시각 (아직 기록하지 않은 것)
+
+
+class CachedResponse:
+    __slots__ = ("body", "fresh", "etag", "last_modified")
+
+    def __init__(self, body: bytes, fresh: bool, etag: str | None, last_modified: str | None):
+        self.body = body
+        self.fresh = fresh
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def conditional_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def is_cacheable(endpoint: str) -> bool:
+    return endpoint in CACHE_TTLS
+
+
+def cache_key(url: str, params: dict | None = None) -> str:
+    if not params:
+        return url
+    query = urlencode(sorted((k, v) for k, v in params.items() if k not in _IGNORED_PARAMS))
+    return f"{url}?{query}" if query else url
+
+
+def _expires_at(endpoint: str, now: float) -> float | None:
+    ttl = CACHE_TTLS[endpoint]
+    return None if ttl is None else now + ttl
+
+
+async def _create_table(conn):
+    await conn.execute("""
+        CREATE TABLE IF NOT EXISTS http_cache (
+            cache_key TEXT PRIMARY KEY,
+            endpoint TEXT NOT NULL,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            stored_at REAL NOT NULL,
+            expires_at REAL,
+            last_access REAL NOT NULL
+        )
+    """)
+    await conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_last_access ON http_cache(last_access)")
+    await conn.commit()
+
+
+async def _connection():
+    """
+    프로세스에서 공유하는 캐시 DB 연결 (처음 사용할 때 열고 테이블 생성)
+    """
+    global _conn
+    if _conn is None:
+        async with _conn_lock:
+            if _conn is None:
+                HTTP_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+                conn = await aiosqlite.connect(HTTP_CACHE_PATH)
+                await _create_table(conn)
+                _conn = conn
+    return _conn
+
+
+async def init():
+    """
+    부팅 시 캐시 DB 연결/테이블 준비 (첫 API 요청이 테이블 생성을 기다리지 않도록)
+    """
+    try:
+        await _connection()
+    except Exception as e:
+        logger.error(f"HTTP 캐시 초기화 실패: {e}")
+
+
+async def close():
+    """
+    종료 훅: 모아둔 마지막 사용 시각을 기록하고 연결 닫기
+    """
+    global _conn
+    if _conn is None:
+        return
+    try:
+        await _flush_touches(_conn)
+        await _conn.commit()
+    except Exception as e:
+        logger.error(f"HTTP 캐시 종료 처리 실패: {e}")
+    await _conn.close()
+    _conn = None
+
+
+async def _flush_touches(conn):
+    """
+    모아둔 마지막 사용 시각 기록 (커밋은 호출한 쪽에서)
+    """
+    if not _pending_touches:
+        return
+    touches = [(last_access, key) for key, last_access in _pending_touches.items()]
+    _pending_touches.clear()
+    await conn.executemany("UPDATE http_cache SET last_access = ? WHERE cache_key = ?", touches)
+
+
+async def get(endpoint: str, key: str) -> CachedResponse | None:
+    """
+    캐시 항목 조회 (만료된 항목도 재검증/장애 시 대체용으로 fresh=False 로 반환)
+    """
+    try:
+        conn = await _connection()
+        cursor = await conn.execute(
+            "SELECT body, etag, last_modified, expires_at, last_access FROM http_cache WHERE cache_key = ?", (key,))
+        row = await cursor.fetchone()
+        if row is None:
+            metrics.inc(f"http_cache.{endpoint}.miss")
+            return None
+        body, etag, last_modified, expires_at, last_access = row
+        now = time.time()
+        if now - last_access >= LAST_ACCESS_RESOLUTION:
+            _pending_touches[key] = now
+            if len(_pending_touches) >= TOUCH_FLUSH_COUNT:
+                await _flush_touches(conn)
+                await conn.commit()
+    except Exception as e:
+        logger.error(f"HTTP 캐시 조회 실패: {e}")
+        return None
+
+    fresh = expires_at is None or expires_at > now
+    metrics.inc(f"http_cache.{endpoint}.{'hit' if fresh else 'stale'}")
+    return CachedResponse(zlib.decompress(body), fresh, etag, last_modified)
+
+
+async def put(endpoint: str, key: str, body: bytes, etag: str | None = None, last_modified: str | None = None):
+    global _stores_since_prune
+    compressed = zlib.compress(body, COMPRESS_LEVEL)
+    now = time.time()
+    try:
+        conn = await _connection()
+        _pending_touches.pop(key, None)
+        await _flush_touches(conn)
+        await conn.execute(
+            """
+            INSERT OR REPLACE INTO http_cache
+                (cache_key, endpoint, body, size, etag, last_modified, stored_at, expires_at, last_access)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (key, endpoint, compressed, len(compressed), etag, last_modified, now,
+             _expires_at(endpoint, now), now)
+        )
+        await conn.commit()
+        metrics.inc(f"http_cache.{endpoint}.stored")
+        metrics.inc("http_cache.bytes_raw", len(body))
+        metrics.inc("http_cache.bytes_stored", len(compressed))
+
+        _stores_since_prune += 1
+        if _stores_since_prune >= PRUNE_EVERY_STORES:
+            _stores_since_prune = 0
+            await _prune(conn)
+    except Exception as e:
+        logger.error(f"HTTP 캐시 저장 실패: {e}")
+
+
+async def refresh(endpoint: str, key: str):
+    """
+    304 Not Modified 응답 시 본문은 그대로 두고 만료 시각만 연장
+    """
+    now = time.time()
+    try:
+        conn = await _connection()
+        _pending_touches.pop(key, None)
+        await _flush_touches(conn)
+        await conn.execute(
+            "UPDATE http_cache SET expires_at = ?, last_access = ? WHERE cache_key = ?",
+            (_expires_at(endpoint, now), now, key)
+        )
+        await conn.commit()
+        metrics.inc(f"http_cache.{endpoint}.revalidated")
+    except Exception as e:
+        logger.error(f"HTTP 캐시 갱신 실패: {e}")
+
+
+async def _prune(conn):
+    # 정리 순서가 최근 사용을 반영하도록 모아둔 사용 시각부터 기록
+    await _flush_touches(conn)
+    await conn.commit()
+    cursor = await conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache")
+    total = (await cursor.fetchone())[0]
+    if total <= MAX_CACHE_BYTES:
+        return
+    target = int(MAX_CACHE_BYTES * PRUNE_TARGET_RATIO)
+    cursor = await conn.execute("SELECT cache_key, size FROM http_cache ORDER BY last_access")
+    victims = []
+    async for cache_key_, size in cursor:
+        if total <= target:
+            break
+        victims.append((cache_key_,))
+        total -= size
+    await conn.executemany("DELETE FROM http_cache WHERE cache_key = ?", victims)
+    await conn.commit()
+    metrics.inc("http_cache.evicted", len(victims))
+    logger.info(f"HTTP 캐시 정리: {len(victims)}개 삭제, 현재 {total / 1024 / 1024:.1f} MiB")
+
+
+async def prune():
+    try:
+        await _prune(await _connection())
+    except Exception as e:
+        logger.error(f"HTTP 캐시 정리 실패: {e}")
@@ -0,0 +1,35 @@
+import json
+
+from core.logger import logger
+
+# 설치되어 있으면 orjson 으로 디코딩, 없으면 표준 json 사용
+try:
+    import orjson
+    _loads = orjson.loads
+    JSON_BACKEND = "orjson"
+except ImportError:
+    _loads = json.loads
+    JSON_BACKEND = "json"
+
+logger.info(f"JSON 디코더: {JSON_BACKEND}")
+
+
+def set_decoder(loads, name: str = "custom"):
+    """
+    JSON 디코더 교체 (bytes 를 받아 파이썬 객체를 돌려주는 함수)
+    """
+    global _loads, JSON_BACKEND
+    _loads = loads
+    JSON_BACKEND = name
+    logger.info(f"JSON 디코더 변경: {JSON_BACKEND}")
+
+
+def loads(payload: bytes | str):
+    return _loads(payload)
+
+
+async def read_json(response):
+    """
+    aiohttp 응답 본문을 현재 디코더로 파싱
+    """
+    return _loads(await response.read())
@@ -0,0 +1,149 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+
+from core import metrics
+
+# 작업 레인: 숫자가 작을수록 공유 자원을 먼저 배정받음
+INTERACTIVE = "interactive"  # 슬래시 명령 응답 경로 (/등록, /일괄등록 ...)
+REALTIME = "realtime"  # 득템 알림 타임라인 감시
+BATCH = "batch"  # 06:00 정기 집계, /오늘현황 집계, 메타데이터 갱신
+
+# 레인 설정: (우선순위, 자원별 동시 사용 한도)
+LANES = {
+    INTERACTIVE: (0, 6),
+    REALTIME: (1, 4),
+    BATCH: (2, 8),
+}
+
+# 공유 자원별 (전체 동시 사용 한도, 레인별 남겨둘 여유 슬롯)
+# 여유 슬롯: 해당 레인은 자원 전체 중 이만큼을 비워둔 상태에서만 들어갈 수 있음 (상위 레인 몫)
+GATE_CONFIG = {
+    "api": (12, {REALTIME: 1, BATCH: 3}),  # 네오플 API 동시 요청 (캐시 적중은 제외)
+    "db": (3, {REALTIME: 1, BATCH: 1}),  # 이벤트/롤업 쓰기 (SQLite 쓰기 잠금 경합 완화)
+}
+
+# 레인을 지정하지 않은 호출은 명령 응답 경로로 간주 (백그라운드 작업은 시작 시 레인을 지정)
+_current_lane = ContextVar("lane", default=INTERACTIVE)
+
+
+def current() -> str:
+    return _current_lane.get()
+
+
+def assign(lane: str):
+    """
+    현재 작업(과 이후 생성하는 하위 작업)의 레인 지정 - 백그라운드 작업 시작 시 호출
+    """
+    _current_lane.set(lane)
+
+
+@contextmanager
+def use(lane: str):
+    """
+    블록 안에서만 레인 변경 (예: 명령어에서 실행하는 대량 집계를 batch 로)
+    """
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+class LaneGate:
+    """
+    공유 자원 하나에 대한 레인별 입장 제어
+    - 레인마다 대기열을 따로 두고, 자리가 나면 우선순위가 높은 레인의 대기열부터 배정
+    - 하위 레인은 여유 슬롯을 남겨둔 만큼만 사용하므로, 정기 집계가 몰려도 명령 응답은 바로 입장
+    - 레인별 대기 시간은 metrics 관측값 "lane.{레인}.{자원}.wait" (초) 로 기록
+    """
+
+    def __init__(self, name: str, capacity: int, reserves: dict | None = None, lanes: dict = LANES):
+        self.name = name
+        self.capacity = capacity
+        self.reserves = reserves or {}
+        self.lanes = lanes
+        self.in_use = 0
+        self.active = {lane: 0 for lane in lanes}
+        self.waiters = {lane: deque() for lane in lanes}
+        self._order = sorted(lanes, key=lambda lane: lanes[lane][0])
+
+    def _can_admit(self, lane: str) -> bool:
+        limit = self.lanes[lane][1]
+        return self.active[lane] < limit and self.in_use < self.capacity - self.reserves.get(lane, 0)
+
+    def _higher_waiting(self, lane: str) -> bool:
+        priority = self.lanes[lane][0]
+        return any(self.waiters[other] for other in self._order if self.lanes[other][0] <= priority)
+
+    def _grant(self, lane: str):
+        self.in_use += 1
+        self.active[lane] += 1
+
+    def _wake(self):
+        for lane in self._order:
+            queue = self.waiters[lane]
+            while queue and self._can_admit(lane):
+                waiter = queue.popleft()
+                if waiter.done():
+                    continue
+                self._grant(lane)
+                waiter.set_result(None)
+
+    async def acquire(self, lane: str):
+        started = time.monotonic()
+        if self._can_admit(lane) and not self._higher_waiting(lane):
+            self._grant(lane)
+        else:
+            metrics.inc(f"lane.{lane}.{self.name}.queued")
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters[lane].append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # 배정 직후 취소되면 받은 자리를 돌려줌 (대기 중 취소는 _wake 에서 건너뜀)
+                if waiter.done() and not waiter.cancelled():
+                    self.release(lane)
+                raise
+        metrics.observe(f"lane.{lane}.{self.name}.wait", time.monotonic() - started)
+
+    def release(self, lane: str):
+        self.in_use -= 1
+        self.active[lane] -= 1
+        self._wake()
+
+    def snapshot(self) -> dict:
+        return {
+            lane: {"active": self.active[lane], "waiting": len(self.waiters[lane])}
+            for lane in self._order
+        }
+
+
+GATES = {name: LaneGate(name, capacity, reserves) for name, (capacity, reserves) in GATE_CONFIG.items()}
+
+
+@asynccontextmanager
+async def admit(gate: str, lane: str | None = None):
+    """
+    현재 레인으로 공유 자원 사용 (lane 미지정 시 작업에 지정된 레인)
+    """
+    lane = lane or current()
+    lane_gate = GATES[gate]
+    await lane_gate.acquire(lane)
+    try:
+        yield
+    finally:
+        lane_gate.release(lane)
+
+
+def format_lane_summary() -> str:
+    lines = []
+    for lane in LANES:
+        parts = []
+        for name, gate in GATES.items():
+            state = gate.snapshot()[lane]
+            parts.append(f"{name} 사용 {state['active']} 대기 {state['waiting']}")
+        lines.append(f"{lane}: {', '.join(parts)} | {metrics.format_summary(f'lane.{lane}.latency')}")
+    return "\n".join(lines)
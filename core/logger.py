@@ -1,16 +1,10 @@
 import logging
+import threading
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 from datetime import datetime, timedelta
 
-try:
-    from zoneinfo import ZoneInfo
-    KST = ZoneInfo("Asia/Seoul")
-    print("zoneinfo 사용 중")
-except (ImportError, ModuleNotFoundError, KeyError):
-    import pytz
-    KST = pytz.timezone("Asia/Seoul")
-    print("pytz 사용 중")
+from core.timewindow import KST
 
 log_dir = Path("logs")
 log_dir.mkdir(parents=True, exist_ok=True)
@@ -26,7 +20,8 @@ def delete_old_logs(log_directory: Path, days: int = 14):
         except Exception as e:
             print(f"파일 삭제 중 오류 발생 {log_file}: {e}")
 
-delete_old_logs(log_dir, days=14)
+# 로그 파일이 많으면 import 가 느려지므로 정리는 백그라운드 스레드에서 수행
+threading.Thread(target=delete_old_logs, args=(log_dir, 14), name="log-cleanup", daemon=True).start()
 
 log_filename = log_dir / f"{datetime.now(KST).strftime('%Y-%m-%d')}.log"
 
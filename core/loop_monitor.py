@@ -0,0 +1,214 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from datetime import datetime
+from pathlib import Path
+
+from core import metrics
+from core.logger import logger
+from core.timewindow import KST
+
+LAG_PROBE_INTERVAL = 0.5  # 루프 지연 측정 간격 (초)
+LAG_WINDOW = 1200  # 최근 측정값 보관 개수 (0.5초 간격이면 10분)
+LAG_REPORT_INTERVAL = 60  # 로그 보고 간격 (초)
+# 콜백 단위 계측 (asyncio Handle._run 을 감싸므로 원인 추적이 필요할 때만 켬, 루프 지연 측정은 항상 실행)
+CALLBACK_TRACE = os.getenv("LOOP_CALLBACK_TRACE", "0") == "1"
+SLOW_CALLBACK_THRESHOLD = int(os.getenv("LOOP_SLOW_CALLBACK_MS", "100")) / 1000
+SLOW_CALLBACK_HISTORY = 50
+STACK_LIMIT = 30
+PROFILE_DIR = Path("logs/profiles")
+PROFILE_SAMPLE_INTERVAL = 0.005  # 샘플링 프로파일러 간격 (초)
+MAX_PROFILE_SECONDS = 60
+
+LAG_SAMPLES = deque(maxlen=LAG_WINDOW)
+SLOW_CALLBACKS = deque(maxlen=SLOW_CALLBACK_HISTORY)
+
+
+class _CallbackState:
+    """
+    현재 루프 스레드에서 실행 중인 콜백 (감시 스레드가 오래 걸리는 콜백의 스택을 떠 가기 위함)
+    """
+    __slots__ = ("handle", "started", "stack")
+
+    def __init__(self):
+        self.handle = None
+        self.started = 0.0
+        self.stack = None
+
+
+_state = _CallbackState()
+_original_run = None
+_loop_thread_id = None
+_profiling = threading.Event()
+
+
+def describe_callback(handle) -> str:
+    callback = getattr(handle, "_callback", None)
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        coro = owner.get_coro()
+        name = getattr(coro, "__qualname__", None) or repr(coro)
+        return f"{name} (task={owner.get_name()})"
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+def _instrumented_run(handle):
+    started = time.perf_counter()
+    _state.handle = handle
+    _state.started = started
+    _state.stack = None
+    try:
+        _original_run(handle)
+    finally:
+        elapsed = time.perf_counter() - started
+        stack = _state.stack
+        _state.handle = None
+        if elapsed >= SLOW_CALLBACK_THRESHOLD:
+            _record_slow_callback(handle, elapsed, stack)
+
+
+def _record_slow_callback(handle, elapsed: float, stack: list[str] | None):
+    name = describe_callback(handle)
+    metrics.inc("loop.slow_callbacks")
+    SLOW_CALLBACKS.append({
+        "name": name,
+        "duration": elapsed,
+        "at": datetime.now(KST),
+        "stack": stack,
+    })
+    where = stack[-1].strip().splitlines()[0] if stack else "스택 없음"
+    logger.warning(f"[loop] 느린 콜백 {elapsed * 1000:.0f}ms: {name} @ {where}")
+
+
+def _watchdog():
+    """
+    루프 스레드의 콜백이 임계치를 넘겨 실행 중이면 그 순간의 스택을 기록 (콜백이 끝난 뒤에는 알 수 없으므로)
+    """
+    interval = max(SLOW_CALLBACK_THRESHOLD / 2, 0.01)
+    while True:
+        time.sleep(interval)
+        handle, started = _state.handle, _state.started
+        if handle is None or _state.stack is not None:
+            continue
+        if time.perf_counter() - started < SLOW_CALLBACK_THRESHOLD:
+            continue
+        frame = sys._current_frames().get(_loop_thread_id)
+        if frame is not None and _state.handle is handle and _state.started == started:
+            _state.stack = traceback.format_stack(frame, limit=STACK_LIMIT)
+
+
+def install():
+    """
+    현재 스레드의 이벤트 루프 콜백 실행 시간 계측 시작 (루프 스레드에서 한 번 호출, LOOP_CALLBACK_TRACE=1 일 때만)
+    """
+    global _original_run, _loop_thread_id
+    if _original_run is not None:
+        return
+    if not CALLBACK_TRACE:
+        logger.info("[loop] 콜백 계측 꺼짐 (LOOP_CALLBACK_TRACE=1 로 켜기)")
+        return
+    _loop_thread_id = threading.get_ident()
+    _original_run = asyncio.events.Handle._run
+    asyncio.events.Handle._run = _instrumented_run
+    threading.Thread(target=_watchdog, name="loop-watchdog", daemon=True).start()
+    logger.info(f"[loop] 콜백 계측 시작 (느린 콜백 기준 {SLOW_CALLBACK_THRESHOLD * 1000:.0f}ms)")
+
+
+# ===============================
+# 루프 지연 측정
+# ===============================
+def lag_percentiles() -> dict:
+    if not LAG_SAMPLES:
+        return {}
+    ordered = sorted(LAG_SAMPLES)
+    last = len(ordered) - 1
+    return {
+        "p50": ordered[int(last * 0.50)],
+        "p95": ordered[int(last * 0.95)],
+        "p99": ordered[int(last * 0.99)],
+        "max": ordered[last],
+        "samples": len(ordered),
+    }
+
+
+def format_lag_summary() -> str:
+    stats = lag_percentiles()
+    if not stats:
+        return "측정값 없음"
+    return (f"p50={stats['p50'] * 1000:.1f}ms p95={stats['p95'] * 1000:.1f}ms "
+            f"p99={stats['p99'] * 1000:.1f}ms max={stats['max'] * 1000:.1f}ms ({stats['samples']}회)")
+
+
+async def monitor_loop_lag():
+    """
+    supervisor 작업: 일정 간격으로 sleep 을 예약해 실제로 깨어난 시각과의 차이(스케줄링 지연)를 기록
+    """
+    from core.supervisor import supervisor
+
+    loop = asyncio.get_running_loop()
+    next_report = loop.time() + LAG_REPORT_INTERVAL
+    while not supervisor.stopping.is_set():
+        scheduled = loop.time()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lag = max(0.0, loop.time() - scheduled - LAG_PROBE_INTERVAL)
+        LAG_SAMPLES.append(lag)
+        if lag >= SLOW_CALLBACK_THRESHOLD:
+            metrics.inc("loop.lag_spikes")
+        if loop.time() >= next_report:
+            next_report = loop.time() + LAG_REPORT_INTERVAL
+            logger.info(f"[loop] 스케줄링 지연 {format_lag_summary()}")
+
+
+# ===============================
+# 샘플링 프로파일러 (flamegraph collapsed 포맷)
+# ===============================
+def _frame_key(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        names.append(_frame_key(frame))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def _sample(thread_id: int, seconds: float, interval: float) -> Counter:
+    samples = Counter()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is not None:
+            samples[_collapse(frame)] += 1
+        time.sleep(interval)
+    return samples
+
+
+async def run_profile(seconds: float) -> tuple[Path, int]:
+    """
+    루프 스레드를 seconds 동안 샘플링해 flamegraph.pl / speedscope 에서 읽을 수 있는 collapsed 파일로 저장
+    반환: (파일 경로, 샘플 수)
+    """
+    if _profiling.is_set():
+        raise RuntimeError("이미 프로파일링 중입니다.")
+    seconds = min(seconds, MAX_PROFILE_SECONDS)
+    _profiling.set()
+    try:
+        logger.info(f"[loop] 샘플링 프로파일 시작: {seconds}초")
+        samples = await asyncio.to_thread(_sample, threading.get_ident(), seconds, PROFILE_SAMPLE_INTERVAL)
+    finally:
+        _profiling.clear()
+
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    path = PROFILE_DIR / f"loop-{datetime.now(KST).strftime('%Y%m%d-%H%M%S')}.folded"
+    lines = [f"{stack} {count}" for stack, count in samples.most_common()]
+    await asyncio.to_thread(path.write_text, "\n".join(lines) + "\n", "utf-8")
+    total = sum(samples.values())
+    logger.info(f"[loop] 샘플링 프로파일 저장: {path} ({total}개 샘플)")
+    return path, total
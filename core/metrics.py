@@ -0,0 +1,56 @@
+from collections import defaultdict, deque
+
+OBSERVATION_WINDOW = 1000  # 관측값 종류별 최근 보관 개수
+
+# 프로세스 전역 카운터 (이름 -> 누적값)
+COUNTERS = defaultdict(int)
+# 프로세스 전역 관측값 (이름 -> 최근 값들, 지연 시간/간격 등 분포가 필요한 값)
+OBSERVATIONS = defaultdict(lambda: deque(maxlen=OBSERVATION_WINDOW))
+
+
+def inc(name: str, value: int = 1):
+    COUNTERS[name] += value
+
+
+def get(name: str) -> int:
+    return COUNTERS.get(name, 0)
+
+
+def snapshot(prefix: str = "") -> dict:
+    return {name: value for name, value in sorted(COUNTERS.items()) if name.startswith(prefix)}
+
+
+def format_counters(prefix: str = "") -> str:
+    return ", ".join(f"{name}={value}" for name, value in snapshot(prefix).items())
+
+
+def observe(name: str, value: float):
+    OBSERVATIONS[name].append(value)
+
+
+def summary(name: str) -> dict:
+    """
+    최근 관측값의 개수/평균/백분위 (관측값이 없으면 빈 dict)
+    """
+    values = sorted(OBSERVATIONS.get(name, ()))
+    if not values:
+        return {}
+    last = len(values) - 1
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p5": values[int(last * 0.05)],
+        "p50": values[int(last * 0.50)],
+        "p95": values[int(last * 0.95)],
+        "p99": values[int(last * 0.99)],
+        "max": values[last],
+    }
+
+
+def format_summary(name: str, scale: float = 1000, unit: str = "ms") -> str:
+    stats = summary(name)
+    if not stats:
+        return f"{name}: 관측값 없음"
+    return (f"{name}: n={stats['count']} mean={stats['mean'] * scale:.1f}{unit} "
+            f"p5={stats['p5'] * scale:.1f}{unit} p50={stats['p50'] * scale:.1f}{unit} "
+            f"p95={stats['p95'] * scale:.1f}{unit} max={stats['max'] * scale:.1f}{unit}")
@@ -1,7 +1,5 @@
 # core/models.py
 
-from discord import app_commands
-
 SERVER_MAP = {
     "all": "전체",
     "anton": "안톤",
@@ -15,21 +13,41 @@ SERVER_MAP = {
 }
 
 
-SERVER_CHOICES_KR = [
-    app_commands.Choice(name=kr_name, value=server_id)
-    for server_id, kr_name in SERVER_MAP.items()
-]
+ALLOWED_RARITIES = {"에픽", "태초"}
 
-SERVER_CHOICES = [
-    app_commands.Choice(name=f"{korean} ({eng})", value=eng)
-    for eng, korean in SERVER_MAP.items()
-]
+# 타임라인 조회 코드 (504, 505, 507, 508, 513: 아이템 획득 관련)
+DEFAULT_TIMELINE_CODES = (505, 504, 507, 508, 513)
 
-ALLOWED_RARITIES = {"에픽", "태초"}
+# 집계 대상 장착 가능 레벨
+TARGET_ITEM_LEVELS = {115}
 
 # 아이템 등급별 가중치 (태초 100, 에픽 10, 레전더리 4)
 RARITY_WEIGHTS = {
     "태초": 100,
     "에픽": 10,
     "레전더리": 4
-}
\ No newline at end of file
+}
+
+# 알림 Embed 등급별 색상
+RARITY_COLORS = {
+    "레전더리": 0xFF7800,  # 주황
+    "에픽": 0xFFB400,  # 노란
+    "태초": 0x58d3dc  # 청록
+}
+
+
+def __getattr__(name):
+    # 선택지 목록은 처음 사용할 때 생성 (discord 를 쓰지 않는 워커/스크립트에서 import 비용 절약)
+    if name not in ("SERVER_CHOICES_KR", "SERVER_CHOICES"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from discord import app_commands
+
+    globals()["SERVER_CHOICES_KR"] = [
+        app_commands.Choice(name=kr_name, value=server_id)
+        for server_id, kr_name in SERVER_MAP.items()
+    ]
+    globals()["SERVER_CHOICES"] = [
+        app_commands.Choice(name=f"{korean} ({eng})", value=eng)
+        for eng, korean in SERVER_MAP.items()
+    ]
+    return globals()[name]
@@ -0,0 +1,99 @@
+import asyncio
+import random
+import time
+
+from core import metrics
+from core.logger import logger
+from core.sharding import stable_hash
+from core.supervisor import supervisor
+
+MAX_INFLIGHT_POLLS = 4  # 동시에 진행할 수 있는 조회 수 (느린 응답이 다음 슬롯을 막지 않도록)
+SLOT_JITTER = 0.2  # 슬롯 간격 대비 무작위 지연 비율 (여러 인스턴스가 같은 시점에 겹치지 않도록)
+_HASH_RANGE = 2 ** 64  # stable_hash 값 범위
+
+
+def plan_phases(keys: list[str], period: float) -> list[tuple[float, str]]:
+    """
+    키마다 주기 안의 고정 오프셋(초) 배정 (오프셋 순으로 정렬해 반환)
+    오프셋은 키 해시만으로 정해지므로 캐릭터가 추가/삭제되어도 다른 캐릭터의 조회 시점은 바뀌지 않음
+    해시가 고르게 퍼져 있어 명단이 크면 주기 전체에 고르게 분산됨
+    """
+    return sorted((stable_hash(key) / _HASH_RANGE * period, key) for key in keys)
+
+
+class PollScheduler:
+    """
+    명단 전체를 한꺼번에 조회하고 쉬는 대신, 주기 전체에 걸쳐 일정 간격으로 한 건씩 조회를 시작하는 연속 스케줄러
+    - 실제 조회 시작 간격은 metrics 관측값 "{name}.spacing" (초) 으로 기록
+    - clock / sleep 을 주입할 수 있어 시뮬레이션에서 재사용 가능 (sleep 은 종료 요청 시 True 반환)
+    - 조회가 밀려 대기 없이 연달아 시작하는 동안에도 stopping 이 설정되면 남은 조회를 시작하지 않음
+    """
+
+    def __init__(self, name: str, period: float, sleep, clock=time.monotonic,
+                 max_inflight: int = MAX_INFLIGHT_POLLS, jitter: float = SLOT_JITTER,
+                 stopping: asyncio.Event = supervisor.stopping):
+        self.name = name
+        self.period = period
+        self.sleep = sleep
+        self.clock = clock
+        self.max_inflight = max_inflight
+        self.jitter = jitter
+        self.stopping = stopping
+        self._last_start = None
+
+    async def _poll_one(self, poll, item, semaphore):
+        try:
+            await poll(item)
+        except Exception as e:
+            metrics.inc(f"{self.name}.errors")
+            logger.error(f"[{self.name}] 조회 중 예외: {type(e).__name__} {e}")
+        finally:
+            semaphore.release()
+
+    async def run(self, load_roster, poll, on_cycle=None):
+        """
+        load_roster: 매 주기 시작 시 {키: 항목} 을 돌려주는 비동기 함수
+        poll: 항목 하나를 조회하는 비동기 함수
+        on_cycle: 주기가 끝날 때마다 호출할 함수 (선택)
+        """
+        semaphore = asyncio.Semaphore(self.max_inflight)
+        running = set()
+        cycle_start = self.clock()
+        stopped = False
+        while not stopped:
+            roster = await load_roster()
+            slot_jitter = self.period / len(roster) * self.jitter if roster else 0.0
+            for offset, key in plan_phases(list(roster), self.period):
+                delay = cycle_start + offset + random.uniform(0, slot_jitter) - self.clock()
+                if delay > 0 and await self.sleep(delay):
+                    stopped = True
+                    break
+                await semaphore.acquire()
+                if self.stopping.is_set():
+                    semaphore.release()
+                    stopped = True
+                    break
+                now = self.clock()
+                if self._last_start is not None:
+                    metrics.observe(f"{self.name}.spacing", now - self._last_start)
+                self._last_start = now
+                metrics.inc(f"{self.name}.started")
+                task = asyncio.create_task(self._poll_one(poll, roster[key], semaphore))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            if stopped:
+                break
+
+            cycle_start += self.period
+            if not roster:
+                stopped = await self.sleep(max(0.0, cycle_start - self.clock()))
+            elif self.clock() > cycle_start:
+                # 조회가 밀려 주기를 넘긴 경우 다음 주기는 지금부터 다시 시작
+                metrics.inc(f"{self.name}.overruns")
+                cycle_start = self.clock()
+            if on_cycle is not None:
+                on_cycle()
+
+        # 종료 시 진행 중인 조회는 끝까지 마무리
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
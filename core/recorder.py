@@ -0,0 +1,226 @@
+import asyncio
+import json
+import os
+import queue
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode
+
+from core import metrics
+from core.json_codec import loads
+from core.logger import logger
+
+# API 응답 녹화 디렉터리 (지정하면 부팅 시 녹화 세션 시작, 없으면 녹화하지 않음)
+RECORD_DIR = os.getenv("API_RECORD_DIR")
+RECORD_ENDPOINTS = {"timeline", "item"}  # 녹화 대상 엔드포인트 (이미지/검색은 재생에 불필요)
+SEGMENT_MAX_BYTES = 32 * 1024 * 1024  # 세그먼트 파일 최대 크기 (넘으면 다음 세그먼트로)
+COMPRESS_LEVEL = 3  # 응답마다 압축하므로 기록 스레드가 밀리지 않도록 낮은 압축 수준 사용
+
+# 세그먼트 파일: 헤더(매직, 포맷 버전) + 프레임 반복
+# 프레임: (압축 길이, crc32, 기록 시각 unix 초) + zlib(메타 JSON + "\n" + 응답 본문)
+SEGMENT_MAGIC = b"JMRS"
+SEGMENT_FORMAT = 1
+SEGMENT_HEADER = struct.Struct(">4sH")
+FRAME = struct.Struct(">IId")
+
+# 느슨한 매칭에서 무시할 파라미터: 조회 구간은 재생 시각/마지막 체크 시각에 따라 달라짐
+_LOOSE_IGNORED_PARAMS = {"startDate", "endDate"}
+# 같은 요청에 항상 같은 응답을 주는 엔드포인트 (재생 시 여러 번 사용)
+REPLAY_REUSABLE_ENDPOINTS = {"item"}
+
+_session = None
+_replay = None
+
+
+class RecordingSession:
+    """
+    추가 전용 세그먼트 파일에 프레임을 순서대로 기록
+    압축/파일 쓰기는 기록 스레드에서 처리하고 프레임마다 flush (이벤트 루프는 큐에 넣기만 함)
+    비정상 종료 시 큐에 남은 프레임과 잘린 마지막 프레임만 빠지고 앞 프레임은 그대로 읽을 수 있음
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.sequence = 0
+        self.frames = 0
+        self.bytes = 0
+        self._file = None
+        self._size = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self._thread.start()
+
+    def _open_segment(self):
+        if self._file is not None:
+            self._file.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"segment-{self.sequence:04d}.seg"
+        self.sequence += 1
+        self._file = open(path, "ab")
+        self._file.write(SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_FORMAT))
+        self._size = SEGMENT_HEADER.size
+        logger.info(f"[recorder] 세그먼트 시작: {path}")
+
+    def write(self, meta: dict, body: bytes = b""):
+        self._queue.put((time.time(), meta, body))
+        self.frames += 1
+        metrics.inc("recorder.frames")
+
+    def _run(self):
+        while (frame := self._queue.get()) is not None:
+            recorded_at, meta, body = frame
+            try:
+                self._write_frame(recorded_at, meta, body)
+            except OSError as e:
+                logger.error(f"[recorder] 프레임 기록 실패: {e}")
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write_frame(self, recorded_at: float, meta: dict, body: bytes):
+        payload = zlib.compress(json.dumps(meta, ensure_ascii=False).encode() + b"\n" + body, COMPRESS_LEVEL)
+        if self._file is None or self._size + FRAME.size + len(payload) > SEGMENT_MAX_BYTES:
+            self._open_segment()
+        self._file.write(FRAME.pack(len(payload), zlib.crc32(payload), recorded_at) + payload)
+        self._file.flush()
+        self._size += FRAME.size + len(payload)
+        self.bytes += FRAME.size + len(payload)
+
+    def close(self):
+        """
+        큐에 남은 프레임을 모두 기록한 뒤 세그먼트 파일 닫기
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+
+def start(directory: str | Path, initial_state: dict) -> Path:
+    """
+    녹화 세션 시작 - 디렉터리 아래에 세션별 하위 디렉터리를 만들고 첫 프레임으로 초기 상태 기록
+    initial_state: 재생 시 먼저 복원할 상태 (로스터, 아이템 인덱스, 중복 제거 상태 등)
+    """
+    global _session
+    stop()
+    session_dir = Path(directory) / time.strftime("%Y%m%dT%H%M%S")
+    _session = RecordingSession(session_dir)
+    _session.write({"state": True}, json.dumps(initial_state, ensure_ascii=False).encode())
+    logger.info(f"[recorder] API 응답 녹화 시작: {session_dir}")
+    return session_dir
+
+
+def stop():
+    global _session
+    if _session is None:
+        return
+    _session.close()
+    logger.info(f"[recorder] API 응답 녹화 종료: {_session.directory} "
+                f"(프레임 {_session.frames}개, {_session.bytes / 1024 / 1024:.1f}MB)")
+    _session = None
+
+
+async def close():
+    """
+    종료 훅: 남은 프레임 기록 후 세그먼트 파일 닫기 (기록 스레드 대기는 이벤트 루프 밖에서)
+    """
+    await asyncio.to_thread(stop)
+
+
+def is_recording() -> bool:
+    return _session is not None
+
+
+def record_response(endpoint: str, key: str, lane: str, result: tuple[int, bytes] | None):
+    """
+    봇이 받은 응답 1건 기록 (result 가 None 이면 최종 실패로 기록)
+    """
+    if _session is None or endpoint not in RECORD_ENDPOINTS:
+        return
+    status, body = result if result is not None else (0, b"")
+    _session.write({"endpoint": endpoint, "key": key, "lane": lane, "status": status}, body)
+
+
+def mark(kind: str, **fields):
+    """
+    작업 단위 경계 기록 (재생 시 이 지점까지 녹화된 응답으로 같은 작업을 다시 실행)
+    """
+    if _session is None:
+        return
+    _session.write({"mark": kind, **fields})
+
+
+def read_frames(session_dir: str | Path):
+    """
+    세션의 프레임을 기록 순서대로 반환: (기록 시각, 메타, 본문)
+    잘린 마지막 프레임이나 손상된 프레임을 만나면 해당 세그먼트 읽기를 중단
+    """
+    for path in sorted(Path(session_dir).glob("segment-*.seg")):
+        data = path.read_bytes()
+        if data[:SEGMENT_HEADER.size] != SEGMENT_HEADER.pack(SEGMENT_MAGIC, SEGMENT_FORMAT):
+            logger.warning(f"[recorder] 세그먼트 형식 불일치, 건너뜀: {path}")
+            continue
+        offset = SEGMENT_HEADER.size
+        while offset + FRAME.size <= len(data):
+            length, crc, recorded_at = FRAME.unpack_from(data, offset)
+            payload = data[offset + FRAME.size:offset + FRAME.size + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                logger.warning(f"[recorder] 손상된 프레임 이후 생략: {path} @{offset}")
+                break
+            meta, _, body = zlib.decompress(payload).partition(b"\n")
+            yield recorded_at, loads(meta), body
+            offset += FRAME.size + length
+
+
+def loose_key(key: str) -> str:
+    url, _, query = key.partition("?")
+    params = [(k, v) for k, v in parse_qsl(query) if k not in _LOOSE_IGNORED_PARAMS]
+    return f"{url}?{urlencode(params)}" if params else url
+
+
+class ReplaySource:
+    """
+    녹화된 응답을 요청 키로 찾아 반환
+    1. 같은 요청 키 (조회 구간까지 같은 요청 - 기간 집계처럼 구간이 고정된 경우)
+    2. 같은 레인의 조회 구간을 뺀 키 (득템 감시처럼 구간이 실행 시각에 따라 달라지는 경우), 녹화 순서대로
+    찾지 못하면 None (API 실패와 동일하게 처리됨)
+    """
+
+    def __init__(self):
+        self.exact = {}
+        self.loose = {}
+
+    def add(self, endpoint: str, key: str, lane: str, status: int, body: bytes):
+        entry = [status, body, False]
+        self.exact.setdefault((endpoint, key), deque()).append(entry)
+        self.loose.setdefault((endpoint, lane, loose_key(key)), deque()).append(entry)
+
+    def response(self, endpoint: str, key: str, lane: str) -> tuple[int, bytes] | None:
+        reusable = endpoint in REPLAY_REUSABLE_ENDPOINTS
+        for queue in (self.exact.get((endpoint, key)), self.loose.get((endpoint, lane, loose_key(key)))):
+            while queue:
+                entry = queue[0]
+                if entry[2]:
+                    queue.popleft()
+                    continue
+                if not reusable:
+                    entry[2] = True
+                    queue.popleft()
+                metrics.inc(f"replay.{endpoint}.served")
+                return None if entry[0] == 0 else (entry[0], entry[1])
+        metrics.inc(f"replay.{endpoint}.misses")
+        return None
+
+
+def set_replay(source: ReplaySource | None):
+    """
+    재생 모드 전환 (None 이면 실제 API 요청으로 복귀)
+    """
+    global _replay
+    _replay = source
+
+
+def get_replay() -> ReplaySource | None:
+    return _replay
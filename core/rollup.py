@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, date
+
+import numpy as np
+
+from core import db, lanes
+from core.events import TimelineEvent
+from core.logger import logger
+from core.models import SERVER_MAP
+from core.stats import RARITY_CODES, RARITY_ORDER, rank_counts
+from core.timewindow import WEEK_START_WEEKDAY, game_day
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=(day.weekday() - WEEK_START_WEEKDAY) % 7)
+
+
+def day_bucket(day: date) -> str:
+    return day.strftime("%Y%m%d")
+
+
+def event_buckets(event_dt: datetime) -> dict:
+    day = game_day(event_dt)
+    return {
+        "hour": event_dt.strftime("%Y%m%d%H"),
+        "day": day_bucket(day),
+        "week": day_bucket(week_start(day)),
+    }
+
+
+def build_event_records(char: dict, events: list[TimelineEvent]) -> list[dict]:
+    """
+    타임라인 이벤트를 롤업 저장용 이벤트 dict 로 변환
+    """
+    records = []
+    for event in events:
+        if event.item_rarity not in RARITY_CODES:
+            continue
+        records.append({
+            "character_id": char["character_id"],
+            "event_date": event.date,
+            "item_id": event.item_id,
+            "item_name": event.item_name,
+            "item_rarity": event.item_rarity,
+            "server_id": char["server_id"],
+            "adventure_name": char.get("adventure_name", "모험단명 없음"),
+            "buckets": event_buckets(event.occurred_at),
+        })
+    return records
+
+
+async def record_timeline_items(char: dict, events: list[TimelineEvent]) -> int:
+    """
+    감지된 획득 이벤트를 이벤트 저장소와 롤업 테이블에 반영
+    """
+    records = build_event_records(char, events)
+    if not records:
+        return 0
+    async with lanes.admit("db"):
+        return await db.record_item_events(records)
+
+
+def current_week_range(now: datetime, weeks_ago: int = 0) -> tuple[date, date]:
+    start = week_start(game_day(now)) - timedelta(weeks=weeks_ago)
+    return start, start + timedelta(days=6)
+
+
+def current_month_range(now: datetime, months_ago: int = 0) -> tuple[date, date]:
+    day = game_day(now)
+    year, month = day.year, day.month - months_ago
+    while month <= 0:
+        year -= 1
+        month += 12
+    start = date(year, month, 1)
+    next_month = date(year + (month == 12), month % 12 + 1, 1)
+    return start, next_month - timedelta(days=1)
+
+
+def _register_keys(rows: list[dict], key_index: dict, keys: list):
+    for row in rows:
+        key = (row["server_id"], row["adventure_name"])
+        if key not in key_index:
+            key_index[key] = len(keys)
+            keys.append(key)
+
+
+def _counts_matrix(rows: list[dict], key_index: dict) -> np.ndarray:
+    counts = np.zeros((len(key_index), len(RARITY_ORDER)), dtype=np.int64)
+    for row in rows:
+        code = RARITY_CODES.get(row["item_rarity"])
+        if code is not None:
+            counts[key_index[(row["server_id"], row["adventure_name"])], code] += row["count"]
+    return counts
+
+
+async def rollup_leaderboard(level: str, start: date, end: date, previous: tuple[date, date] | None = None,
+                             n: int | None = None) -> list[dict]:
+    """
+    롤업 테이블로 모험단 순위 계산 (구간 내 버킷 행만 조회)
+    level: "day" 또는 "week" (start/end 는 해당 레벨 버킷의 게임일)
+    """
+    rows = await db.get_rollup_counts(level, day_bucket(start), day_bucket(end))
+    prev_rows = []
+    if previous is not None:
+        prev_rows = await db.get_rollup_counts(level, day_bucket(previous[0]), day_bucket(previous[1]))
+
+    key_index = {}
+    keys = []
+    _register_keys(rows, key_index, keys)
+    _register_keys(prev_rows, key_index, keys)
+    counts = _counts_matrix(rows, key_index)
+    previous_counts = _counts_matrix(prev_rows, key_index) if previous is not None else None
+
+    result = rank_counts(keys, counts, n, previous_counts)
+    for entry in result:
+        server_id, adventure_name = entry["key"]
+        entry["adventure_name"] = f"{adventure_name} ({SERVER_MAP.get(server_id, server_id)})"
+    logger.info(f"[rollup] {level} 순위 계산: {day_bucket(start)}~{day_bucket(end)}, {len(rows)}개 행")
+    return result
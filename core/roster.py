@@ -0,0 +1,124 @@
+from collections import OrderedDict
+
+from core import db
+from core.logger import logger
+
+# 디스코드 Embed/메시지 제한
+EMBED_TITLE_LIMIT = 256
+EMBED_DESCRIPTION_LIMIT = 4096
+MESSAGE_EMBED_CHAR_LIMIT = 6000
+MESSAGE_EMBED_COUNT_LIMIT = 10
+PAGE_FOOTER_RESERVE = 50  # 페이지 번호 footer 여유분
+
+PAGE_PLAN_CACHE_SIZE = 32  # 필터 조합별 페이지 계획 캐시 개수
+
+# 글로벌 로스터 스냅샷 캐시: (로스터 버전, 그룹 튜플)
+# 그룹 = (제목, server_id, adventure_name, 설명 줄 튜플)
+_roster_snapshot = None
+_page_plan_cache = OrderedDict()
+
+
+def _build_groups(grouped: dict[str, list[dict]]) -> tuple:
+    groups = []
+    for adv_full_name, chars in grouped.items():
+        if not chars:
+            continue
+        lines = tuple(
+            f"- {char['character_name']} - {char['job_grow_name']}"[:EMBED_DESCRIPTION_LIMIT]
+            for char in chars
+        )
+        groups.append((
+            f"📛 모험단: {adv_full_name}"[:EMBED_TITLE_LIMIT - 10],
+            chars[0]["server_id"],
+            chars[0]["adventure_name"],
+            lines,
+        ))
+    return tuple(groups)
+
+
+async def get_roster_snapshot() -> tuple:
+    """
+    모험단별 캐릭터 목록 스냅샷 반환
+    로스터 버전이 바뀌지 않았으면 DB 조회 없이 캐시를 그대로 사용
+    """
+    global _roster_snapshot
+    version = db.ROSTER_VERSION
+    if _roster_snapshot is not None and _roster_snapshot[0] == version:
+        logger.info(f"[roster] 스냅샷 캐시 히트: 버전 {version}")
+        return _roster_snapshot[1]
+
+    grouped = await db.get_all_characters_grouped_by_adventure()
+    groups = _build_groups(grouped)
+    # 조회 도중 버전이 바뀌었으면 다음 호출에서 다시 읽도록 캐싱하지 않음
+    if db.ROSTER_VERSION == version:
+        _roster_snapshot = (version, groups)
+        _page_plan_cache.clear()
+    logger.info(f"[roster] 스냅샷 갱신: 버전 {version}, {len(groups)}개 모험단")
+    return groups
+
+
+def _split_group(group_index: int, lines: tuple) -> list[tuple[int, int, int]]:
+    """
+    설명 길이 제한에 맞춰 한 모험단의 줄 목록을 (그룹, 시작, 끝) 조각으로 분할
+    """
+    parts = []
+    start = 0
+    length = 0
+    for i, line in enumerate(lines):
+        added = len(line) + (1 if i > start else 0)
+        if i > start and length + added > EMBED_DESCRIPTION_LIMIT:
+            parts.append((group_index, start, i))
+            start = i
+            added = len(line)
+            length = 0
+        length += added
+    parts.append((group_index, start, len(lines)))
+    return parts
+
+
+def _chunk_length(groups: tuple, chunk: tuple[int, int, int]) -> int:
+    group_index, start, end = chunk
+    title, _, _, lines = groups[group_index]
+    # 분할 표기 "(n/m)" 여유분 포함
+    return len(title) + 10 + sum(len(line) + 1 for line in lines[start:end])
+
+
+def plan_pages(groups: tuple, server_id: str | None = None, adventure: str | None = None) -> tuple:
+    """
+    필터 조건에 맞는 그룹을 메시지 제한(Embed 10개, 총 6000자) 단위 페이지로 나눔
+    페이지 = ((그룹 인덱스, 줄 시작, 줄 끝, 조각 번호, 조각 수), ...)
+    """
+    cacheable = _roster_snapshot is not None and groups is _roster_snapshot[1]
+    key = (server_id or "all", adventure or "")
+    cached = _page_plan_cache.get(key) if cacheable else None
+    if cached is not None:
+        _page_plan_cache.move_to_end(key)
+        return cached
+
+    pages = []
+    current = []
+    current_length = 0
+    for group_index, (_, group_server, adventure_name, lines) in enumerate(groups):
+        if server_id and server_id != "all" and group_server != server_id:
+            continue
+        if adventure and adventure not in adventure_name:
+            continue
+        chunks = _split_group(group_index, lines)
+        for part_no, chunk in enumerate(chunks, start=1):
+            chunk_length = _chunk_length(groups, chunk)
+            if current and (len(current) >= MESSAGE_EMBED_COUNT_LIMIT
+                            or current_length + chunk_length > MESSAGE_EMBED_CHAR_LIMIT - PAGE_FOOTER_RESERVE):
+                pages.append(tuple(current))
+                current = []
+                current_length = 0
+            current.append((*chunk, part_no, len(chunks)))
+            current_length += chunk_length
+    if current:
+        pages.append(tuple(current))
+
+    plan = tuple(pages)
+    if cacheable:
+        _page_plan_cache[key] = plan
+        if len(_page_plan_cache) > PAGE_PLAN_CACHE_SIZE:
+            _page_plan_cache.popitem(last=False)
+    return plan
@@ -0,0 +1,46 @@
+import bisect
+import hashlib
+from functools import lru_cache
+
+VIRTUAL_NODES = 64  # 샤드당 해시 링 가상 노드 수
+
+
+def stable_hash(key: str) -> int:
+    # 프로세스마다 값이 달라지는 내장 hash() 대신 고정 해시 사용
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    캐릭터 ID -> 샤드 번호 일관 해시 링
+    샤드 수가 바뀌어도 대부분의 캐릭터는 기존 샤드에 그대로 남음
+    """
+
+    def __init__(self, shard_count: int, virtual_nodes: int = VIRTUAL_NODES):
+        self.shard_count = shard_count
+        points = sorted(
+            (stable_hash(f"shard-{shard}#{vnode}"), shard)
+            for shard in range(shard_count)
+            for vnode in range(virtual_nodes)
+        )
+        self._hashes = [h for h, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_of(self, character_id: str) -> int:
+        idx = bisect.bisect(self._hashes, stable_hash(character_id)) % len(self._hashes)
+        return self._shards[idx]
+
+
+@lru_cache(maxsize=None)
+def get_ring(shard_count: int) -> HashRing:
+    return HashRing(shard_count)
+
+
+def owns_character(shard: tuple[int, int], character_id: str) -> bool:
+    """
+    shard: (샤드 번호, 샤드 수)
+    """
+    shard_index, shard_count = shard
+    if shard_count <= 1:
+        return True
+    return get_ring(shard_count).shard_of(character_id) == shard_index
@@ -0,0 +1,197 @@
+import numpy as np
+
+from core.models import RARITY_WEIGHTS
+
+# 등급 코드: RARITY_WEIGHTS 순서대로 0, 1, 2 ...
+RARITY_ORDER = tuple(RARITY_WEIGHTS)
+RARITY_CODES = {rarity: code for code, rarity in enumerate(RARITY_ORDER)}
+WEIGHT_VECTOR = np.array([RARITY_WEIGHTS[rarity] for rarity in RARITY_ORDER], dtype=np.int64)
+
+BY_CHARACTER = "character"
+BY_ADVENTURE = "adventure"
+
+
+class EventColumns:
+    """
+    아이템 획득 이벤트의 열 지향 저장소
+    (캐릭터 idx, 모험단 idx, 등급 코드, 타임스탬프) 를 각각 numpy 배열로 보관
+    캐릭터/모험단 키는 정수 인덱스로 인터닝
+    failed: 수집 중 조회에 실패한 캐릭터 수 (0 이 아니면 일부 이벤트가 빠진 결과)
+    """
+    __slots__ = ("character_idx", "adventure_idx", "rarity", "timestamp", "size", "failed",
+                 "character_keys", "adventure_keys", "_character_index", "_adventure_index")
+
+    def __init__(self, capacity: int = 1024):
+        self.character_idx = np.empty(capacity, dtype=np.int32)
+        self.adventure_idx = np.empty(capacity, dtype=np.int32)
+        self.rarity = np.empty(capacity, dtype=np.int8)
+        self.timestamp = np.empty(capacity, dtype=np.int64)
+        self.size = 0
+        self.failed = 0
+        self.character_keys = []
+        self.adventure_keys = []
+        self._character_index = {}
+        self._adventure_index = {}
+
+    def __len__(self):
+        return self.size
+
+    def character_index(self, key) -> int:
+        idx = self._character_index.get(key)
+        if idx is None:
+            idx = self._character_index[key] = len(self.character_keys)
+            self.character_keys.append(key)
+        return idx
+
+    def adventure_index(self, key) -> int:
+        idx = self._adventure_index.get(key)
+        if idx is None:
+            idx = self._adventure_index[key] = len(self.adventure_keys)
+            self.adventure_keys.append(key)
+        return idx
+
+    def _reserve(self, extra: int):
+        needed = self.size + extra
+        capacity = len(self.timestamp)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("character_idx", "adventure_idx", "rarity", "timestamp"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def append(self, character_key, adventure_key, rarity: str, timestamp: int) -> bool:
+        """
+        이벤트 1건 추가 (집계 대상 등급이 아니면 False)
+        """
+        code = RARITY_CODES.get(rarity)
+        if code is None:
+            return False
+        self._reserve(1)
+        i = self.size
+        self.character_idx[i] = self.character_index(character_key)
+        self.adventure_idx[i] = self.adventure_index(adventure_key)
+        self.rarity[i] = code
+        self.timestamp[i] = timestamp
+        self.size += 1
+        return True
+
+    def extend(self, character_idx, adventure_idx, rarity, timestamp):
+        """
+        이미 인덱스로 변환된 배열을 한 번에 추가 (대량 적재용)
+        """
+        n = len(timestamp)
+        self._reserve(n)
+        end = self.size + n
+        self.character_idx[self.size:end] = character_idx
+        self.adventure_idx[self.size:end] = adventure_idx
+        self.rarity[self.size:end] = rarity
+        self.timestamp[self.size:end] = timestamp
+        self.size = end
+
+    def records(self) -> list[tuple]:
+        """
+        (캐릭터 키, 모험단 키, 등급, 타임스탬프) 목록 (프로세스 간 전달용)
+        """
+        character_idx, adventure_idx, rarity, timestamp = self.columns()
+        return [
+            (self.character_keys[c], self.adventure_keys[a], RARITY_ORDER[r], t)
+            for c, a, r, t in zip(character_idx.tolist(), adventure_idx.tolist(),
+                                  rarity.tolist(), timestamp.tolist())
+        ]
+
+    def columns(self):
+        n = self.size
+        return self.character_idx[:n], self.adventure_idx[:n], self.rarity[:n], self.timestamp[:n]
+
+
+def rarity_counts(events: EventColumns, start_ts: int, end_ts: int, by: str = BY_ADVENTURE) -> np.ndarray:
+    """
+    [start_ts, end_ts) 구간의 키별 등급 개수 행렬 (키 수 x 등급 수)
+    """
+    character_idx, adventure_idx, rarity, timestamp = events.columns()
+    if by == BY_CHARACTER:
+        keys, n_keys = character_idx, len(events.character_keys)
+    else:
+        keys, n_keys = adventure_idx, len(events.adventure_keys)
+
+    mask = (timestamp >= start_ts) & (timestamp < end_ts)
+    n_rarities = len(RARITY_ORDER)
+    flat = keys[mask].astype(np.int64) * n_rarities + rarity[mask]
+    return np.bincount(flat, minlength=n_keys * n_rarities).reshape(n_keys, n_rarities)
+
+
+def weighted_scores(counts: np.ndarray) -> np.ndarray:
+    return counts @ WEIGHT_VECTOR
+
+
+def rank_of(scores: np.ndarray) -> np.ndarray:
+    """
+    점수 내림차순 순위 (1부터, 동점은 같은 순위)
+    """
+    order = np.argsort(-scores, kind="stable")
+    sorted_desc = -scores[order]
+    ranks = np.empty(len(scores), dtype=np.int64)
+    ranks[order] = np.searchsorted(sorted_desc, sorted_desc, side="left") + 1
+    return ranks
+
+
+def top_n(scores: np.ndarray, n: int | None = None) -> np.ndarray:
+    """
+    점수가 0보다 큰 키 중 상위 n개 인덱스 (점수 내림차순)
+    """
+    candidates = np.flatnonzero(scores > 0)
+    if n is not None and n < len(candidates):
+        part = np.argpartition(-scores[candidates], n - 1)[:n]
+        candidates = candidates[part]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def rank_counts(keys: list, counts: np.ndarray, n: int | None = None,
+                previous_counts: np.ndarray | None = None) -> list[dict]:
+    """
+    키별 등급 개수 행렬로 순위 목록 생성
+    previous_counts: 같은 키 순서의 직전 기간 개수 행렬 - 지정 시 순위 변동(rank_change) 포함
+    """
+    scores = weighted_scores(counts)
+    ranks = rank_of(scores)
+
+    prev_ranks = prev_scores = None
+    if previous_counts is not None:
+        prev_scores = weighted_scores(previous_counts)
+        prev_ranks = rank_of(prev_scores)
+
+    result = []
+    for idx in top_n(scores, n).tolist():
+        entry = {
+            "key": keys[idx],
+            "rank": int(ranks[idx]),
+            "score": int(scores[idx]),
+            "counts": {rarity: int(counts[idx, code]) for code, rarity in enumerate(RARITY_ORDER)},
+        }
+        if prev_ranks is not None:
+            entry["rank_change"] = int(prev_ranks[idx] - ranks[idx]) if prev_scores[idx] > 0 else None
+        result.append(entry)
+    return result
+
+
+def leaderboard(events: EventColumns, start_ts: int, end_ts: int, by: str = BY_ADVENTURE,
+                n: int | None = None, previous: tuple[int, int] | None = None) -> list[dict]:
+    """
+    기간 리더보드 계산
+    previous: 직전 기간 (start_ts, end_ts) - 지정 시 순위 변동(rank_change) 포함
+    """
+    counts = rarity_counts(events, start_ts, end_ts, by)
+    previous_counts = None
+    if previous is not None:
+        previous_counts = rarity_counts(events, previous[0], previous[1], by)
+
+    keys = events.character_keys if by == BY_CHARACTER else events.adventure_keys
+    result = rank_counts(keys, counts, n, previous_counts)
+    if by == BY_ADVENTURE:
+        for entry in result:
+            entry["adventure_name"] = entry["key"]
+    return result
@@ -0,0 +1,236 @@
+import asyncio
+import os
+from abc import ABC, abstractmethod
+
+from core import db, metrics
+from core.logger import logger
+
+# sqlite (기본) / memory (테스트/벤치마크) / write_behind (sqlite 앞에 쓰기 버퍼)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlite")
+# sqlite 사용 시에도 아이템 캐시 저장은 버퍼에 모아 일괄 반영 (신규 아이템이 몰릴 때 건별 커밋 방지)
+ITEM_CACHE_WRITE_BEHIND = os.getenv("ITEM_CACHE_WRITE_BEHIND", "1") == "1"
+WRITE_BEHIND_FLUSH_INTERVAL = 5.0  # 쓰기 버퍼 자동 반영 간격 (초)
+WRITE_BEHIND_MAX_PENDING = 500  # 이 개수 이상 쌓이면 즉시 반영
+
+
+class StateStore(ABC):
+    """
+    조회 경로에서 자주 읽고 쓰는 상태 저장소 인터페이스
+    - 아이템 장착 가능 레벨 캐시 (item_cache)
+    - 캐릭터별 마지막 타임라인 조회 시각 (character_last_checked)
+    """
+    name = "base"
+
+    @abstractmethod
+    async def load_item_levels(self) -> dict[str, int]:
+        ...
+
+    @abstractmethod
+    async def get_item_level(self, item_id: str) -> int | None:
+        ...
+
+    @abstractmethod
+    async def save_item_levels(self, levels: dict[str, int]):
+        ...
+
+    @abstractmethod
+    async def get_last_checked(self, character_id: str) -> str | None:
+        ...
+
+    @abstractmethod
+    async def set_last_checked(self, character_id: str, last_checked: str):
+        ...
+
+    async def set_last_checked_many(self, last_checked: dict[str, str]):
+        for character_id, value in last_checked.items():
+            await self.set_last_checked(character_id, value)
+
+    async def flush(self):
+        """
+        버퍼링된 쓰기를 하위 저장소에 반영 (버퍼가 없는 구현은 아무것도 하지 않음)
+        """
+
+    async def close(self):
+        await self.flush()
+
+
+class SQLiteStore(StateStore):
+    """
+    기존 data/characters.db 를 그대로 사용하는 구현 (core/db.py 함수에 위임)
+    """
+    name = "sqlite"
+
+    async def load_item_levels(self) -> dict[str, int]:
+        return await db.get_all_item_levels()
+
+    async def get_item_level(self, item_id: str) -> int | None:
+        return await db.get_item_available_level(item_id)
+
+    async def save_item_levels(self, levels: dict[str, int]):
+        await db.save_item_levels(levels)
+
+    async def get_last_checked(self, character_id: str) -> str | None:
+        return await db.get_last_checked(character_id)
+
+    async def set_last_checked(self, character_id: str, last_checked: str):
+        await db.update_last_checked(character_id, last_checked)
+
+    async def set_last_checked_many(self, last_checked: dict[str, str]):
+        await db.update_last_checked_bulk(last_checked)
+
+
+class MemoryStore(StateStore):
+    """
+    프로세스 메모리에만 보관하는 구현 (테스트/벤치마크/재생용, 재시작 시 사라짐)
+    """
+    name = "memory"
+
+    def __init__(self):
+        self.item_levels = {}
+        self.last_checked = {}
+
+    async def load_item_levels(self) -> dict[str, int]:
+        return dict(self.item_levels)
+
+    async def get_item_level(self, item_id: str) -> int | None:
+        return self.item_levels.get(item_id)
+
+    async def save_item_levels(self, levels: dict[str, int]):
+        self.item_levels.update(levels)
+
+    async def get_last_checked(self, character_id: str) -> str | None:
+        return self.last_checked.get(character_id)
+
+    async def set_last_checked(self, character_id: str, last_checked: str):
+        self.last_checked[character_id] = last_checked
+
+
+class WriteBehindStore(StateStore):
+    """
+    쓰기를 메모리 버퍼에 모았다가 주기적으로(또는 일정 개수가 쌓이면) 하위 저장소에 일괄 반영
+    읽기는 버퍼를 먼저 확인하므로 반영 전에도 최신 값을 돌려줌
+    반영 실패 시 버퍼를 유지해 다음 반영 때 다시 시도
+    buffer_last_checked=False 면 마지막 조회 시각은 버퍼 없이 바로 기록 (비정상 종료 시 재조회 구간 최소화)
+    """
+    name = "write_behind"
+
+    def __init__(self, backend: StateStore, flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL,
+                 max_pending: int = WRITE_BEHIND_MAX_PENDING, buffer_last_checked: bool = True):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.buffer_last_checked = buffer_last_checked
+        if not buffer_last_checked:
+            self.name = f"{backend.name}+item_write_behind"
+        self._item_levels = {}
+        self._last_checked = {}
+        self._flush_lock = asyncio.Lock()
+        self._timer = None  # 시간 기준 반영 대기 작업
+        self._flushes = set()  # 개수 기준으로 바로 시작한 반영 작업
+
+    @property
+    def pending(self) -> int:
+        return len(self._item_levels) + len(self._last_checked)
+
+    def _schedule_flush(self):
+        if self.pending >= self.max_pending:
+            metrics.inc("storage.size_flushes")
+            task = asyncio.create_task(self.flush())
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+        elif self._timer is None or self._timer.done():
+            self._timer = asyncio.create_task(self._delayed_flush())
+
+    async def _delayed_flush(self):
+        await asyncio.sleep(self.flush_interval)
+        # 반영을 시작한 뒤에는 close() 가 취소하지 않도록 타이머에서 제외 (close 는 잠금으로 순서 보장)
+        self._timer = None
+        await self.flush()
+
+    async def load_item_levels(self) -> dict[str, int]:
+        levels = await self.backend.load_item_levels()
+        levels.update(self._item_levels)
+        return levels
+
+    async def get_item_level(self, item_id: str) -> int | None:
+        if item_id in self._item_levels:
+            return self._item_levels[item_id]
+        return await self.backend.get_item_level(item_id)
+
+    async def save_item_levels(self, levels: dict[str, int]):
+        self._item_levels.update(levels)
+        self._schedule_flush()
+
+    async def get_last_checked(self, character_id: str) -> str | None:
+        if character_id in self._last_checked:
+            return self._last_checked[character_id]
+        return await self.backend.get_last_checked(character_id)
+
+    async def set_last_checked(self, character_id: str, last_checked: str):
+        if not self.buffer_last_checked:
+            await self.backend.set_last_checked(character_id, last_checked)
+            return
+        self._last_checked[character_id] = last_checked
+        self._schedule_flush()
+
+    async def flush(self):
+        async with self._flush_lock:
+            item_levels, self._item_levels = self._item_levels, {}
+            last_checked, self._last_checked = self._last_checked, {}
+            try:
+                if item_levels:
+                    await self.backend.save_item_levels(item_levels)
+                    metrics.inc("storage.flushed_item_levels", len(item_levels))
+                    item_levels = {}
+                if last_checked:
+                    await self.backend.set_last_checked_many(last_checked)
+                    metrics.inc("storage.flushed_last_checked", len(last_checked))
+                    last_checked = {}
+            except Exception as e:
+                # 반영하지 못한 값은 그 사이 새로 들어온 값을 덮어쓰지 않도록 되돌림
+                for key, value in item_levels.items():
+                    self._item_levels.setdefault(key, value)
+                for key, value in last_checked.items():
+                    self._last_checked.setdefault(key, value)
+                metrics.inc("storage.flush_errors")
+                logger.error(f"[storage] 쓰기 버퍼 반영 실패 (남은 {self.pending}개는 다음에 재시도): {e}")
+
+    async def close(self):
+        # 대기 중인 타이머만 취소 (이미 시작한 반영은 버퍼를 비운 상태라 끝까지 기다림)
+        if self._timer is not None and not self._timer.done():
+            self._timer.cancel()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+        await self.flush()
+        await self.backend.close()
+
+
+def create_store(backend: str = STORAGE_BACKEND) -> StateStore:
+    if backend == "memory":
+        return MemoryStore()
+    if backend == "write_behind":
+        return WriteBehindStore(SQLiteStore())
+    if backend != "sqlite":
+        logger.warning(f"[storage] 알 수 없는 저장소 '{backend}' - sqlite 사용")
+    if ITEM_CACHE_WRITE_BEHIND:
+        return WriteBehindStore(SQLiteStore(), buffer_last_checked=False)
+    return SQLiteStore()
+
+
+_store = None
+
+
+def get_store() -> StateStore:
+    global _store
+    if _store is None:
+        _store = create_store()
+        logger.info(f"[storage] 상태 저장소: {_store.name}")
+    return _store
+
+
+def set_store(store: StateStore):
+    """
+    저장소 교체 (테스트/벤치마크/재생 시 MemoryStore 주입용)
+    """
+    global _store
+    _store = store
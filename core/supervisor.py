@@ -0,0 +1,106 @@
+import asyncio
+import random
+import time
+
+from core.logger import logger
+
+RESTART_BACKOFF_BASE = 5  # 재시작 대기 기본값 (초)
+RESTART_BACKOFF_MAX = 5 * 60  # 재시작 대기 최대값 (초)
+STABLE_RUN_SECONDS = 10 * 60  # 이 시간 이상 정상 동작하면 실패 횟수 초기화
+SHUTDOWN_DEADLINE = 8  # 종료 시 진행 중 작업을 기다리는 최대 시간 (도커 기본 stop timeout 10초)
+
+
+class TaskSupervisor:
+    """
+    백그라운드 주기 작업 관리자
+    - 작업 이름당 하나만 실행 (on_ready 재호출 시 중복 실행 방지)
+    - 예외로 종료되면 지수 백오프 + 지터 후 재시작
+    - 종료 요청 시 stopping 이벤트로 작업이 사이클 경계에서 스스로 끝나도록 유도하고,
+      기한이 지나면 취소한 뒤 등록된 flush 훅을 실행
+    """
+
+    def __init__(self):
+        self.stopping = asyncio.Event()
+        self._tasks = {}
+        self._shutdown_hooks = []
+        self._shutdown_done = False
+
+    def start(self, name: str, factory) -> bool:
+        """
+        factory: 인자 없이 호출하면 작업 코루틴을 돌려주는 함수
+        """
+        if self.stopping.is_set():
+            return False
+        task = self._tasks.get(name)
+        if task is not None and not task.done():
+            logger.info(f"[supervisor] {name} 작업은 이미 실행 중입니다.")
+            return False
+        self._tasks[name] = asyncio.create_task(self._run(name, factory), name=name)
+        logger.info(f"[supervisor] {name} 작업 시작됨")
+        return True
+
+    async def _run(self, name: str, factory):
+        failures = 0
+        while not self.stopping.is_set():
+            started = time.monotonic()
+            try:
+                await factory()
+                if self.stopping.is_set():
+                    break
+                logger.warning(f"[supervisor] {name} 작업이 예기치 않게 종료되어 재시작합니다.")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception(f"[supervisor] {name} 작업 오류: {e}")
+
+            if time.monotonic() - started >= STABLE_RUN_SECONDS:
+                failures = 0
+            failures += 1
+            delay = min(RESTART_BACKOFF_BASE * 2 ** (failures - 1), RESTART_BACKOFF_MAX)
+            delay *= random.uniform(0.5, 1.0)
+            logger.info(f"[supervisor] {name} 작업 {delay:.1f}초 후 재시작 ({failures}회째)")
+            if await self.sleep(delay):
+                break
+        logger.info(f"[supervisor] {name} 작업 종료")
+
+    async def sleep(self, seconds: float) -> bool:
+        """
+        종료 요청이 오면 즉시 깨어나는 sleep (종료 요청 시 True 반환)
+        """
+        try:
+            await asyncio.wait_for(self.stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def add_shutdown_hook(self, hook):
+        """
+        종료 시 실행할 비동기 flush 함수 등록 (등록 역순으로 실행)
+        """
+        self._shutdown_hooks.append(hook)
+
+    async def shutdown(self, deadline: float = SHUTDOWN_DEADLINE):
+        if self._shutdown_done:
+            return
+        self._shutdown_done = True
+        logger.info(f"[supervisor] 종료 요청: 진행 중 작업 최대 {deadline}초 대기")
+        self.stopping.set()
+
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=deadline)
+            for task in pending:
+                logger.warning(f"[supervisor] {task.get_name()} 작업이 기한 내 끝나지 않아 취소합니다.")
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        for hook in reversed(self._shutdown_hooks):
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"[supervisor] 종료 훅 실행 실패 ({getattr(hook, '__name__', hook)}): {e}")
+        logger.info("[supervisor] 종료 처리 완료")
+
+
+supervisor = TaskSupervisor()
@@ -0,0 +1,138 @@
+import asyncio
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from core import metrics
+from core.events import TimelineEvent
+from core.timewindow import API_GRANULARITY, KST, TIMELINE_SETTLE, floor_minute, from_api, now_kst, to_api
+
+# 진행 중인 게임일과 전날만 보관 (끝난 게임일 집계 결과는 daily_aggregation 에서 따로 캐시)
+TIMELINE_CACHE_RETENTION = timedelta(days=2)
+MAX_CACHED_TIMELINES = 4096  # 보관할 (캐릭터, 코드) 타임라인 수 (오래 안 쓴 것부터 제거)
+
+_MINUTE = int(API_GRANULARITY.total_seconds())
+
+
+class CharacterTimeline:
+    """
+    캐릭터 하나의 이미 받은 타임라인 구간과 그 구간의 이벤트
+    - covered: 겹치지 않게 병합된 [시작, 끝) 구간 목록 (unix 초, 분 단위)
+    - events: 받은 구간의 이벤트 (timestamp 오름차순)
+    """
+    __slots__ = ("covered", "events", "timestamps", "lock")
+
+    def __init__(self):
+        self.covered = []
+        self.events = []
+        self.timestamps = []
+        self.lock = asyncio.Lock()
+
+    def gaps(self, start: int, end: int) -> list[tuple[int, int]]:
+        """
+        [start, end) 중 아직 받지 않은 구간 목록
+        """
+        gaps = []
+        cursor = start
+        for covered_start, covered_end in self.covered:
+            if covered_end <= cursor:
+                continue
+            if covered_start >= end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start))
+            cursor = max(cursor, covered_end)
+            if cursor >= end:
+                break
+        if cursor < end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def add(self, start: int, end: int, events: list[TimelineEvent]):
+        """
+        새로 받은 구간 [start, end) 와 그 구간의 이벤트 추가 (이미 받은 구간과 겹치지 않는 구간만 호출)
+        """
+        merged = []
+        for covered_start, covered_end in sorted(self.covered + [(start, end)]):
+            if merged and covered_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], covered_end))
+            else:
+                merged.append((covered_start, covered_end))
+        self.covered = merged
+        if events:
+            self.events = sorted(self.events + events, key=lambda event: event.timestamp)
+            self.timestamps = [event.timestamp for event in self.events]
+
+    def slice(self, start: int, end: int) -> list[TimelineEvent]:
+        return self.events[bisect_left(self.timestamps, start):bisect_left(self.timestamps, end)]
+
+    def prune(self, horizon: int):
+        """
+        horizon 이전 구간/이벤트 제거
+        """
+        self.covered = [(max(s, horizon), e) for s, e in self.covered if e > horizon]
+        index = bisect_left(self.timestamps, horizon)
+        if index:
+            del self.events[:index]
+            del self.timestamps[:index]
+
+
+_timelines = OrderedDict()
+
+
+def _timeline(key: tuple) -> CharacterTimeline:
+    timeline = _timelines.get(key)
+    if timeline is None:
+        timeline = _timelines[key] = CharacterTimeline()
+        while len(_timelines) > MAX_CACHED_TIMELINES:
+            _timelines.popitem(last=False)
+    else:
+        _timelines.move_to_end(key)
+    return timeline
+
+
+async def fetch_events(character_id: str, codes: tuple, start_date: str, end_date: str,
+                       fetch_range) -> list[TimelineEvent] | None:
+    """
+    타임라인 구간 조회 (startDate/endDate 는 API 형식, endDate 분까지 포함)
+    같은 캐릭터/코드로 이미 받은 구간은 보관한 이벤트로 응답하고 빠진 구간만 fetch_range 로 조회
+    fetch_range: (startDate, endDate) 를 받아 구간 전체 이벤트를 반환하는 비동기 함수 (실패 시 None)
+    반환: 구간 이벤트 (시각 오름차순), 빠진 구간 조회에 실패하면 None (받은 구간은 보관되어 재시도 시 제외)
+    """
+    start = int(from_api(start_date).timestamp())
+    end = int((from_api(end_date) + API_GRANULARITY).timestamp())
+    now = now_kst()
+    # 최근 구간은 이벤트 반영이 늦을 수 있으므로 TIMELINE_SETTLE 이전까지만 "받은 구간"으로 보관 (이후는 매번 조회)
+    settled = int(floor_minute(now - TIMELINE_SETTLE).timestamp())
+    horizon = int(floor_minute(now - TIMELINE_CACHE_RETENTION).timestamp())
+
+    metrics.inc("timeline_cache.requests")
+    timeline = _timeline((character_id, codes))
+    # 동시에 같은 캐릭터 구간을 조회하면 먼저 시작한 조회가 끝난 뒤 그 결과를 사용
+    async with timeline.lock:
+        timeline.prune(horizon)
+        gaps = timeline.gaps(start, end)
+        if not gaps:
+            metrics.inc("timeline_cache.full_hits")
+        uncached = []
+        for gap_start, gap_end in gaps:
+            metrics.inc("timeline_cache.gap_fetches")
+            events = await fetch_range(_to_api(gap_start), _to_api(gap_end - _MINUTE))
+            if events is None:
+                return None
+            # 반영이 끝났고 보관 기간 안인 부분만 보관 (나머지 이벤트는 이번 응답에만 사용)
+            keep_start, keep_end = max(gap_start, horizon), min(gap_end, settled)
+            if keep_start < keep_end:
+                timeline.add(keep_start, keep_end,
+                             [event for event in events if keep_start <= event.timestamp < keep_end])
+                uncached.extend(event for event in events if not keep_start <= event.timestamp < keep_end)
+            else:
+                uncached.extend(events)
+        result = timeline.slice(start, end)
+    if uncached:
+        result = sorted(result + uncached, key=lambda event: event.timestamp)
+    return result
+
+
+def _to_api(timestamp: int) -> str:
+    return to_api(datetime.fromtimestamp(timestamp, KST))
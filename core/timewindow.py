@@ -0,0 +1,131 @@
+from datetime import date, datetime, timedelta, timezone
+
+# 한국은 서머타임이 없으므로 고정 오프셋 사용 (pytz/zoneinfo 혼용 방지)
+KST = timezone(timedelta(hours=9))
+
+API_DATE_FORMAT = "%Y%m%dT%H%M"  # 타임라인 API startDate/endDate 형식 (분 단위)
+API_GRANULARITY = timedelta(minutes=1)
+TIMELINE_MAX_RANGE = timedelta(days=90)  # 타임라인 API 한 번에 조회 가능한 최대 기간
+# 타임라인에 이벤트가 늦게 반영될 수 있는 시간: 이보다 최근 구간은 결과가 아직 바뀔 수 있음
+TIMELINE_SETTLE = timedelta(minutes=10)
+
+GAME_DAY_START_HOUR = 6  # 게임일은 매일 06:00 KST 에 바뀜
+WEEK_START_WEEKDAY = 3  # 주간 초기화: 목요일 (월=0)
+
+
+def now_kst() -> datetime:
+    return datetime.now(KST)
+
+
+def as_kst(dt: datetime) -> datetime:
+    """
+    naive 시각은 KST 로 간주, aware 시각은 KST 로 변환
+    """
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=KST)
+    return dt.astimezone(KST)
+
+
+def to_api(dt: datetime) -> str:
+    return as_kst(dt).strftime(API_DATE_FORMAT)
+
+
+def from_api(value: str) -> datetime:
+    return datetime.strptime(value, API_DATE_FORMAT).replace(tzinfo=KST)
+
+
+def floor_minute(dt: datetime) -> datetime:
+    return as_kst(dt).replace(second=0, microsecond=0)
+
+
+def game_day(dt: datetime) -> date:
+    return (as_kst(dt) - timedelta(hours=GAME_DAY_START_HOUR)).date()
+
+
+def game_day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, GAME_DAY_START_HOUR, tzinfo=KST)
+
+
+def game_day_range(day: date) -> tuple[datetime, datetime]:
+    """
+    게임일 하루의 [시작, 끝) 시각 (06:00 ~ 다음날 06:00)
+    """
+    start = game_day_start(day)
+    return start, start + timedelta(days=1)
+
+
+def next_game_day_start(now: datetime) -> datetime:
+    return game_day_range(game_day(now))[1]
+
+
+class TimeBucket:
+    """
+    [start, end) 분 단위 시각 구간
+    complete: 게임일 하루 전체를 덮고 끝난 뒤 반영 지연(TIMELINE_SETTLE)까지 지난 구간 (결과가 다시 바뀌지 않으므로 캐시 가능)
+    """
+    __slots__ = ("start", "end", "day", "complete")
+
+    def __init__(self, start: datetime, end: datetime, day: date, complete: bool):
+        self.start = start
+        self.end = end
+        self.day = day
+        self.complete = complete
+
+    def __repr__(self):
+        return f"TimeBucket({self.start:%m-%d %H:%M}~{self.end:%m-%d %H:%M}, complete={self.complete})"
+
+    @property
+    def api_range(self) -> tuple[str, str]:
+        """
+        API 조회용 (startDate, endDate) - endDate 는 마지막으로 포함되는 분
+        """
+        return to_api(self.start), to_api(self.end - API_GRANULARITY)
+
+    @property
+    def timestamps(self) -> tuple[int, int]:
+        return int(self.start.timestamp()), int(self.end.timestamp())
+
+
+def split_game_days(start: datetime, end: datetime, now: datetime | None = None) -> list[TimeBucket]:
+    """
+    임의 구간 [start, end) 를 06:00 기준 게임일 경계로 분할 (분 단위로 내림)
+    """
+    start, end = floor_minute(start), floor_minute(end)
+    now = now_kst() if now is None else as_kst(now)
+    buckets = []
+    cursor = start
+    while cursor < end:
+        day = game_day(cursor)
+        day_start, day_end = game_day_range(day)
+        bucket_end = min(day_end, end)
+        complete = cursor == day_start and bucket_end == day_end and day_end + TIMELINE_SETTLE <= now
+        buckets.append(TimeBucket(cursor, bucket_end, day, complete))
+        cursor = bucket_end
+    return buckets
+
+
+def inclusive_end(end: datetime) -> datetime:
+    """
+    "이 분까지 포함" 으로 지정된 끝 시각(예: 05:59:59, 현재 시각)을 [start, end) 의 배타적 끝으로 변환
+    """
+    return floor_minute(end) + API_GRANULARITY
+
+
+def split_api_range(start_date: str, end_date: str,
+                    max_range: timedelta = TIMELINE_MAX_RANGE) -> list[tuple[str, str]]:
+    """
+    API 허용 기간보다 긴 조회 구간을 여러 (startDate, endDate) 로 분할 (양 끝 분 포함 형식 유지)
+    """
+    start, end = from_api(start_date), from_api(end_date)
+    ranges = []
+    while end - start > max_range:
+        chunk_end = start + max_range
+        ranges.append((to_api(start), to_api(chunk_end - API_GRANULARITY)))
+        start = chunk_end
+    ranges.append((to_api(start), to_api(end)))
+    return ranges
+
+
+def default_api_range(days: int = 30) -> tuple[str, str]:
+    now = now_kst()
+    return to_api(now - timedelta(days=days)), to_api(now)
@@ -1,14 +1,27 @@
+import time
+
+BOOT_STARTED = time.perf_counter()
+
 import asyncio
 import os
+import signal
+from functools import partial
 
+from core import db, http_cache, loop_monitor, recorder
+from core.command_sync import sync_if_changed
 from core.dnf_api import preload_item_cache
 from core.logger import logger
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 from core.db import init_db
-from tasks.daily_aggregation import daily_aggregation_task
-from tasks.notify_items import periodic_notify
+from core.storage import get_store
+from core.supervisor import supervisor, SHUTDOWN_DEADLINE
+from tasks.daily_aggregation import daily_aggregation_task, set_event_collector
+from tasks.notify_items import periodic_notify, send_item_announcements
+from tasks.shard_workers import WORKER_SHARDS, ShardCoordinator
+from tasks.refresh_characters import refresh_characters_task
+from tasks import announce_digest, warm_state
 
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
@@ -16,28 +29,95 @@ TOKEN = os.getenv("DISCORD_TOKEN")
 class JongminiBot(commands.Bot):
     def __init__(self):
         super().__init__(command_prefix="!", intents=discord.Intents.default())
+        self.coordinator = None
         logger.info("JongminiBot 인스턴스 생성됨")
 
     async def setup_hook(self):
         logger.info("봇 setup_hook 시작 - DB 초기화 및 명령어 등록")
-        await init_db()
+        # 컨테이너 종료(SIGTERM) 시 진행 중 작업을 정리한 뒤 종료
+        try:
+            self.loop.add_signal_handler(signal.SIGTERM, self._on_sigterm)
+        except (NotImplementedError, RuntimeError):
+            logger.warning("SIGTERM 핸들러 등록 불가 (지원하지 않는 플랫폼)")
+
+        # 이벤트 루프 지연 감시 + 느린 콜백 계측 (LOOP_CALLBACK_TRACE=1, 게이트웨이 하트비트 지연 원인 추적용)
+        loop_monitor.install()
+        supervisor.start("loop_monitor", loop_monitor.monitor_loop_lag)
+
+        logger.info(f"[boot] setup_hook 진입: {time.perf_counter() - BOOT_STARTED:.2f}s")
+
+        self._register_commands()
+        logger.info(f"[boot] 명령어 등록 완료: {time.perf_counter() - BOOT_STARTED:.2f}s")
+
+        # DB 초기화/캐시 적재와 명령어 동기화는 서로 무관하므로 동시에 진행
+        await asyncio.gather(self._init_storage(), sync_if_changed(self.tree))
+        logger.info(f"[boot] setup_hook 완료: {time.perf_counter() - BOOT_STARTED:.2f}s")
+
+    async def _init_storage(self):
+        started = time.perf_counter()
+        await asyncio.gather(init_db(), http_cache.init())
         logger.info("DB 초기화 완료")
-        await preload_item_cache()
+        # API 응답 캐시 연결은 API 를 쓰는 다른 종료 작업이 모두 끝난 뒤 닫힘 (가장 먼저 등록)
+        supervisor.add_shutdown_hook(http_cache.close)
+        # 재배포 전 스냅샷이 유효하면 아이템 인덱스/중복 제거 상태를 그대로 이어받음
+        if not await warm_state.restore_snapshot():
+            await preload_item_cache()
+        # 응답 녹화: 재생에 필요한 초기 상태(로스터/아이템 인덱스/중복 제거)를 첫 프레임으로 기록 (종료 작업 중 늦게 닫힘)
+        if recorder.RECORD_DIR:
+            recorder.start(recorder.RECORD_DIR, {
+                "characters": await db.get_all_characters(),
+                "state": await warm_state.collect_state(),
+            })
+            supervisor.add_shutdown_hook(recorder.close)
+        # 종료 시 저장소 쓰기 버퍼 반영 (스냅샷 저장이 먼저 실행되도록 먼저 등록)
+        supervisor.add_shutdown_hook(get_store().close)
+        supervisor.add_shutdown_hook(warm_state.save_snapshot)
+        # 요약 대기 중인 득템 알림은 연결이 끊기기 전에 전송
+        supervisor.add_shutdown_hook(announce_digest.flush_all)
+        supervisor.start("warm_state", warm_state.periodic_snapshot)
+        logger.info(f"[boot] DB/캐시 준비: {time.perf_counter() - started:.2f}s")
+
+        # 워커 프로세스 모드: 타임라인 조회/집계를 샤드 워커로 분산 (워커는 DB 테이블 생성 이후 시작)
+        if WORKER_SHARDS > 0:
+            self.coordinator = ShardCoordinator(WORKER_SHARDS)
+            self.coordinator.start()
+            set_event_collector(self.coordinator.collect_period_events)
+            supervisor.add_shutdown_hook(self.coordinator.stop)
+            logger.info(f"샤드 워커 {WORKER_SHARDS}개 모드로 실행")
 
+    def _register_commands(self):
         from commands.hello import hello_command
         from commands.register import register_command
+        from commands.bulk_register import bulk_register_command
         from commands.total import total_command
         from commands.set_output_channel import set_output_channel
         from commands.today_status import today_status
+        from commands.leaderboard import weekly_ranking, monthly_ranking
+        from commands.character_history import character_history
+        from commands.my_characters import my_characters
+        from commands.loop_status import loop_status, loop_profile
 
         self.tree.add_command(hello_command)
         self.tree.add_command(register_command)
+        self.tree.add_command(bulk_register_command)
         self.tree.add_command(total_command)
         self.tree.add_command(set_output_channel)
         self.tree.add_command(today_status)
+        self.tree.add_command(weekly_ranking)
+        self.tree.add_command(monthly_ranking)
+        self.tree.add_command(character_history)
+        self.tree.add_command(my_characters)
+        self.tree.add_command(loop_status)
+        self.tree.add_command(loop_profile)
 
-        await self.tree.sync()
-        logger.info(f"슬래시 명령어 동기화 완료: {self.tree.get_commands()}")
+    def _on_sigterm(self):
+        logger.info("SIGTERM 수신 - 종료 처리 시작")
+        self._shutdown_task = self.loop.create_task(self.close())
+
+    async def close(self):
+        # 게이트웨이 연결을 끊기 전에 백그라운드 작업을 정리해 진행 중 전송/DB 기록을 마무리
+        await supervisor.shutdown(SHUTDOWN_DEADLINE)
+        await super().close()
 
 bot = JongminiBot()
 
@@ -48,14 +128,16 @@ async def on_ready():
 
     guild_id = "374494724725145600"  # 실제 서버 ID로 교체하세요
 
-    # 기존 알림 task
-    if not hasattr(bot, 'notify_task') or bot.notify_task.done():
-        bot.notify_task = asyncio.create_task(periodic_notify(bot, guild_id))
-        logger.info("타임라인 아이템 알림 task 시작됨")
-
-    # 신규 일간 집계 task
-    if not hasattr(bot, 'daily_aggregation_task') or bot.daily_aggregation_task.done():
-        bot.daily_aggregation_task = asyncio.create_task(daily_aggregation_task(bot, guild_id))
-        logger.info("일간 모험단 집계 task 시작됨")
+    # 재연결로 on_ready 가 다시 호출되어도 supervisor 가 작업당 하나만 실행
+    # 타임라인 아이템 알림 task (워커 모드에서는 워커가 보낸 알림을 전송)
+    if bot.coordinator is not None:
+        supervisor.start("shard_events", lambda: bot.coordinator.run(partial(send_item_announcements, bot, guild_id)))
+    else:
+        supervisor.start("notify", lambda: periodic_notify(bot, guild_id))
+    # 일간 모험단 집계 task
+    supervisor.start("daily_aggregation", lambda: daily_aggregation_task(bot, guild_id))
+    # 캐릭터 메타데이터 주기 갱신 task
+    supervisor.start("refresh_characters", refresh_characters_task)
 
-bot.run(TOKEN)
+if __name__ == "__main__":
+    bot.run(TOKEN)
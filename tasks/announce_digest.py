@@ -0,0 +1,174 @@
+import asyncio
+import time
+from collections import deque
+
+import discord
+
+from core import metrics
+from core.logger import logger
+from core.models import RARITY_COLORS, RARITY_WEIGHTS
+from core.roster import EMBED_DESCRIPTION_LIMIT, EMBED_TITLE_LIMIT, MESSAGE_EMBED_CHAR_LIMIT, MESSAGE_EMBED_COUNT_LIMIT
+from core.supervisor import supervisor
+
+DIGEST_RATE_WINDOW = 120  # 알림 빈도 측정 구간 (초)
+DIGEST_ENTER_COUNT = 8  # 구간 안 알림이 이보다 많으면 요약 모드로 전환
+DIGEST_EXIT_COUNT = 3  # 구간 안 알림이 이 이하로 줄면 실시간 개별 알림으로 복귀
+DIGEST_INTERVAL = 60  # 요약 모드에서 모아 보내는 간격 (초)
+
+
+def _digest_line(announcement: dict) -> str:
+    return (f"`{announcement['occurred_at'].strftime('%H:%M')}` {announcement['character_name']} - "
+            f"{announcement['item_name']}[{announcement['item_rarity']}]")
+
+
+def build_digest_messages(announcements: list[dict]) -> list[tuple[list[discord.Embed], list[dict]]]:
+    """
+    모아둔 알림을 모험단별 요약 Embed 로 만들고 메시지 제한(Embed 10개, 총 6000자) 단위로 묶음
+    반환: [(메시지의 Embed 목록, 메시지에 담긴 알림 목록), ...]
+    """
+    by_adventure = {}
+    for announcement in sorted(announcements, key=lambda a: a["occurred_at"]):
+        by_adventure.setdefault(announcement["adventure_name"], []).append(announcement)
+
+    embeds = []
+    for adventure_name, items in by_adventure.items():
+        top_rarity = max((a["item_rarity"] for a in items), key=lambda r: RARITY_WEIGHTS.get(r, 0))
+        title = f"📦 {adventure_name} 모험단 득템 요약 ({len(items)}건)"[:EMBED_TITLE_LIMIT]
+        color = RARITY_COLORS.get(top_rarity, 0)
+        chunk, lines, length = [], [], 0
+        for announcement in items:
+            line = _digest_line(announcement)
+            if lines and length + len(line) + 1 > EMBED_DESCRIPTION_LIMIT:
+                embeds.append((discord.Embed(title=title, description="\n".join(lines), color=color), chunk))
+                chunk, lines, length = [], [], 0
+            chunk.append(announcement)
+            lines.append(line)
+            length += len(line) + 1
+        embeds.append((discord.Embed(title=title, description="\n".join(lines), color=color), chunk))
+
+    messages = []
+    current, contained, current_length = [], [], 0
+    for embed, chunk in embeds:
+        embed_length = len(embed.title) + len(embed.description)
+        if current and (len(current) >= MESSAGE_EMBED_COUNT_LIMIT
+                        or current_length + embed_length > MESSAGE_EMBED_CHAR_LIMIT):
+            messages.append((current, contained))
+            current, contained, current_length = [], [], 0
+        current.append(embed)
+        contained.extend(chunk)
+        current_length += embed_length
+    if current:
+        messages.append((current, contained))
+    return messages
+
+
+class ChannelDigest:
+    """
+    출력 채널 하나의 알림 전송 모드 관리
+    - 평소에는 알림마다 바로 개별 전송
+    - 최근 DIGEST_RATE_WINDOW 초 동안 알림이 DIGEST_ENTER_COUNT 건을 넘으면 요약 모드로 전환해
+      DIGEST_INTERVAL 마다 모험단별 요약 Embed 로 모아 전송 (디스코드 전송 횟수 상한 유지)
+    - 빈도가 DIGEST_EXIT_COUNT 이하로 내려가면 남은 알림을 보내고 개별 전송으로 복귀
+    """
+
+    def __init__(self, channel, send_single, clock=time.monotonic, sleep=supervisor.sleep):
+        self.channel = channel
+        self.send_single = send_single
+        self.clock = clock
+        self.sleep = sleep
+        self.recent = deque()
+        self.pending = []
+        self.digest_mode = False
+        self._task = None
+
+    def rate(self) -> int:
+        cutoff = self.clock() - DIGEST_RATE_WINDOW
+        while self.recent and self.recent[0] < cutoff:
+            self.recent.popleft()
+        return len(self.recent)
+
+    async def submit(self, announcements: list[dict]):
+        now = self.clock()
+        self.recent.extend(now for _ in announcements)
+        if not self.digest_mode and self.rate() > DIGEST_ENTER_COUNT:
+            self.digest_mode = True
+            metrics.inc("digest.entered")
+            logger.info(f"[digest] 채널 {self.channel.id}: 최근 {DIGEST_RATE_WINDOW}초 알림 {self.rate()}건 - 요약 모드 전환")
+
+        if self.digest_mode:
+            self.pending.extend(announcements)
+            metrics.inc("digest.buffered", len(announcements))
+            if self._task is None or self._task.done():
+                self._task = asyncio.create_task(self._run())
+            return
+
+        for announcement in announcements:
+            await self.send_single(self.channel, announcement)
+            metrics.inc("digest.single_sent")
+
+    async def _run(self):
+        while True:
+            stopped = await self.sleep(DIGEST_INTERVAL)
+            await self.flush()
+            if stopped:
+                return
+            if self.rate() <= DIGEST_EXIT_COUNT:
+                self.digest_mode = False
+                # 마지막 요약 전송 중에 들어온 알림까지 보낸 뒤 개별 전송으로 복귀
+                await self.flush()
+                if self.pending:
+                    # 전송 실패로 남은 알림이 있으면 요약 모드를 유지해 다음 간격에 재시도
+                    self.digest_mode = True
+                    continue
+                logger.info(f"[digest] 채널 {self.channel.id}: 알림 빈도 감소 - 실시간 알림 복귀")
+                return
+
+    def _requeue(self, messages: list) -> list[dict]:
+        unsent = [announcement for _, contained in messages for announcement in contained]
+        self.pending[:0] = unsent
+        return unsent
+
+    async def flush(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        messages = build_digest_messages(batch)
+        for i, (embeds, _) in enumerate(messages):
+            try:
+                await self.channel.send(embeds=embeds)
+            except asyncio.CancelledError:
+                # 종료 중 취소되어도 보내지 못한 알림은 버퍼에 남김 (flush_all 이 다시 시도)
+                self._requeue(messages[i:])
+                raise
+            except Exception as e:
+                # 보내지 못한 요약의 알림은 다시 버퍼에 넣어 다음 요약 때 재시도 (유실 방지)
+                unsent = self._requeue(messages[i:])
+                metrics.inc("digest.send_errors")
+                logger.error(f"[digest] 채널 {self.channel.id} 요약 전송 실패 ({len(unsent)}건 재시도 예정): {e}")
+                return
+            metrics.inc("digest.messages_sent")
+        metrics.inc("digest.flushed", len(batch))
+        logger.info(f"[digest] 채널 {self.channel.id}: 알림 {len(batch)}건을 요약 메시지 {len(messages)}개로 전송")
+
+
+_digests = {}
+
+
+async def submit_announcements(channel, announcements: list[dict], send_single):
+    """
+    채널별 전송 모드에 따라 개별 전송하거나 요약 버퍼에 추가
+    send_single: (channel, announcement) 를 받아 개별 알림 1건을 보내는 비동기 함수
+    """
+    digest = _digests.get(channel.id)
+    if digest is None:
+        digest = _digests[channel.id] = ChannelDigest(channel, send_single)
+    digest.channel = channel
+    await digest.submit(announcements)
+
+
+async def flush_all():
+    """
+    종료 훅: 요약 대기 중인 알림을 모두 전송
+    """
+    for digest in _digests.values():
+        await digest.flush()
@@ -1,8 +1,9 @@
 import asyncio
-from datetime import datetime, timedelta, timezone
-from collections import defaultdict
+from collections import OrderedDict
+from datetime import datetime, timedelta
 
-from core import dnf_api
+from core import db, dnf_api, lanes, metrics, recorder
+from core.events import AGGREGATION_EVENT_FILTER
 from core.db import (
     get_all_characters_grouped_by_adventure,
     get_output_channel,
@@ -10,174 +11,278 @@ from core.db import (
     update_last_aggregation_time
 )
 from core.logger import logger
+from core.rollup import record_timeline_items
+from core.sharding import owns_character
+from core.supervisor import supervisor
+from core.timewindow import from_api, game_day, game_day_start, inclusive_end, next_game_day_start, now_kst, \
+    split_game_days, to_api
 import discord
 
-from core.models import RARITY_WEIGHTS
-
-KST = timezone(timedelta(hours=9))
+from core.stats import EventColumns, leaderboard
 
 MAX_RETRY_DURATION = 7 * 60 * 60  # 7시간
+INTERACTIVE_RETRY_DURATION = 2 * 60  # 명령어(/오늘현황) 집계의 캐릭터별 재시도 최대 시간 (초)
 RETRY_INTERVAL = 60  # 1분
+# 타임라인 브레이커가 이 시간(초) 넘게 닫히지 않으면(API 장애 지속) 재시도 기한과 관계없이 캐릭터 실패 처리
+BREAKER_OUTAGE_BUDGET = 15 * 60
 CONCURRENT_REQUEST_LIMIT = 10  # 동시 캐릭터 처리 제한
 MAX_ITEM_CONCURRENT = 20  # 아이템 레벨 조회 동시 제한
+MAX_RANK_FIELDS = 25  # 디스코드 Embed 필드 최대 개수
+MAX_CACHED_DAYS = 8  # 완료된 게임일 집계 결과 보관 개수
+SCHEDULE_SLACK_SECONDS = 1  # 06:00 정기 집계 대기 여유 (초)
 
 
-async def fetch_character_timeline_all_with_long_retry(server_id, character_id, start_date, end_date):
+async def fetch_character_timeline_all_with_long_retry(server_id, character_id, start_date, end_date, semaphore,
+                                                       retry_duration=MAX_RETRY_DURATION):
+    """
+    retry_duration: 이 시간(초)이 지나도 받지 못하면 실패 처리
+    semaphore 는 실제 API 호출 동안에만 점유 (재시도 대기/브레이커 열림 대기 중에는 다른 캐릭터가 사용)
+    브레이커가 BREAKER_OUTAGE_BUDGET 넘게 닫히지 않으면 바로 실패 처리 (장애 동안 정기 집계를 몇 시간씩 붙잡지 않도록)
+    """
     start_time = datetime.now().timestamp()
+    breaker = dnf_api.BREAKERS["timeline"]
+    outage_since = None
     while True:
-        try:
-            result = await dnf_api.fetch_timeline_with_pagination(server_id, character_id, start_date, end_date)
-            if result is not None:
-                return result
-            logger.warning(f"[{character_id}] API null 응답, 재시도 중...")
-        except Exception as e:
-            logger.warning(f"[{character_id}] API 호출 예외: {e}, 재시도 중...")
-
-        if datetime.now().timestamp() - start_time > MAX_RETRY_DURATION:
-            logger.error(f"[{character_id}] 최대 재시도 시간 초과, 실패 처리")
+        if breaker.state == breaker.CLOSED:
+            outage_since = None
+        elif outage_since is None:
+            outage_since = datetime.now().timestamp()
+        elif datetime.now().timestamp() - outage_since > BREAKER_OUTAGE_BUDGET:
+            logger.error(f"[{character_id}] 타임라인 API 장애 지속 (브레이커 {BREAKER_OUTAGE_BUDGET}초 이상 열림), 실패 처리")
+            metrics.inc("aggregation.breaker_failures")
             return None
 
-        await asyncio.sleep(RETRY_INTERVAL)
-
-
-async def filter_items_level_115(items):
-    semaphore = asyncio.Semaphore(MAX_ITEM_CONCURRENT)
-
-    async def check_item_level(item):
-        item_id = item.get("data", {}).get("itemId")
-        if not item_id:
+        if breaker.is_open:
+            # 브레이커가 열려 있으면 요청 없이 다시 닫힐 수 있는 시점까지 대기
+            wait = max(breaker.retry_after(), 1)
+        else:
+            try:
+                async with semaphore:
+                    result = await dnf_api.fetch_timeline_with_pagination(
+                        server_id, character_id, start_date, end_date, event_filter=AGGREGATION_EVENT_FILTER
+                    )
+                if result is not None:
+                    return result
+                logger.warning(f"[{character_id}] API null 응답, 재시도 중...")
+            except Exception as e:
+                logger.warning(f"[{character_id}] API 호출 예외: {e}, 재시도 중...")
+            wait = RETRY_INTERVAL
+
+        if datetime.now().timestamp() - start_time > retry_duration:
+            logger.error(f"[{character_id}] 최대 재시도 시간 초과, 실패 처리")
             return None
-        try:
-            async with semaphore:
-                level = await dnf_api.fetch_item_detail(item_id)
-                if level == 115:
-                    return item
-        except Exception as e:
-            logger.warning(f"Failed to fetch item detail for item_id {item_id}: {e}")
-        return None
 
-    results = await asyncio.gather(*(check_item_level(item) for item in items))
-    return [item for item in results if item is not None]
+        if await supervisor.sleep(wait):
+            logger.info(f"[{character_id}] 종료 요청으로 재시도 중단")
+            return None
 
 
-async def process_character(char, adventure_name, start_date_str, end_date_str, adventure_item_counts, semaphore):
+async def process_character(char, adventure_name, start_date_str, end_date_str, events, semaphore, retry_duration):
     server_id = char["server_id"]
     character_id = char["character_id"]
+    timeline_events = await fetch_character_timeline_all_with_long_retry(
+        server_id, character_id, start_date_str, end_date_str, semaphore, retry_duration
+    )
+    if timeline_events is None:
+        logger.warning(f"{char['character_name']} 타임라인 조회 실패")
+        return False
     async with semaphore:
-        timeline_data = await fetch_character_timeline_all_with_long_retry(
-            server_id, character_id, start_date_str, end_date_str
+        filtered_events = await dnf_api.filter_by_item_level(
+            timeline_events, AGGREGATION_EVENT_FILTER, MAX_ITEM_CONCURRENT
         )
-        if not timeline_data:
-            logger.warning(f"{char['character_name']} 타임라인 조회 실패")
-            return
-        rows = timeline_data.get("timeline", {}).get("rows", [])
-        filtered_rows = await filter_items_level_115(rows)
-        for item in filtered_rows:
-            rarity = item.get("data", {}).get("itemRarity")
-            if rarity in RARITY_WEIGHTS:
-                adventure_item_counts[adventure_name][rarity] += 1
-
-
-def format_rank_embed(rank_list, timestamp):
+    await record_timeline_items(char, filtered_events)
+    for event in filtered_events:
+        events.append(character_id, adventure_name, event.item_rarity, event.timestamp)
+    return True
+
+
+def format_rank_change(rank_change):
+    if rank_change is None:
+        return " 🆕"
+    if rank_change > 0:
+        return f" ▲{rank_change}"
+    if rank_change < 0:
+        return f" ▼{-rank_change}"
+    return " -"
+
+
+def format_rank_embed(rank_list, timestamp, title="모험단 일간 아이템 획득량 순위", description=None):
     embed = discord.Embed(
-        title="모험단 일간 아이템 획득량 순위",
-        description=f"기준 시각: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
+        title=title,
+        description=description or f"기준 시각: {timestamp.strftime('%Y-%m-%d %H:%M:%S')}",
         color=0x00ff00
     )
-    for i, entry in enumerate(rank_list, start=1):
+    for i, entry in enumerate(rank_list[:MAX_RANK_FIELDS], start=1):
         counts = entry["counts"]
         line = (f"점수: {entry['score']} "
                 f"(태초:{counts.get('태초', 0)}, 에픽:{counts.get('에픽', 0)}, 레전더리:{counts.get('레전더리', 0)})")
-        embed.add_field(name=f"{i}위 {entry['adventure_name']}", value=line, inline=False)
+        name = f"{entry.get('rank', i)}위 {entry['adventure_name']}"
+        if "rank_change" in entry:
+            name += format_rank_change(entry["rank_change"])
+        embed.add_field(name=name, value=line, inline=False)
     return embed
 
 
-async def aggregate_items_and_notify_for_period(bot, guild_id, start_time, end_time, base_time=None):
+async def collect_period_events(start_date_str, end_date_str, shard=None,
+                                retry_duration=MAX_RETRY_DURATION) -> EventColumns:
     """
-    기간(start_time~end_time) 동안 아이템 집계 및 Discord 알림
-    base_time: embed 표시 기준 시각 (지정 없으면 현재 시각)
+    기간 내 115레벨 아이템 획득 이벤트 수집
+    shard: (샤드 번호, 샤드 수) - 지정 시 해당 샤드가 담당하는 캐릭터만 처리
+    retry_duration: 캐릭터별 재시도 최대 시간 (초)
     """
-    if base_time is None:
-        base_time = datetime.now(KST)
-
-    start_date_str = start_time.strftime("%Y%m%dT%H%M")
-    end_date_str = end_time.strftime("%Y%m%dT%H%M")
-
     grouped = await get_all_characters_grouped_by_adventure()
-    if not grouped:
-        logger.info("DB에 등록된 캐릭터가 없습니다.")
-        return
-
-    adventure_item_counts = defaultdict(lambda: defaultdict(int))
+    events = EventColumns()
     semaphore = asyncio.Semaphore(CONCURRENT_REQUEST_LIMIT)
 
     tasks = [
-        process_character(char, adventure_name, start_date_str, end_date_str, adventure_item_counts, semaphore)
+        process_character(char, adventure_name, start_date_str, end_date_str, events, semaphore, retry_duration)
         for adventure_name, characters in grouped.items()
         for char in characters
+        if shard is None or owns_character(shard, char["character_id"])
     ]
-    await asyncio.gather(*tasks)
+    results = await asyncio.gather(*tasks)
+    events.failed = results.count(False)
+    return events
+
 
-    adventure_scores = []
-    for adventure_name, counts in adventure_item_counts.items():
-        score = sum(RARITY_WEIGHTS.get(r, 0) * c for r, c in counts.items())
-        adventure_scores.append({
-            "adventure_name": adventure_name,
-            "score": score,
-            "counts": counts
-        })
+# 이벤트 수집 함수 (워커 프로세스 모드에서는 샤드 워커로 분산 수집하는 함수로 교체)
+_event_collector = collect_period_events
 
-    adventure_scores.sort(key=lambda x: x["score"], reverse=True)
+
+def set_event_collector(collector):
+    global _event_collector
+    _event_collector = collector
+
+
+# 완료된 게임일 버킷의 수집 결과: (게임일, 로스터 버전) -> records
+# 끝난 하루는 결과가 바뀌지 않으므로 /오늘현황 등 겹치는 기간 집계 시 다시 조회하지 않음
+_completed_day_events = OrderedDict()
+
+
+async def collect_bucketed_events(start_time, end_time, retry_duration=MAX_RETRY_DURATION) -> EventColumns:
+    """
+    [start_time, end_time) 을 06:00 기준 게임일 버킷으로 나눠 수집
+    이미 끝난 게임일 버킷은 한 번 수집한 결과를 재사용 (로스터가 바뀌면 다시 수집)
+    """
+    events = EventColumns()
+    for bucket in split_game_days(start_time, end_time):
+        key = (bucket.day, db.ROSTER_VERSION)
+        records = _completed_day_events.get(key) if bucket.complete else None
+        if records is not None:
+            _completed_day_events.move_to_end(key)
+            metrics.inc("aggregation.day_cache_hits")
+        else:
+            partial = await _event_collector(*bucket.api_range, retry_duration=retry_duration)
+            events.failed += partial.failed
+            records = partial.records()
+            # 일부 캐릭터 조회에 실패했거나 종료 중 중단된 결과는 캐시하지 않음
+            if bucket.complete and not partial.failed and not supervisor.stopping.is_set():
+                _completed_day_events[key] = records
+                while len(_completed_day_events) > MAX_CACHED_DAYS:
+                    _completed_day_events.popitem(last=False)
+        for character_key, adventure_key, rarity, timestamp in records:
+            events.append(character_key, adventure_key, rarity, timestamp)
+        if supervisor.stopping.is_set():
+            break
+    return events
+
+
+async def aggregate_items_and_notify_for_period(bot, guild_id, start_time, end_time, base_time=None,
+                                                retry_duration=MAX_RETRY_DURATION) -> bool:
+    """
+    기간(start_time~end_time) 동안 아이템 집계 및 Discord 알림
+    base_time: embed 표시 기준 시각 (지정 없으면 현재 시각)
+    retry_duration: 캐릭터별 재시도 최대 시간 (초) - 명령어에서 호출할 때는 INTERACTIVE_RETRY_DURATION
+    end_time 은 해당 분까지 포함 (API 조회 범위가 분 단위)
+    반환: 순위 Embed 를 전송했는지 여부
+    """
+    if base_time is None:
+        base_time = now_kst()
+    requested_end = end_time
+
+    # API 조회 범위는 분 단위이므로 마지막 분까지 포함
+    end_time = inclusive_end(end_time)
+
+    grouped = await get_all_characters_grouped_by_adventure()
+    if not grouped:
+        logger.info("DB에 등록된 캐릭터가 없습니다.")
+        return False
+
+    # 명령어(/오늘현황)에서 호출해도 대량 수집은 batch 레인으로 (명령 응답 경로 자원을 잠식하지 않도록)
+    with lanes.use(lanes.BATCH):
+        events = await collect_bucketed_events(start_time, end_time, retry_duration)
+    # 응답 녹화 중이면 수집이 끝난 지점을 표시 (재생 시 같은 기간으로 다시 집계)
+    recorder.mark("aggregate", start=start_time.isoformat(), end=requested_end.isoformat(),
+                  base=base_time.isoformat())
+    if supervisor.stopping.is_set():
+        logger.info("종료 요청으로 집계 결과 전송을 건너뜁니다.")
+        return False
+
+    start_ts = int(start_time.timestamp())
+    end_ts = int(end_time.timestamp())
+    adventure_scores = leaderboard(events, start_ts, end_ts)
 
     channel_id = await get_output_channel(guild_id)
     if not channel_id:
         logger.warning(f"길드 {guild_id}에 등록된 출력 채널이 없습니다.")
-        return
+        return False
     channel = bot.get_channel(int(channel_id))
     if not channel:
         logger.warning(f"채널 {channel_id}을 찾을 수 없습니다.")
-        return
-
-    embed = format_rank_embed(adventure_scores, base_time)
+        return False
+
+    description = None
+    if events.failed:
+        # 조회에 실패한 캐릭터는 순위에서 빠지므로 결과와 함께 알림
+        description = (f"기준 시각: {base_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+                       f"⚠️ 타임라인 조회 실패 {events.failed}건은 집계에서 제외되었습니다.")
+    embed = format_rank_embed(adventure_scores, base_time, description=description)
     await channel.send(embed=embed)
     logger.info("모험단 아이템 획득량 순위 Discord에 전송 완료")
+    return True
 
 
 async def aggregate_daily_items_and_notify(bot, guild_id):
     """
     6시 정기 집계용 (전날 6시 ~ 오늘 5시 59분 59초)
     """
-    now = datetime.now(KST)
-    today_6am = now.replace(hour=6, minute=0, second=0, microsecond=0)
+    now = now_kst()
+    today_6am = game_day_start(game_day(now))
     start_time = today_6am - timedelta(days=1)
     end_time = today_6am - timedelta(seconds=1)
     await aggregate_items_and_notify_for_period(bot, guild_id, start_time, end_time, base_time=end_time)
+    if supervisor.stopping.is_set():
+        # 중단된 집계는 기록하지 않아 다음 부팅 시 다시 실행되도록 함
+        return
 
     # 6시 집계 결과만 DB에 기록
-    await update_last_aggregation_time(now.strftime("%Y%m%dT%H%M"))
+    await update_last_aggregation_time(to_api(now))
 
 
-async def wait_until_next_6am():
-    now = datetime.now(KST)
-    next_6am = now.replace(hour=6, minute=0, second=0, microsecond=0)
-    if now >= next_6am:
-        next_6am += timedelta(days=1)
-    wait_seconds = (next_6am - now).total_seconds()
+async def wait_until_next_6am() -> bool:
+    """
+    다음 6시까지 대기 (종료 요청으로 깨어나면 True 반환)
+    """
+    now = now_kst()
+    next_6am = next_game_day_start(now)
+    # 타이머가 경계 직전에 깨어나 이전 게임일을 다시 집계하지 않도록 약간 늦게 깨어남
+    wait_seconds = (next_6am - now).total_seconds() + SCHEDULE_SLACK_SECONDS
     logger.info(f"다음 6시까지 대기: {wait_seconds}초")
-    await asyncio.sleep(wait_seconds)
+    return await supervisor.sleep(wait_seconds)
 
 
 async def daily_aggregation_task(bot, guild_id):
     """
     6시 정기 집계 주기 작업
     """
-    while True:
+    lanes.assign(lanes.BATCH)
+    while not supervisor.stopping.is_set():
         last_agg_time_str = await get_last_aggregation_time()
-        now = datetime.now(KST)
-        today_6am = now.replace(hour=6, minute=0, second=0, microsecond=0)
+        now = now_kst()
+        today_6am = game_day_start(game_day(now))
 
         if last_agg_time_str:
-            last_agg_time = datetime.strptime(last_agg_time_str, "%Y%m%dT%H%M").replace(tzinfo=KST)
+            last_agg_time = from_api(last_agg_time_str)
         else:
             last_agg_time = None
 
@@ -186,6 +291,7 @@ async def daily_aggregation_task(bot, guild_id):
             logger.info("봇 부팅 후 최초 집계 또는 미실행 집계 감지, 즉시 실행")
             await aggregate_daily_items_and_notify(bot, guild_id)
 
-        await wait_until_next_6am()
+        if await wait_until_next_6am():
+            break
         logger.info("6시 정각 집계 작업 실행")
         await aggregate_daily_items_and_notify(bot, guild_id)
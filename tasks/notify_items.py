@@ -1,48 +1,105 @@
 import asyncio
-from datetime import datetime, timedelta, timezone
-from datetime import datetime as dt
+from collections import Counter
+from datetime import datetime, timedelta
+from io import BytesIO
 
 import aiohttp
 import discord
 
+from core import assets
 from core import dnf_api
+from core import lanes
+from core import metrics
+from core import recorder
+from core.events import AGGREGATION_EVENT_FILTER, NOTIFY_EVENT_FILTER, TimelineEvent
+from core.models import RARITY_COLORS
 from core.db import (
     get_all_characters_grouped_by_adventure,
-    get_last_checked, update_last_checked,
     get_output_channel
 )
 
 from core.logger import logger
-from core.models import ALLOWED_RARITIES  # 서버명 매핑용
+from core.poll_scheduler import PollScheduler
+from core.rollup import record_timeline_items
+from core.sharding import owns_character
+from core.storage import get_store
+from core.supervisor import supervisor
+from tasks import announce_digest
+from core.timewindow import from_api, now_kst, to_api
 
 DEFAULT_PERIOD_MINUTES = 2
 DEFAULT_LOOKBACK_MINUTES = 30  # 기록 없으면 최근 30분간 조회
-KST = timezone(timedelta(hours=9))
+MAX_CATCHUP_HOURS = 24  # 조회 실패로 밀린 구간은 최대 24시간까지만 따라잡음
+SEED_SPREAD_CYCLES = 5  # 일괄 등록된 캐릭터의 첫 조회를 나눠 시작할 주기 수
 
 # 전역 캐시: 캐릭터ID별로 마지막 처리 시점(datetime 객체) 저장
 last_processed_time = {}
+# 캐릭터ID -> 마지막 처리 시점(분)에 이미 알린 이벤트 (코드, 아이템ID) 개수
+last_processed_keys = {}
 last_processed_lock = asyncio.Lock()
 
-def parse_event_date(item):
-    try:
-        return dt.strptime(item.get("date", ""), "%Y-%m-%d %H:%M")
-    except ValueError:
-        return None
+# 일괄 등록된 캐릭터ID -> 첫 조회 허용 시각 (한 주기에 몰리지 않도록 분산)
+poll_not_before = {}
+
+
+def seed_new_characters(character_ids: list[str], spread_seconds: float | None = None):
+    """
+    새로 등록된 캐릭터들의 첫 타임라인 조회 시작 시각을 spread_seconds 구간에 고르게 분산
+    """
+    if not character_ids:
+        return
+    if spread_seconds is None:
+        spread_seconds = DEFAULT_PERIOD_MINUTES * 60 * SEED_SPREAD_CYCLES
+    now = now_kst()
+    step = spread_seconds / len(character_ids)
+    for i, character_id in enumerate(character_ids):
+        poll_not_before[character_id] = now + timedelta(seconds=i * step)
+    logger.info(f"신규 캐릭터 {len(character_ids)}개 첫 조회를 {spread_seconds:.0f}초에 걸쳐 분산")
+
+
+def event_key(event: TimelineEvent) -> tuple:
+    return event.code, event.item_id
+
+
+def select_new_events(events: list[TimelineEvent], last_time: datetime | None,
+                      seen_at_last: Counter | None) -> tuple[list[TimelineEvent], datetime | None, Counter]:
+    """
+    이전 조회에서 처리한 이벤트를 제외한 새 이벤트 선택
+    API 시각은 분 단위이고 다음 조회는 마지막 조회 분부터 다시 시작하므로,
+    마지막 처리 분의 이벤트는 시각만으로 비교하지 않고 (코드, 아이템ID) 별 개수로 비교해 그 분에 늦게 들어온 이벤트도 통과
+    반환: (새 이벤트, 처리한 가장 최신 시각, 그 시각에 처리한 이벤트 키 개수)
+    """
+    remaining = Counter(seen_at_last or ())
+    new_events = []
+    for event in events:
+        if last_time is not None:
+            if event.occurred_at < last_time:
+                continue
+            if event.occurred_at == last_time and remaining[event_key(event)] > 0:
+                remaining[event_key(event)] -= 1
+                continue
+        new_events.append(event)
+
+    max_time = last_time
+    for event in new_events:
+        if max_time is None or event.occurred_at > max_time:
+            max_time = event.occurred_at
+    seen_at_max = Counter(seen_at_last or ()) if max_time == last_time else Counter()
+    seen_at_max.update(event_key(event) for event in new_events if event.occurred_at == max_time)
+    return new_events, max_time, seen_at_max
+
 
 def get_rarity_color(rarity: str) -> int:
     # 등급별 16진수 색상을 int로 반환
-    mapping = {
-        "레전더리": 0xFF7800,  # 주황
-        "에픽": 0xFFB400,  # 노란
-        "태초": 0x58d3dc  # 청록
-    }
-    return mapping.get(rarity, 0x000000)  # 기본 검정
+    return RARITY_COLORS.get(rarity, 0x000000)  # 기본 검정
 
 
-def format_item_announce_embed(adventure_name, character_name, item_name, item_rarity, event_date):
-    import datetime
-    dtstrp = datetime.datetime.strptime(event_date, "%Y-%m-%d %H:%M")
-    date_str = dtstrp.strftime("%Y.%m.%d(%H:%M)")
+def format_item_announce_embed(adventure_name, character_name, item_name, item_rarity, occurred_at: datetime,
+                               item_icon_file: str | None = None, character_image_file: str | None = None):
+    """
+    item_icon_file / character_image_file: 함께 첨부하는 이미지 파일명 (없으면 텍스트만)
+    """
+    date_str = occurred_at.strftime("%Y.%m.%d(%H:%M)")
 
     color = get_rarity_color(item_rarity)
 
@@ -50,100 +107,129 @@ def format_item_announce_embed(adventure_name, character_name, item_name, item_r
         description=f"{adventure_name} 모험단의 {character_name} 모험가가 {item_name}[{item_rarity}](을)를 획득했습니다.",
         color=color
     )
+    if character_image_file:
+        embed.set_author(name=character_name, icon_url=f"attachment://{character_image_file}")
+    if item_icon_file:
+        embed.set_thumbnail(url=f"attachment://{item_icon_file}")
     embed.set_footer(text=date_str)
     return embed
 
 
-async def filter_valid_items(timeline_rows):
-    valid_items = []
-    for row in timeline_rows:
-        item_id = row.get("data", {}).get("itemId")
-        if not item_id:
-            continue
-        equip_level = await dnf_api.fetch_item_detail(item_id)
-        if equip_level == 115:
-            valid_items.append(row)
-    return valid_items
+def build_item_announcement(char, event: TimelineEvent) -> dict:
+    return {
+        "adventure_name": char.get('adventure_name', '모험단명 없음'),
+        "character_name": char['character_name'],
+        "item_name": event.item_name or "알 수 없음",
+        "item_rarity": event.item_rarity or "알 수 없음",
+        "occurred_at": event.occurred_at,
+        # 이미지 첨부용 식별자
+        "item_id": event.item_id,
+        "server_id": char['server_id'],
+        "character_id": char['character_id'],
+    }
+
+
+async def send_item_announcements(bot, guild_id, announcements: list[dict]) -> bool:
+    """
+    출력 채널에 득템 알림 전송 (출력 채널이 없으면 False)
+    """
+    channel_id = await get_output_channel(guild_id)
+    if not channel_id:
+        logger.warning(f"길드 {guild_id}에 등록된 출력 채널이 없습니다.")
+        return False
+    channel = bot.get_channel(int(channel_id))
+    if not channel:
+        logger.warning(f"채널 {channel_id}을 찾을 수 없습니다.")
+        return False
+
+    # 알림이 몰리는 동안에는 채널별로 모험단 요약으로 모아 전송 (평소에는 개별 전송)
+    await announce_digest.submit_announcements(channel, announcements, send_single_announcement)
+    return True
+
+
+async def send_single_announcement(channel, announcement: dict):
+    # 프리페치된 로컬 이미지를 첨부 (준비되지 않았으면 텍스트만 전송)
+    item_icon, character_image = await assets.get_announcement_assets(announcement)
+    files = []
+    if item_icon is not None:
+        files.append(discord.File(BytesIO(item_icon), filename="item.png"))
+    if character_image is not None:
+        files.append(discord.File(BytesIO(character_image), filename="character.png"))
+    embed = format_item_announce_embed(
+        announcement["adventure_name"],
+        announcement["character_name"],
+        announcement["item_name"],
+        announcement["item_rarity"],
+        announcement["occurred_at"],
+        item_icon_file="item.png" if item_icon is not None else None,
+        character_image_file="character.png" if character_image is not None else None,
+    )
+    await channel.send(embed=embed, files=files)
 
 
-async def notify_items_for_character(char, bot, guild_id):
+async def notify_items_for_character(char, bot, guild_id, publish=None):
+    """
+    publish: 알림 목록을 받는 비동기 함수 (지정하지 않으면 bot 으로 직접 전송)
+    """
     character_id = char['character_id']
     server_id = char['server_id']
     character_name = char['character_name']
-    adventure_name = char.get('adventure_name', '모험단명 없음')
 
-    last_checked = await get_last_checked(character_id)
-    now = datetime.now(KST)
-    end_date = now.strftime("%Y%m%dT%H%M")
+    last_checked = await get_store().get_last_checked(character_id)
+    now = now_kst()
+    end_date = to_api(now)
 
     if last_checked:
-        start_time = datetime.strptime(last_checked, "%Y%m%dT%H%M")
-        start_date = start_time.strftime("%Y%m%dT%H%M")
+        start_time = max(from_api(last_checked), now - timedelta(hours=MAX_CATCHUP_HOURS))
     else:
-        lookback = now - timedelta(minutes=DEFAULT_LOOKBACK_MINUTES)
-        start_date = lookback.strftime("%Y%m%dT%H%M")
-
-    timeline = await dnf_api.fetch_timeline(server_id, character_id, start_date=start_date, end_date=end_date)
-    if timeline is None or "timeline" not in timeline or "rows" not in timeline["timeline"]:
+        start_time = now - timedelta(minutes=DEFAULT_LOOKBACK_MINUTES)
+    start_date = to_api(start_time)
+
+    # 집계 대상 등급(레전더리 포함)으로 받아 이벤트 저장소/롤업에 바로 반영하고, 알림은 알림 대상 등급만
+    # (레전더리를 빼고 받으면 오늘 분 주간/월간 순위와 /내캐릭터 가 06:00 집계 전까지 레전더리 0 으로 보임)
+    events = await dnf_api.fetch_timeline(server_id, character_id, start_date=start_date, end_date=end_date,
+                                          event_filter=AGGREGATION_EVENT_FILTER)
+    if events is None:
+        # 체크 시각을 갱신하지 않아 다음 주기에 같은 구간을 다시 조회 (장애 중 득템 누락 방지)
         logger.warning(f"[{character_name}] 타임라인 데이터를 받아오지 못했습니다.")
-        await update_last_checked(character_id, end_date)
         return
 
-    rows = timeline["timeline"]["rows"]
-    filtered_items = await filter_valid_items(rows)
-
-    # 레전더리 아이템 제외 필터링
-    filtered_items = [
-        item for item in filtered_items
-        if item.get("data", {}).get("itemRarity") in ALLOWED_RARITIES
-    ]
+    recorded_items = await dnf_api.filter_by_item_level(events, AGGREGATION_EVENT_FILTER)
+    # 이벤트 저장소에는 구간 전체를 기록 (분 단위 건수를 큰 값으로 유지하므로 경계 분을 다시 봐도 중복 없음)
+    await record_timeline_items(char, recorded_items)
+    filtered_items = [event for event in recorded_items if NOTIFY_EVENT_FILTER.accepts_event(event)]
 
     # 이전 처리 시점 락을 걸고 읽기
     async with last_processed_lock:
         last_time = last_processed_time.get(character_id)
+        seen_at_last = last_processed_keys.get(character_id)
 
-    new_filtered_items = []
-    max_event_time = last_time  # 이번에 처리한 가장 최신 시간 추적
-
-    for item in filtered_items:
-        event_dt = parse_event_date(item)
-        if event_dt is None:
-            continue
-        if (last_time is None) or (event_dt > last_time):
-            new_filtered_items.append(item)
-            if (max_event_time is None) or (event_dt > max_event_time):
-                max_event_time = event_dt
-
-    filtered_items = new_filtered_items
-
-    # 디스코드 채널 조회
-    channel_id = await get_output_channel(guild_id)
-    if not channel_id:
-        logger.warning(f"길드 {guild_id}에 등록된 출력 채널이 없습니다.")
-        return
-    channel = bot.get_channel(int(channel_id))
-    if not channel:
-        logger.warning(f"채널 {channel_id}을 찾을 수 없습니다.")
-        return
-
+    filtered_items, max_event_time, seen_at_max = select_new_events(filtered_items, last_time, seen_at_last)
     if filtered_items:
-        for item in filtered_items:
-            data = item.get("data", {})
-            item_name = data.get("itemName", "알 수 없음")
-            item_rarity = data.get("itemRarity", "알 수 없음")
-            event_date = item.get("date", "")
-            embed = format_item_announce_embed(adventure_name, character_name, item_name, item_rarity, event_date)
-            await channel.send(embed=embed)
+        # 전송 전에 이미지 다운로드를 먼저 시작해 두어 전송 경로 지연을 줄임
+        assets.prefetch_announcement_assets(char, filtered_items)
+
+    announcements = [build_item_announcement(char, event) for event in filtered_items]
+    if publish is None:
+        # 출력 채널이 없으면 체크 시각을 갱신하지 않아 다음 주기에 다시 조회
+        if not await send_item_announcements(bot, guild_id, announcements):
+            return
+    elif announcements:
+        await publish(announcements)
 
     # 처리 완료한 가장 최신 시간 캐싱도 락 걸고 쓰기
     if max_event_time is not None:
         async with last_processed_lock:
             last_processed_time[character_id] = max_event_time
+            last_processed_keys[character_id] = seen_at_max
 
-    await update_last_checked(character_id, end_date)
+    await get_store().set_last_checked(character_id, end_date)
 
 
-async def notify_all_characters(bot, guild_id):
+async def notify_all_characters(bot, guild_id, shard=None, publish=None):
+    """
+    shard: (샤드 번호, 샤드 수) - 지정 시 해당 샤드가 담당하는 캐릭터만 처리
+    """
     grouped = await get_all_characters_grouped_by_adventure()
     if not grouped:
         logger.info("DB에 등록된 캐릭터가 없습니다.")
@@ -152,11 +238,58 @@ async def notify_all_characters(bot, guild_id):
     async with aiohttp.ClientSession():
         for adventure, characters in grouped.items():
             for char in characters:
-                await notify_items_for_character(char, bot, guild_id)
-
-
-async def periodic_notify(bot, guild_id):
-    while True:
-        logger.info(f"=== DNF 타임라인 주기적 체크 시작: {datetime.now(KST)} ===")
-        await notify_all_characters(bot, guild_id)
-        await asyncio.sleep(DEFAULT_PERIOD_MINUTES * 60)
+                # 종료 요청 시 캐릭터 단위 경계에서 중단 (진행 중인 캐릭터는 끝까지 처리)
+                if supervisor.stopping.is_set():
+                    logger.info("종료 요청으로 타임라인 체크를 중단합니다.")
+                    return
+                if shard is not None and not owns_character(shard, char['character_id']):
+                    continue
+                not_before = poll_not_before.get(char['character_id'])
+                if not_before is not None:
+                    if now_kst() < not_before:
+                        continue
+                    del poll_not_before[char['character_id']]
+                # 타임라인 API 브레이커가 열려 있으면 남은 캐릭터는 다음 주기로 미룸
+                if dnf_api.is_endpoint_open("timeline"):
+                    logger.warning("타임라인 API 장애로 이번 주기 체크를 중단합니다.")
+                    return
+                await notify_items_for_character(char, bot, guild_id, publish)
+
+
+async def periodic_notify(bot, guild_id, shard=None, publish=None):
+    """
+    캐릭터마다 주기 안의 고정 오프셋에 맞춰 하나씩 조회 (주기 시작마다 전체를 몰아서 조회하지 않음)
+    """
+    lanes.assign(lanes.REALTIME)
+
+    async def load_roster():
+        grouped = await get_all_characters_grouped_by_adventure()
+        return {
+            char['character_id']: char
+            for characters in grouped.values()
+            for char in characters
+            if shard is None or owns_character(shard, char['character_id'])
+        }
+
+    async def poll(char):
+        not_before = poll_not_before.get(char['character_id'])
+        if not_before is not None:
+            if now_kst() < not_before:
+                return
+            del poll_not_before[char['character_id']]
+        # 타임라인 API 브레이커가 열려 있으면 이번 슬롯은 건너뜀 (체크 시각이 그대로라 다음 주기에 이어서 조회)
+        if dnf_api.is_endpoint_open("timeline"):
+            metrics.inc("poll.skipped_breaker_open")
+            return
+        await notify_items_for_character(char, bot, guild_id, publish)
+
+    def on_cycle():
+        logger.info(f"[metrics] {metrics.format_summary('poll.spacing')} {metrics.format_counters('poll.')}")
+        logger.info(f"[metrics] {metrics.format_counters('timeline.')} {metrics.format_counters('timeline_cache.')}")
+        logger.info(f"[metrics] {metrics.format_counters('api.')} {metrics.format_counters('http_cache.')} breakers={dnf_api.get_breaker_states()}")
+        logger.info(f"[metrics] {metrics.format_counters('lane.')}")
+        recorder.mark("notify_cycle")
+
+    logger.info(f"=== DNF 타임라인 연속 체크 시작 (주기 {DEFAULT_PERIOD_MINUTES}분): {now_kst()} ===")
+    scheduler = PollScheduler("poll", DEFAULT_PERIOD_MINUTES * 60, supervisor.sleep)
+    await scheduler.run(load_roster, poll, on_cycle)
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import datetime
+
+from core import dnf_api, lanes
+from core.db import get_all_characters, update_characters_metadata
+from core.logger import logger
+from core.supervisor import supervisor
+from core.timewindow import KST
+
+REFRESH_INTERVAL_HOURS = 6  # 메타데이터 갱신 주기
+INITIAL_DELAY_SECONDS = 5 * 60  # 부팅 직후 다른 작업과 겹치지 않도록 대기
+REFRESH_CONCURRENT_LIMIT = 2  # 낮은 우선순위: 동시 요청 최소화
+REFRESH_REQUEST_INTERVAL = 0.5  # 요청 사이 간격 (초)
+
+# DB 컬럼 -> 캐릭터 상세 API 필드
+METADATA_FIELDS = {
+    "character_name": "characterName",
+    "level": "level",
+    "job_name": "jobName",
+    "job_grow_name": "jobGrowName",
+    "adventure_name": "adventureName",
+}
+
+
+def diff_character(row: dict, details: dict) -> dict | None:
+    """
+    DB 행과 API 상세정보를 비교해 바뀐 컬럼만 담은 dict 반환 (변경 없으면 None)
+    """
+    change = {}
+    for column, field in METADATA_FIELDS.items():
+        value = details.get(field)
+        if value is None or value == "":
+            continue
+        if row.get(column) != value:
+            change[column] = value
+    if not change:
+        return None
+    change["character_id"] = row["character_id"]
+    return change
+
+
+async def refresh_character_metadata():
+    """
+    등록된 모든 캐릭터의 레벨/전직/모험단 정보를 API로 다시 조회해
+    변경된 캐릭터만 한 번에 DB에 반영
+    """
+    characters = await get_all_characters()
+    if not characters:
+        logger.info("[refresh] 갱신할 캐릭터가 없습니다.")
+        return 0
+
+    semaphore = asyncio.Semaphore(REFRESH_CONCURRENT_LIMIT)
+
+    async def fetch_diff(row):
+        async with semaphore:
+            if supervisor.stopping.is_set():
+                return None
+            # 이름/모험단 변경을 놓치지 않도록 응답 캐시(1시간)를 재검증
+            details = await dnf_api.get_character_details(row["server_id"], row["character_id"], revalidate=True)
+            await asyncio.sleep(REFRESH_REQUEST_INTERVAL)
+        if not details:
+            return None
+        return diff_character(row, details)
+
+    results = await asyncio.gather(*(fetch_diff(row) for row in characters))
+    changes = [change for change in results if change]
+    for change in changes:
+        logger.info(f"[refresh] 캐릭터 정보 변경 감지: {change}")
+
+    updated = await update_characters_metadata(changes)
+    logger.info(f"[refresh] 캐릭터 메타데이터 갱신 완료: {len(characters)}개 중 {updated}개 변경")
+    return updated
+
+
+async def refresh_characters_task():
+    """
+    캐릭터 메타데이터 주기 갱신 작업
+    """
+    lanes.assign(lanes.BATCH)
+    if await supervisor.sleep(INITIAL_DELAY_SECONDS):
+        return
+    while not supervisor.stopping.is_set():
+        logger.info(f"=== 캐릭터 메타데이터 갱신 시작: {datetime.now(KST)} ===")
+        try:
+            await refresh_character_metadata()
+        except Exception as e:
+            logger.error(f"[refresh] 캐릭터 메타데이터 갱신 중 오류: {e}")
+        if await supervisor.sleep(REFRESH_INTERVAL_HOURS * 60 * 60):
+            break
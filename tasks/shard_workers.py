@@ -0,0 +1,256 @@
+import asyncio
+import itertools
+import multiprocessing
+import os
+import queue
+import time
+from functools import partial
+
+from core.logger import logger
+from core.sharding import owns_character
+from core.stats import EventColumns
+from core.supervisor import supervisor
+
+# 0 이면 단일 프로세스 모드 (기존 동작), N 이면 타임라인 조회/집계를 N개 워커 프로세스로 분산
+WORKER_SHARDS = int(os.getenv("WORKER_SHARDS", "0"))
+
+QUEUE_POLL_TIMEOUT = 1.0  # 이벤트 큐 대기 시간 (초)
+WORKER_STOP_DEADLINE = 6  # 워커 종료 대기 최대 시간 (초)
+# 집계 요청 1건의 부분 결과 대기 여유 (초) - 요청의 캐릭터별 재시도 기한 + 이 시간까지만 대기
+AGGREGATE_RUN_SLACK = 3 * 60
+
+
+class ShardRunAborted(Exception):
+    """
+    코디네이터 종료로 끝나지 못한 집계 요청
+    """
+
+
+# ===============================
+# 워커 프로세스
+# ===============================
+def worker_main(shard_index: int, shard_count: int, command_queue, event_queue):
+    """
+    워커 프로세스 진입점: 담당 샤드 캐릭터의 타임라인 감시 및 집계 요청 처리
+    """
+    asyncio.run(_worker(shard_index, shard_count, command_queue, event_queue))
+
+
+async def _worker(shard_index: int, shard_count: int, command_queue, event_queue):
+    from core import http_cache, lanes
+    from core.dnf_api import preload_item_cache
+    from core.storage import get_store
+    from tasks.daily_aggregation import collect_period_events
+    from tasks.notify_items import periodic_notify, seed_new_characters
+    from tasks import warm_state
+
+    shard = (shard_index, shard_count)
+    logger.info(f"[shard {shard_index}/{shard_count}] 워커 시작 (pid={os.getpid()})")
+    # 워커는 담당 캐릭터의 중복 제거 상태를 갖고 있으므로 샤드별 스냅샷 사용
+    snapshot = warm_state.snapshot_path(shard_index)
+    await http_cache.init()
+    supervisor.add_shutdown_hook(http_cache.close)
+    if not await warm_state.restore_snapshot(snapshot):
+        await preload_item_cache()
+    supervisor.add_shutdown_hook(get_store().close)
+    supervisor.add_shutdown_hook(partial(warm_state.save_snapshot, snapshot))
+    supervisor.start("warm_state", lambda: warm_state.periodic_snapshot(snapshot))
+
+    async def publish(announcements):
+        event_queue.put(("items", announcements))
+        return True
+
+    async def aggregate(run_id, start_date_str, end_date_str, retry_duration):
+        lanes.assign(lanes.BATCH)
+        try:
+            events = await collect_period_events(start_date_str, end_date_str, shard, retry_duration)
+        except Exception as e:
+            # 부분 결과를 보내지 않으면 코디네이터가 대기 기한까지 기다리므로 샤드 실패로 보고
+            logger.error(f"[shard {shard_index}] 집계 실패: run={run_id}, {type(e).__name__} {e}")
+            event_queue.put(("partial", run_id, shard_index, [], 1))
+            return
+        event_queue.put(("partial", run_id, shard_index, events.records(), events.failed))
+        logger.info(f"[shard {shard_index}] 집계 부분 결과 전송: run={run_id}, {len(events)}건")
+
+    supervisor.start("notify", lambda: periodic_notify(None, None, shard, publish))
+
+    loop = asyncio.get_running_loop()
+    running = set()
+    while True:
+        try:
+            command = await loop.run_in_executor(None, command_queue.get, True, QUEUE_POLL_TIMEOUT)
+        except queue.Empty:
+            continue
+        if command[0] == "stop":
+            break
+        if command[0] == "aggregate":
+            task = asyncio.create_task(aggregate(*command[1:]))
+            running.add(task)
+            task.add_done_callback(running.discard)
+        elif command[0] == "seed":
+            # 메인 프로세스의 /일괄등록 이 보낸 신규 캐릭터 첫 조회 분산 (담당 캐릭터만 전달됨)
+            seed_new_characters(command[1])
+
+    await supervisor.shutdown(WORKER_STOP_DEADLINE)
+    event_queue.put(("stopped", shard_index))
+    logger.info(f"[shard {shard_index}] 워커 종료")
+
+
+# ===============================
+# 메인(디스코드) 프로세스 측 코디네이터
+# ===============================
+class ShardCoordinator:
+    """
+    워커 프로세스를 띄우고, 워커가 보낸 득템 알림을 디스코드로 전송하며
+    기간 집계 요청을 전 샤드에 분배한 뒤 부분 결과를 병합
+    """
+
+    def __init__(self, shard_count: int):
+        self.shard_count = shard_count
+        self._ctx = multiprocessing.get_context("spawn")
+        self.event_queue = self._ctx.Queue()
+        self.command_queues = [self._ctx.Queue() for _ in range(shard_count)]
+        self.processes = [None] * shard_count
+        self._run_ids = itertools.count(1)
+        self._pending_runs = {}  # run_id -> (future, 명령, {shard: (records, 실패 수)})
+        self._publish = None
+
+    def _spawn(self, shard_index: int):
+        process = self._ctx.Process(
+            target=worker_main,
+            args=(shard_index, self.shard_count, self.command_queues[shard_index], self.event_queue),
+            name=f"jongmini-shard-{shard_index}",
+            daemon=True,
+        )
+        process.start()
+        self.processes[shard_index] = process
+        logger.info(f"[coordinator] 샤드 워커 {shard_index} 시작 (pid={process.pid})")
+
+    def start(self):
+        for shard_index in range(self.shard_count):
+            self._spawn(shard_index)
+
+    def _restart_dead_workers(self):
+        for shard_index, process in enumerate(self.processes):
+            if process is not None and not process.is_alive():
+                logger.warning(f"[coordinator] 샤드 워커 {shard_index} 비정상 종료 (exitcode={process.exitcode}), 재시작")
+                self._spawn(shard_index)
+                # 진행 중이던 집계 요청은 이 샤드 실패로 처리 (새 워커에서 처음부터 다시 수집하면 요청이 끝없이 길어짐)
+                for run_id in list(self._pending_runs):
+                    self._add_partial(run_id, shard_index, [], 1)
+
+    def _add_partial(self, run_id: int, shard_index: int, records: list, failed: int):
+        pending = self._pending_runs.get(run_id)
+        if pending is None:
+            return
+        future, _, partials = pending
+        if shard_index in partials:
+            return
+        partials[shard_index] = (records, failed)
+        if len(partials) == self.shard_count and not future.done():
+            future.set_result(partials)
+
+    async def _dispatch(self, message):
+        kind = message[0]
+        if kind == "items":
+            await self._publish(message[1])
+        elif kind == "partial":
+            self._add_partial(*message[1:])
+
+    async def _next_message(self, loop):
+        try:
+            return await loop.run_in_executor(None, self.event_queue.get, True, QUEUE_POLL_TIMEOUT)
+        except queue.Empty:
+            return None
+
+    async def run(self, publish):
+        """
+        워커 이벤트 수신 루프 (supervisor 작업)
+        종료 요청 시 워커에 stop 을 보내고 남은 알림을 마저 전송한 뒤 종료
+        """
+        self._publish = publish
+        loop = asyncio.get_running_loop()
+        while not supervisor.stopping.is_set():
+            message = await self._next_message(loop)
+            if message is not None:
+                await self._dispatch(message)
+            self._restart_dead_workers()
+        await self._drain(loop)
+
+    def seed_new_characters(self, character_ids: list[str]):
+        """
+        신규 캐릭터 첫 조회 분산을 담당 샤드 워커에 전달 (감시는 워커 프로세스에서 실행되므로)
+        """
+        for shard_index, command_queue in enumerate(self.command_queues):
+            owned = [cid for cid in character_ids if owns_character((shard_index, self.shard_count), cid)]
+            if owned:
+                command_queue.put(("seed", owned))
+
+    def _abort_pending_runs(self, reason: str):
+        """
+        대기 중인 집계 요청을 모두 실패 처리 (호출한 명령/집계 작업이 무한 대기하지 않도록)
+        """
+        for future, _, _ in self._pending_runs.values():
+            if not future.done():
+                future.set_exception(ShardRunAborted(reason))
+
+    async def _drain(self, loop):
+        self._abort_pending_runs("코디네이터 종료")
+        for command_queue in self.command_queues:
+            command_queue.put(("stop",))
+        stopped = set()
+        deadline = time.monotonic() + WORKER_STOP_DEADLINE
+        while len(stopped) < self.shard_count and time.monotonic() < deadline:
+            message = await self._next_message(loop)
+            if message is None:
+                continue
+            if message[0] == "stopped":
+                stopped.add(message[1])
+            else:
+                await self._dispatch(message)
+        logger.info(f"[coordinator] 워커 종료 확인: {len(stopped)}/{self.shard_count}")
+
+    async def collect_period_events(self, start_date_str, end_date_str, retry_duration: float) -> EventColumns:
+        """
+        전 샤드에 기간 집계를 요청하고 부분 결과를 하나의 EventColumns 로 병합
+        retry_duration: 워커의 캐릭터별 재시도 기한 (초) - 이 시간 + AGGREGATE_RUN_SLACK 까지만 부분 결과를 기다림
+        종료/시간 초과/워커 비정상 종료로 일부 샤드 결과를 받지 못하면 받은 결과만 병합하고 failed 에 빠진 샤드 수를 더함
+        (failed 가 있으면 완료 게임일 캐시에 저장되지 않음)
+        """
+        run_id = next(self._run_ids)
+        command = ("aggregate", run_id, start_date_str, end_date_str, retry_duration)
+        future = asyncio.get_running_loop().create_future()
+        self._pending_runs[run_id] = (future, command, {})
+        for command_queue in self.command_queues:
+            command_queue.put(command)
+        try:
+            partials = await asyncio.wait_for(future, retry_duration + AGGREGATE_RUN_SLACK)
+        except (asyncio.TimeoutError, ShardRunAborted) as e:
+            partials = self._pending_runs[run_id][2]
+            logger.error(f"[coordinator] 집계 미완료: run={run_id}, 샤드 {len(partials)}/{self.shard_count} 응답 "
+                         f"({type(e).__name__} {e})")
+        finally:
+            self._pending_runs.pop(run_id, None)
+
+        events = EventColumns()
+        events.failed = self.shard_count - len(partials)
+        for records, failed in partials.values():
+            for character_key, adventure_key, rarity, timestamp in records:
+                events.append(character_key, adventure_key, rarity, timestamp)
+            events.failed += failed
+        logger.info(f"[coordinator] 집계 병합 완료: run={run_id}, {len(events)}건")
+        return events
+
+    async def stop(self):
+        """
+        종료 훅: 기한 내 끝나지 않은 워커 강제 종료
+        """
+        self._abort_pending_runs("코디네이터 종료")
+        processes = [process for process in self.processes if process is not None]
+        # join 은 블로킹 호출이므로 스레드에서 동시에 대기 (다른 종료 훅이 도는 동안 이벤트 루프를 막지 않도록)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(None, process.join, 0.5) for process in processes))
+        for process in processes:
+            if process.is_alive():
+                logger.warning(f"[coordinator] {process.name} 강제 종료")
+                process.terminate()
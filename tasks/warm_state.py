@@ -0,0 +1,182 @@
+import asyncio
+import hashlib
+import json
+import os
+import struct
+import time
+import zlib
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+
+from core import db, dnf_api, metrics
+from core.json_codec import loads
+from core.logger import logger
+from core.supervisor import supervisor
+from core.timewindow import KST
+from tasks import daily_aggregation, notify_items
+
+# 재배포 후 바로 정상 처리량을 내도록 메모리 상태를 파일로 보관 (HTTP 응답 캐시는 이미 data/http_cache.db 에 영속)
+WARM_STATE_DIR = Path("data")
+WARM_STATE_MAGIC = b"JMWS"
+WARM_STATE_FORMAT = 1  # 내용 구조가 바뀌면 올려서 이전 스냅샷을 무시
+WARM_STATE_INTERVAL = 10 * 60  # 주기 저장 간격 (초)
+WARM_STATE_MAX_AGE = notify_items.MAX_CATCHUP_HOURS * 60 * 60  # 이보다 오래된 스냅샷은 사용하지 않음 (초)
+
+# 헤더: 매직, 포맷 버전, 생성 시각(unix 초), 본문 길이, 본문 crc32 / 본문: zlib 압축 JSON
+HEADER = struct.Struct(">4sHQII")
+
+
+def snapshot_path(shard_index: int | None = None) -> Path:
+    name = "warm_state.bin" if shard_index is None else f"warm_state.shard{shard_index}.bin"
+    return WARM_STATE_DIR / name
+
+
+async def roster_fingerprint() -> str:
+    """
+    등록 캐릭터 (ID, 서버, 모험단) 목록의 해시 (스냅샷 이후 로스터가 바뀌었는지 확인용)
+    완료 게임일 집계 캐시는 모험단 이름으로 묶여 있으므로 메타데이터 갱신으로 모험단/서버가 바뀌어도 다른 로스터로 취급
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    rows = sorted((char["character_id"], char["server_id"] or "", char["adventure_name"] or "")
+                  for char in await db.get_all_characters())
+    for row in rows:
+        digest.update("\0".join(row).encode())
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+async def collect_state() -> dict:
+    async with notify_items.last_processed_lock:
+        dedup = {
+            character_id: [
+                int(last_time.timestamp()),
+                [[code, item_id, count]
+                 for (code, item_id), count in notify_items.last_processed_keys.get(character_id, Counter()).items()],
+            ]
+            for character_id, last_time in notify_items.last_processed_time.items()
+        }
+    version = db.ROSTER_VERSION
+    return {
+        "roster": {"version": version, "fingerprint": await roster_fingerprint()},
+        "items": dict(dnf_api.ITEM_DETAIL_MEMCACHE),
+        "dedup": dedup,
+        "scheduler": {
+            "not_before": {
+                character_id: not_before.timestamp() for character_id, not_before in notify_items.poll_not_before.items()
+            },
+        },
+        # 완료된 게임일 집계 결과는 현재 로스터 버전 것만 보관
+        "completed_days": [
+            [day.isoformat(), records]
+            for (day, day_version), records in daily_aggregation._completed_day_events.items()
+            if day_version == version
+        ],
+    }
+
+
+def encode(state: dict, created_at: int) -> bytes:
+    payload = zlib.compress(json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode(), 6)
+    return HEADER.pack(WARM_STATE_MAGIC, WARM_STATE_FORMAT, created_at, len(payload), zlib.crc32(payload)) + payload
+
+
+def decode(data: bytes) -> tuple[int, dict]:
+    """
+    반환: (생성 시각, 상태) - 형식이 맞지 않거나 손상되었으면 ValueError
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("헤더 길이 부족")
+    magic, version, created_at, length, crc = HEADER.unpack_from(data)
+    if magic != WARM_STATE_MAGIC:
+        raise ValueError("스냅샷 파일이 아님")
+    if version != WARM_STATE_FORMAT:
+        raise ValueError(f"포맷 버전 불일치 ({version} != {WARM_STATE_FORMAT})")
+    payload = data[HEADER.size:]
+    if len(payload) != length or zlib.crc32(payload) != crc:
+        raise ValueError("본문 손상 (길이/체크섬 불일치)")
+    return created_at, loads(zlib.decompress(payload))
+
+
+def _write_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+async def save_snapshot(path: Path | None = None):
+    path = path or snapshot_path()
+    started = time.perf_counter()
+    try:
+        state = await collect_state()
+        # 압축/파일 쓰기는 이벤트 루프를 막지 않도록 스레드에서 실행
+        data = await asyncio.to_thread(encode, state, int(time.time()))
+        await asyncio.to_thread(_write_atomic, path, data)
+    except Exception as e:
+        metrics.inc("warm_state.save_errors")
+        logger.error(f"[warm_state] 스냅샷 저장 실패: {e}")
+        return
+    metrics.inc("warm_state.saved")
+    logger.info(f"[warm_state] 스냅샷 저장: {path} {len(data) / 1024:.1f}KB "
+                f"(아이템 {len(state['items'])}, 중복 제거 {len(state['dedup'])}, "
+                f"완료 게임일 {len(state['completed_days'])}) {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+async def restore_snapshot(path: Path | None = None) -> bool:
+    """
+    부팅 시 스냅샷 적용 (init_db 이후, 주기 작업 시작 전에 호출)
+    반환: 아이템 레벨 인덱스를 복원했는지 여부 (False 면 preload_item_cache 로 DB 에서 적재)
+    """
+    path = path or snapshot_path()
+    if not path.exists():
+        logger.info(f"[warm_state] 스냅샷 없음: {path}")
+        return False
+    try:
+        created_at, state = decode(await asyncio.to_thread(path.read_bytes))
+    except (OSError, ValueError, zlib.error) as e:
+        metrics.inc("warm_state.invalid")
+        logger.warning(f"[warm_state] 스냅샷 무시 ({path}): {e}")
+        return False
+    age = time.time() - created_at
+    if age > WARM_STATE_MAX_AGE:
+        logger.info(f"[warm_state] 스냅샷이 오래되어 무시: {age / 3600:.1f}시간 전")
+        return False
+
+    dnf_api.ITEM_DETAIL_MEMCACHE = state["items"]
+
+    restored_keys = {}
+    restored_times = {}
+    for character_id, (timestamp, keys) in state["dedup"].items():
+        restored_times[character_id] = datetime.fromtimestamp(timestamp, KST)
+        restored_keys[character_id] = Counter({(code, item_id): count for code, item_id, count in keys})
+    async with notify_items.last_processed_lock:
+        notify_items.last_processed_time.update(restored_times)
+        notify_items.last_processed_keys.update(restored_keys)
+
+    now = time.time()
+    for character_id, timestamp in state["scheduler"]["not_before"].items():
+        if timestamp > now:
+            notify_items.poll_not_before[character_id] = datetime.fromtimestamp(timestamp, KST)
+
+    # 로스터가 그대로일 때만 로스터 버전에 묶인 캐시(완료 게임일 집계)를 이어서 사용
+    roster = state["roster"]
+    same_roster = roster["fingerprint"] == await roster_fingerprint()
+    if same_roster:
+        db.ROSTER_VERSION = roster["version"]
+        for day, records in state["completed_days"]:
+            daily_aggregation._completed_day_events[(date.fromisoformat(day), roster["version"])] = [
+                tuple(record) for record in records
+            ]
+
+    metrics.inc("warm_state.restored")
+    logger.info(f"[warm_state] 스냅샷 복원: {age / 60:.0f}분 전 저장, 아이템 {len(state['items'])}, "
+                f"중복 제거 {len(restored_times)}, 로스터 {'일치' if same_roster else '변경됨 - 집계 캐시 제외'}")
+    return True
+
+
+async def periodic_snapshot(path: Path | None = None):
+    """
+    supervisor 작업: 비정상 종료에도 최근 상태가 남도록 주기적으로 저장
+    """
+    while not await supervisor.sleep(WARM_STATE_INTERVAL):
+        await save_snapshot(path)
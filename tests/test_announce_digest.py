@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import aiohttp
+import pytest
+
+from core.roster import EMBED_DESCRIPTION_LIMIT, MESSAGE_EMBED_CHAR_LIMIT, MESSAGE_EMBED_COUNT_LIMIT
+from core.timewindow import KST
+from tasks.announce_digest import ChannelDigest, build_digest_messages
+
+BASE = datetime(2026, 10, 19, 12, 0, tzinfo=KST)
+
+
+def make_announcement(adventure: int, index: int, rarity: str = "에픽") -> dict:
+    return {
+        "adventure_name": f"모험단{adventure:02d}",
+        "character_name": f"캐릭터{adventure:02d}",
+        "item_name": f"아이템{index:03d}",
+        "item_rarity": rarity,
+        "occurred_at": BASE + timedelta(seconds=index),
+    }
+
+
+def test_one_embed_per_adventure():
+    announcements = [make_announcement(i % 3, i) for i in range(6)]
+    messages = build_digest_messages(announcements)
+    assert len(messages) == 1
+    embeds, contained = messages[0]
+    assert len(embeds) == 3
+    assert len(contained) == 6
+    assert embeds[0].title.endswith("(2건)")
+
+
+def test_messages_respect_discord_limits():
+    announcements = [make_announcement(i % 15, i) for i in range(600)]
+    messages = build_digest_messages(announcements)
+    assert sum(len(contained) for _, contained in messages) == 600
+    for embeds, _ in messages:
+        assert len(embeds) <= MESSAGE_EMBED_COUNT_LIMIT
+        assert sum(len(embed.title) + len(embed.description) for embed in embeds) <= MESSAGE_EMBED_CHAR_LIMIT
+        assert all(len(embed.description) <= EMBED_DESCRIPTION_LIMIT for embed in embeds)
+
+
+class FailingChannel:
+    id = 0
+
+    def __init__(self, error: BaseException, fail_after: int = 0):
+        self.error = error
+        self.fail_after = fail_after
+        self.sent = []
+
+    async def send(self, embeds=None):
+        if len(self.sent) >= self.fail_after:
+            raise self.error
+        self.sent.append(embeds)
+
+
+async def send_single(channel, announcement):
+    pass
+
+
+@pytest.mark.parametrize("error", [aiohttp.ClientError("연결 끊김"), asyncio.TimeoutError()])
+def test_flush_keeps_unsent_announcements(error):
+    announcements = [make_announcement(i % 15, i) for i in range(600)]
+    channel = FailingChannel(error, fail_after=1)
+    digest = ChannelDigest(channel, send_single)
+    digest.pending = list(announcements)
+    asyncio.run(digest.flush())
+    assert len(channel.sent) == 1
+    sent = len(build_digest_messages(announcements)[0][1])
+    assert len(digest.pending) == len(announcements) - sent
+
+
+def test_cancelled_flush_keeps_announcements():
+    announcements = [make_announcement(i % 3, i) for i in range(6)]
+    digest = ChannelDigest(FailingChannel(asyncio.CancelledError()), send_single)
+    digest.pending = list(announcements)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(digest.flush())
+    assert sorted(a["item_name"] for a in digest.pending) == sorted(a["item_name"] for a in announcements)
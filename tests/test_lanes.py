@@ -0,0 +1,44 @@
+import asyncio
+
+from core.lanes import BATCH, INTERACTIVE, LaneGate
+
+
+def test_reserve_and_priority():
+    async def scenario():
+        gate = LaneGate("test", 2, {BATCH: 1})
+        await gate.acquire(BATCH)
+        batch_waiter = asyncio.create_task(gate.acquire(BATCH))
+        await asyncio.sleep(0)
+        # batch 는 여유 슬롯 1개를 남겨야 하므로 대기, interactive 는 바로 입장
+        assert not batch_waiter.done()
+        await gate.acquire(INTERACTIVE)
+        assert gate.in_use == 2
+
+        interactive_waiter = asyncio.create_task(gate.acquire(INTERACTIVE))
+        await asyncio.sleep(0)
+        gate.release(BATCH)
+        await asyncio.sleep(0)
+        assert interactive_waiter.done() and not batch_waiter.done()
+
+        gate.release(INTERACTIVE)
+        gate.release(INTERACTIVE)
+        await batch_waiter
+        gate.release(BATCH)
+        assert gate.in_use == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_leak_slot():
+    async def scenario():
+        gate = LaneGate("test", 1)
+        await gate.acquire(INTERACTIVE)
+        waiter = asyncio.create_task(gate.acquire(INTERACTIVE))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        gate.release(INTERACTIVE)
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert gate.in_use == 0
+        assert gate.snapshot()[INTERACTIVE] == {"active": 0, "waiting": 0}
+
+    asyncio.run(scenario())
@@ -0,0 +1,38 @@
+from collections import Counter
+from datetime import datetime
+
+from core.events import TimelineEvent
+from core.timewindow import KST
+from tasks.notify_items import select_new_events
+
+
+def make_event(minute: int, item_id: str, code: int = 505) -> TimelineEvent:
+    occurred_at = datetime(2026, 10, 19, 12, minute, tzinfo=KST)
+    return TimelineEvent(f"{occurred_at:%Y-%m-%d %H:%M}", code, item_id, "아이템", "에픽", occurred_at)
+
+
+def test_first_poll_takes_everything():
+    events = [make_event(0, "a"), make_event(1, "b"), make_event(1, "b")]
+    new_events, max_time, seen = select_new_events(events, None, None)
+    assert new_events == events
+    assert max_time == events[-1].occurred_at
+    assert seen == Counter({(505, "b"): 2})
+
+
+def test_late_event_in_last_minute_passes():
+    first = [make_event(0, "a"), make_event(1, "b")]
+    _, last_time, seen = select_new_events(first, None, None)
+
+    late = make_event(1, "b")
+    again = first + [late, make_event(1, "c")]
+    new_events, max_time, seen = select_new_events(again, last_time, seen)
+    assert new_events == [late, again[-1]]
+    assert max_time == last_time
+    assert seen == Counter({(505, "b"): 2, (505, "c"): 1})
+
+
+def test_events_before_last_time_are_dropped():
+    events = [make_event(0, "a"), make_event(2, "b")]
+    new_events, max_time, seen = select_new_events(events, events[1].occurred_at, Counter())
+    assert new_events == [events[1]]
+    assert seen == Counter({(505, "b"): 1})
@@ -0,0 +1,29 @@
+from core.poll_scheduler import plan_phases
+
+PERIOD = 120.0
+
+
+def test_offsets_are_sorted_and_inside_period():
+    phases = plan_phases([f"char-{i}" for i in range(100)], PERIOD)
+    offsets = [offset for offset, _ in phases]
+    assert offsets == sorted(offsets)
+    assert all(0 <= offset < PERIOD for offset in offsets)
+    assert {key for _, key in phases} == {f"char-{i}" for i in range(100)}
+
+
+def test_empty_roster():
+    assert plan_phases([], PERIOD) == []
+
+
+def test_roster_change_keeps_other_offsets():
+    keys = [f"char-{i}" for i in range(50)]
+    before = {key: offset for offset, key in plan_phases(keys, PERIOD)}
+    after = {key: offset for offset, key in plan_phases(keys[5:] + ["new-1", "new-2"], PERIOD)}
+    assert all(after[key] == before[key] for key in keys[5:])
+
+
+def test_offsets_spread_over_period():
+    bins = [0] * 10
+    for offset, _ in plan_phases([f"char-{i}" for i in range(2000)], PERIOD):
+        bins[int(offset / PERIOD * len(bins))] += 1
+    assert min(bins) > 150 and max(bins) < 250
@@ -0,0 +1,29 @@
+from core import recorder
+
+
+def record(directory, frames: int) -> list:
+    session = recorder.RecordingSession(directory)
+    for index in range(frames):
+        session.write({"endpoint": "timeline", "key": f"k{index}", "lane": "realtime", "status": 200},
+                      f"응답{index}".encode())
+    session.close()
+    return sorted(directory.glob("segment-*.seg"))
+
+
+def test_read_frames_in_order(tmp_path):
+    record(tmp_path, 5)
+    frames = list(recorder.read_frames(tmp_path))
+    assert [meta["key"] for _, meta, _ in frames] == [f"k{index}" for index in range(5)]
+    assert [body.decode() for _, _, body in frames] == [f"응답{index}" for index in range(5)]
+
+
+def test_truncated_tail_keeps_earlier_frames(tmp_path):
+    segment = record(tmp_path, 5)[-1]
+    segment.write_bytes(segment.read_bytes()[:-3])
+    assert [meta["key"] for _, meta, _ in recorder.read_frames(tmp_path)] == [f"k{index}" for index in range(4)]
+
+
+def test_foreign_segment_is_skipped(tmp_path):
+    record(tmp_path, 2)
+    (tmp_path / "segment-9999.seg").write_bytes(b"not a segment")
+    assert len(list(recorder.read_frames(tmp_path))) == 2
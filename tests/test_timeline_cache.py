@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from core.events import TimelineEvent
+from core.timeline_cache import CharacterTimeline
+from core.timewindow import KST
+
+
+def make_event(timestamp: int) -> TimelineEvent:
+    occurred_at = datetime.fromtimestamp(timestamp, KST)
+    return TimelineEvent(f"{occurred_at:%Y-%m-%d %H:%M}", 505, "item", "아이템", "에픽", occurred_at)
+
+
+def test_gaps_of_empty_timeline():
+    assert CharacterTimeline().gaps(0, 600) == [(0, 600)]
+
+
+def test_gaps_skip_covered_ranges():
+    timeline = CharacterTimeline()
+    timeline.add(60, 120, [])
+    timeline.add(180, 240, [])
+    assert timeline.gaps(0, 300) == [(0, 60), (120, 180), (240, 300)]
+    assert timeline.gaps(60, 120) == []
+    assert timeline.gaps(90, 200) == [(120, 180)]
+
+
+def test_add_merges_adjacent_ranges_and_sorts_events():
+    timeline = CharacterTimeline()
+    timeline.add(120, 180, [make_event(120)])
+    timeline.add(0, 60, [make_event(0)])
+    timeline.add(60, 120, [make_event(60)])
+    assert timeline.covered == [(0, 180)]
+    assert timeline.timestamps == [0, 60, 120]
+    assert [event.timestamp for event in timeline.slice(60, 180)] == [60, 120]
@@ -0,0 +1,36 @@
+from datetime import date, datetime, timedelta
+
+from core.timewindow import KST, TIMELINE_SETTLE, from_api, split_api_range, split_game_days
+
+
+def kst(day: int, hour: int, minute: int = 0) -> datetime:
+    return datetime(2026, 10, day, hour, minute, tzinfo=KST)
+
+
+def test_split_game_days_on_0600_boundary():
+    buckets = split_game_days(kst(18, 5), kst(19, 7), now=kst(19, 8))
+    assert [(b.start, b.end, b.day) for b in buckets] == [
+        (kst(18, 5), kst(18, 6), date(2026, 10, 17)),
+        (kst(18, 6), kst(19, 6), date(2026, 10, 18)),
+        (kst(19, 6), kst(19, 7), date(2026, 10, 19)),
+    ]
+    assert [b.complete for b in buckets] == [False, True, False]
+
+
+def test_finished_day_is_incomplete_until_settled():
+    day_end = kst(19, 6)
+    assert not split_game_days(kst(18, 6), day_end, now=day_end + TIMELINE_SETTLE - timedelta(minutes=1))[0].complete
+    assert split_game_days(kst(18, 6), day_end, now=day_end + TIMELINE_SETTLE)[0].complete
+
+
+def test_split_api_range_within_limit():
+    assert split_api_range("20261001T0600", "20261019T0559") == [("20261001T0600", "20261019T0559")]
+
+
+def test_split_api_range_chunks_are_contiguous():
+    ranges = split_api_range("20260101T0000", "20260720T2359")
+    assert len(ranges) == 3
+    assert ranges[0][0] == "20260101T0000" and ranges[-1][1] == "20260720T2359"
+    for (_, end), (next_start, _) in zip(ranges, ranges[1:]):
+        assert from_api(next_start) - from_api(end) == timedelta(minutes=1)
+    assert all(from_api(end) - from_api(start) < timedelta(days=90) for start, end in ranges)
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from core import db
+from tasks import warm_state
+
+STATE = {"item_levels": {"abc": 115}, "last_checked": {"char": "20261019T1200"}, "이름": "값"}
+
+
+def test_roundtrip():
+    assert warm_state.decode(warm_state.encode(STATE, 1_700_000_000)) == (1_700_000_000, STATE)
+
+
+@pytest.mark.parametrize("corrupt", [
+    lambda data: data[:10],
+    lambda data: data[:-1],
+    lambda data: data[:-1] + bytes([data[-1] ^ 0xFF]),
+    lambda data: b"XXXX" + data[4:],
+])
+def test_corrupted_snapshot_is_rejected(corrupt):
+    with pytest.raises(ValueError):
+        warm_state.decode(corrupt(warm_state.encode(STATE, 1_700_000_000)))
+
+
+def test_other_format_version_is_rejected(monkeypatch):
+    data = warm_state.encode(STATE, 1_700_000_000)
+    monkeypatch.setattr(warm_state, "WARM_STATE_FORMAT", warm_state.WARM_STATE_FORMAT + 1)
+    with pytest.raises(ValueError):
+        warm_state.decode(data)
+
+
+def test_roster_fingerprint_tracks_adventure_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", tmp_path / "characters.db")
+
+    async def scenario():
+        await db.init_db()
+        await db.save_character({
+            "characterId": "char", "characterName": "캐릭터", "serverId": "cain", "level": 115,
+            "jobName": "귀검사(남)", "jobGrowName": "眞 웨펀마스터", "adventureName": "모험단",
+        })
+        before = await warm_state.roster_fingerprint()
+        await db.update_characters_metadata([{"character_id": "char", "adventure_name": "새모험단"}])
+        return before, await warm_state.roster_fingerprint()
+
+    before, after = asyncio.run(scenario())
+    assert before != after